@@ -3,13 +3,48 @@
 
 import argparse
 import sys
+from functools import partial
 from typing import Sequence
 
-from libs.chaos.visualizer import LogisticMapVisualizer
+import matplotlib.pyplot as plt
+import numpy as np
+
+from libs.chaos.bifurcation import bifurcation_diagram
+from libs.chaos.logistic_map import PRECISIONS, logistic_map
+from libs.chaos.precision import compare_precisions, format_results
+from libs.chaos.visualizer import LogisticMapVisualizer, plot_bifurcation_diagram
 
 
 def _main_logistic_map(args: argparse.Namespace) -> None:  # pragma: no cover
-    LogisticMapVisualizer(args.count, args.length)
+    LogisticMapVisualizer(
+        args.count, args.length, precompute=args.precompute, seed=args.seed, r_step=args.r_step
+    )
+
+
+def _main_bifurcation(args: argparse.Namespace) -> None:  # pragma: no cover
+    diagram = bifurcation_diagram(
+        np.linspace(args.r_min, args.r_max, args.r_count),
+        initial_count=args.count,
+        transient=args.transient,
+        samples=args.samples,
+        x_bins=args.bins,
+    )
+    if args.output:
+        plt.imsave(args.output, diagram.image(), cmap="gray_r")
+    else:
+        plot_bifurcation_diagram(diagram)
+
+
+def _main_precision(args: argparse.Namespace) -> None:  # pragma: no cover
+    results = compare_precisions(
+        partial(logistic_map, r=args.r),
+        np.random.default_rng(args.seed).random(args.count),
+        args.length,
+        precisions=args.precisions,
+        reference=args.reference,
+        tolerance=args.tolerance,
+    )
+    print(format_results(results))
 
 
 def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no cover
@@ -26,6 +61,52 @@ def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no c
     logisticmap_parser.add_argument(
         "-l", "--length", type=int, default=60, help="length of the processes"
     )
+    logisticmap_parser.add_argument(
+        "--precompute",
+        action="store_true",
+        help="compute the data of all slider steps in the background and cache it",
+    )
+    logisticmap_parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the initial values with --precompute"
+    )
+    logisticmap_parser.add_argument("--r-step", type=float, default=0.2, help="slider step")
+    bifurcation_parser = subparsers.add_parser("bifurcation")
+    bifurcation_parser.set_defaults(func=_main_bifurcation)
+    bifurcation_parser.add_argument("--r-min", type=float, default=2.5)
+    bifurcation_parser.add_argument("--r-max", type=float, default=4.0)
+    bifurcation_parser.add_argument(
+        "--r-count", type=int, default=2000, help="columns of the image"
+    )
+    bifurcation_parser.add_argument(
+        "-c", "--count", type=int, default=32, help="number of initial values per r"
+    )
+    bifurcation_parser.add_argument(
+        "-t", "--transient", type=int, default=500, help="number of discarded steps"
+    )
+    bifurcation_parser.add_argument(
+        "-s", "--samples", type=int, default=200, help="number of sampled steps"
+    )
+    bifurcation_parser.add_argument("-b", "--bins", type=int, default=800, help="rows of the image")
+    bifurcation_parser.add_argument(
+        "-o", "--output", default=None, help="save the image to this file instead of showing it"
+    )
+    precision_parser = subparsers.add_parser("precision")
+    precision_parser.set_defaults(func=_main_precision)
+    precision_parser.add_argument("--r", type=float, default=3.9)
+    precision_parser.add_argument(
+        "-c", "--count", type=int, default=100, help="number of initial values"
+    )
+    precision_parser.add_argument(
+        "-l", "--length", type=int, default=1000, help="length of the orbits"
+    )
+    precision_parser.add_argument(
+        "-p", "--precisions", nargs="+", choices=list(PRECISIONS), default=list(PRECISIONS)
+    )
+    precision_parser.add_argument("--reference", choices=list(PRECISIONS), default="decimal")
+    precision_parser.add_argument(
+        "-t", "--tolerance", type=float, default=1e-2, help="distance at which orbits diverge"
+    )
+    precision_parser.add_argument("--seed", type=int, default=0)
     return parser.parse_args(argv)
 
 
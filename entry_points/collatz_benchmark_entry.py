@@ -0,0 +1,47 @@
+"""Collatz Conjecture benchmarks"""
+
+import argparse
+import sys
+from typing import Sequence
+
+from libs.collatz.benchmark import (
+    CASES,
+    MODES,
+    SIZES,
+    compare,
+    format_results,
+    read_report,
+    run_benchmarks,
+    write_report,
+)
+
+
+def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Collatz Conjecture benchmarks")
+    parser.add_argument("-c", "--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("-m", "--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("-s", "--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="keep the fastest run")
+    parser.add_argument("-o", "--output", default="collatz_benchmark.json")
+    parser.add_argument(
+        "-b", "--baseline", default=None, help="report of an earlier run to check for regressions"
+    )
+    parser.add_argument("-t", "--tolerance", type=float, default=0.2)
+    return parser.parse_args(argv)
+
+
+def _main(argv: Sequence[str]) -> int:  # pragma: no cover
+    args = _parse_arguments(argv)
+    results = run_benchmarks(args.cases, args.modes, args.sizes, repeat=args.repeat)
+    print(format_results(results))
+    write_report(results, args.output)
+    if args.baseline is None:
+        return 0
+    regressions = compare(read_report(args.baseline), results, tolerance=args.tolerance)
+    for regression in regressions:
+        print(f"regression: {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -5,7 +5,12 @@ import sys
 from typing import Sequence
 
 from libs.collatz.collatz import CollatzSequences
-from libs.collatz.plotting import plot_sequences_as_graph, plot_sequences_as_timeseries_animated
+from libs.collatz.plotting import (
+    LAYOUTS,
+    export_sequences_as_timeseries_animated,
+    plot_sequences_as_graph,
+    plot_sequences_as_timeseries_animated,
+)
 from libs.common.utils import memory_guard_decorator
 
 
@@ -14,17 +19,39 @@ def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no c
     parser.add_argument("-s", "--start", type=int, default=1)
     parser.add_argument("-e", "--end", type=int, default=100)
     parser.add_argument("-p", "--plot", choices=["timeseries", "graph"], default="timeseries")
+    parser.add_argument("-l", "--layout", choices=list(LAYOUTS), default="radial_layout")
+    parser.add_argument(
+        "--compact", action="store_true", help="store successors in arrays instead of a dict"
+    )
+    parser.add_argument(
+        "--vectorized", action="store_true", help="compute successors in batches with numpy"
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="load and extend successors persisted in this directory"
+    )
+    parser.add_argument(
+        "--export", default=None, help="render the timeseries offscreen into this .gif/.mp4 file"
+    )
+    parser.add_argument("--fps", type=int, default=20, help="frame rate of the exported file")
     return parser.parse_args(argv)
 
 
 @memory_guard_decorator(threshold=500)
 def _main(argv: Sequence[str]):  # pragma: no cover
     args = _parse_arguments(argv)
-    collatz_sequences = CollatzSequences(args.start, args.end)
-    if args.plot == "timeseries":
+    collatz_sequences = CollatzSequences(
+        args.start,
+        args.end,
+        compact=args.compact,
+        vectorized=args.vectorized,
+        cache_dir=args.cache_dir,
+    )
+    if args.plot == "timeseries" and args.export:
+        export_sequences_as_timeseries_animated(collatz_sequences, args.export, fps=args.fps)
+    elif args.plot == "timeseries":
         plot_sequences_as_timeseries_animated(collatz_sequences, time_delay=10)
     elif args.plot == "graph":
-        plot_sequences_as_graph(collatz_sequences)
+        plot_sequences_as_graph(collatz_sequences, layout=args.layout)
     else:
         print(f"selected plotting mode is not supported: {args.plot}")
 
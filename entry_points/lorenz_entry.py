@@ -6,6 +6,7 @@ from typing import Sequence
 
 from libs.lorenz.lorenz import LorenzParameters, LorenzSystem, TimeLine
 from libs.lorenz.plotting import plot_lorenz_attractor
+from libs.lorenz.trajectory_store import TrajectoryStore, store_solution
 
 
 def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no cover
@@ -17,16 +18,29 @@ def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no c
     parser.add_argument("--sigma", type=float, default=10.0)
     parser.add_argument("--rho", type=float, default=28.0)
     parser.add_argument("--beta", type=float, default=8.0 / 3.0)
+    parser.add_argument(
+        "-o", "--output", default=None, help="stream the trajectory into this store, not plot it"
+    )
+    parser.add_argument("--chunk-size", type=int, default=1 << 16)
+    parser.add_argument(
+        "--input", default=None, help="plot the trajectory of this store instead of solving"
+    )
     return parser.parse_args(argv)
 
 
 def _main(argv: Sequence[str]):  # pragma: no cover
     args = _parse_arguments(argv)
+    if args.input:
+        plot_lorenz_attractor(TrajectoryStore(args.input).read())
+        return
     lorenz = LorenzSystem(
         time_line=TimeLine(args.time_start, args.time_end, args.time_points_count),
         parameters=LorenzParameters(args.sigma, args.rho, args.beta),
         initial_points=args.initial_points,
     )
+    if args.output:
+        store_solution(lorenz, args.output, chunk_size=args.chunk_size)
+        return
     solution_points = lorenz.solve()
     plot_lorenz_attractor(solution_points)
 
@@ -0,0 +1,40 @@
+"""Accuracy and throughput of the Lorenz System integrators"""
+
+import argparse
+import sys
+from typing import Sequence
+
+from libs.lorenz.integrators import TABLEAUS, compare_integrators, format_results
+from libs.lorenz.lorenz import LorenzParameters
+
+
+def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Lorenz System integrators")
+    parser.add_argument("-e", "--time-end", type=float, default=5.0)
+    parser.add_argument("-d", "--dt", type=float, default=1e-3)
+    parser.add_argument("-i", "--initial-points", type=float, nargs=3, default=[1.0, 1.0, 1.0])
+    parser.add_argument(
+        "-m", "--methods", nargs="+", choices=list(TABLEAUS), default=list(TABLEAUS)
+    )
+    parser.add_argument("--no-jit", action="store_true", help="use the NumPy ensemble kernel")
+    parser.add_argument("--sigma", type=float, default=10.0)
+    parser.add_argument("--rho", type=float, default=28.0)
+    parser.add_argument("--beta", type=float, default=8.0 / 3.0)
+    return parser.parse_args(argv)
+
+
+def _main(argv: Sequence[str]):  # pragma: no cover
+    args = _parse_arguments(argv)
+    results = compare_integrators(
+        LorenzParameters(args.sigma, args.rho, args.beta),
+        args.initial_points,
+        args.time_end,
+        args.dt,
+        methods=args.methods,
+        jit=not args.no_jit,
+    )
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,53 @@
+"""Lorenz System parameter sweep"""
+
+import argparse
+import sys
+from typing import Sequence
+
+import numpy as np
+
+from libs.lorenz.lorenz import TimeLine
+from libs.lorenz.sweep import parameter_grid, sweep
+
+
+def _parse_arguments(argv: Sequence[str]) -> argparse.Namespace:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Lorenz System parameter sweep")
+    parser.add_argument("-s", "--time-start", type=int, default=0)
+    parser.add_argument("-e", "--time-end", type=int, default=100)
+    parser.add_argument("-c", "--time-points-count", type=int, default=10000)
+    parser.add_argument("-i", "--initial-points", type=float, nargs=3, default=[1.0, 1.0, 1.0])
+    parser.add_argument("-t", "--transient", type=float, default=10.0)
+    parser.add_argument("--sigma", type=float, nargs="+", default=[10.0])
+    parser.add_argument(
+        "--rho", type=float, nargs=3, default=[20.0, 40.0, 21], help="start, stop and count"
+    )
+    parser.add_argument("--beta", type=float, nargs="+", default=[8.0 / 3.0])
+    parser.add_argument("-w", "--max-workers", type=int, default=None)
+    return parser.parse_args(argv)
+
+
+def _main(argv: Sequence[str]):  # pragma: no cover
+    args = _parse_arguments(argv)
+    rho_start, rho_stop, rho_count = args.rho
+    parameters = parameter_grid(
+        args.sigma, np.linspace(rho_start, rho_stop, int(rho_count)), args.beta
+    )
+    summaries = sweep(
+        parameters,
+        TimeLine(args.time_start, args.time_end, args.time_points_count),
+        initial_point=args.initial_points,
+        transient=args.transient,
+        max_workers=args.max_workers,
+    )
+    print(f"{'sigma':>8}{'rho':>10}{'beta':>8}{'lyapunov':>10}{'z max':>10}{'switches':>10}")
+    for summary in summaries:
+        point = summary.parameters
+        z_max = summary.z_maxima.mean() if summary.z_maxima.size else float("nan")
+        print(
+            f"{point.sigma:>8.3g}{point.rho:>10.4g}{point.beta:>8.3g}"
+            f"{summary.lyapunov_exponent:>10.3f}{z_max:>10.2f}{summary.lobe_switches:>10}"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,92 @@
+"""Quantitative measures of chaos for parametric maps
+
+Both measures run over a whole sweep of r values at once: the orbits of all r values
+(and initial values) are advanced together as one array, so the only Python loop is
+over time steps (and, for the periods, over candidate periods).
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from libs.chaos.logistic_map import ParametricMapFunction, logistic_map
+
+_TINY = np.finfo(float).tiny
+
+
+def lyapunov_exponents(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    r_values: np.ndarray,
+    map_function: ParametricMapFunction = logistic_map,
+    derivative: Optional[ParametricMapFunction] = None,
+    initial_count: int = 1,
+    transient: int = 500,
+    steps: int = 1000,
+    epsilon: float = 1e-7,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Estimate the Lyapunov exponent of map_function for every r as the mean of
+    log|f'(x)| along orbits of steps steps after a transient, averaged over
+    initial_count random initial values in (0, 1).
+
+    f' is derivative if given, else a central finite difference with step epsilon.
+    Orbits through a critical point (f' = 0) get a large negative value, not -inf.
+    """
+    if steps < 1:
+        raise ValueError("steps must be positive!")
+    r, x = _initial_state(r_values, initial_count, seed)
+    x = _iterate(map_function, r, x, transient)
+    total = np.zeros_like(x)
+    for _ in range(steps):
+        if derivative is None:
+            slope = (map_function(r=r, x=x + epsilon) - map_function(r=r, x=x - epsilon)) / (
+                2 * epsilon
+            )
+        else:
+            slope = derivative(r=r, x=x)
+        total += np.log(np.maximum(np.abs(slope), _TINY))
+        x = np.asarray(map_function(r=r, x=x))
+    return total.mean(axis=1) / steps
+
+
+def detect_periods(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    r_values: np.ndarray,
+    map_function: ParametricMapFunction = logistic_map,
+    max_period: int = 64,
+    transient: int = 1000,
+    tolerance: float = 1e-6,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Return the smallest period p <= max_period of the orbit of a random initial value
+    for every r after a transient, or 0 when there is none (chaos or slow convergence).
+
+    An orbit has period p if x[t + p] is within tolerance of x[t] for max_period
+    consecutive steps t, so that a coincidental return is not taken for a cycle.
+    """
+    if max_period < 1:
+        raise ValueError("max_period must be positive!")
+    r, x = _initial_state(r_values, 1, seed)
+    x = _iterate(map_function, r, x, transient)
+    orbit = np.empty((2 * max_period, len(x)))
+    for t in range(2 * max_period):
+        orbit[t] = x[:, 0]
+        x = np.asarray(map_function(r=r, x=x))
+    periods = np.zeros(len(x), dtype=np.int64)
+    for period in range(1, max_period + 1):
+        returns = np.abs(orbit[period : period + max_period] - orbit[:max_period])
+        periodic = (periods == 0) & np.all(returns <= tolerance, axis=0)
+        periods[periodic] = period
+    return periods
+
+
+def _initial_state(r_values: np.ndarray, initial_count: int, seed: Optional[int]):
+    """r as a column and initial_count random initial values per r."""
+    r = np.asarray(r_values, dtype=float)[:, np.newaxis]
+    return r, np.random.default_rng(seed).random((len(r), initial_count))
+
+
+def _iterate(
+    map_function: ParametricMapFunction, r: np.ndarray, x: np.ndarray, steps: int
+) -> np.ndarray:
+    for _ in range(steps):
+        x = np.asarray(map_function(r=r, x=x))
+    return x
@@ -0,0 +1,92 @@
+"""Bifurcation diagrams of parametric maps
+
+The attractor of a map for many values of its parameter r is sampled by iterating a
+batch of initial values for every r together, discarding a transient, and binning the
+visited points straight into a (r, x) density histogram. The memory is that of the
+histogram and of one chunk of the r-grid, regardless of how many points are sampled.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from libs.chaos.logistic_map import ParametricMapFunction, logistic_map
+
+_FLUSH_SIZE = 1 << 20
+
+
+@dataclass(eq=False)
+class BifurcationDiagram:
+    """density[i, j] counts the sampled points x of r_values[i] in the j-th bin of
+    x_edges; points outside of x_edges (or not finite) are dropped."""
+
+    r_values: np.ndarray
+    x_edges: np.ndarray
+    density: np.ndarray
+
+    def image(self) -> np.ndarray:
+        """The log density normalized to [0, 1] as an image: one column per r and one
+        row per x bin, with the largest x on the top row."""
+        log_density = np.log1p(self.density.T[::-1].astype(float))
+        peak = log_density.max()
+        return log_density / peak if peak > 0 else log_density
+
+
+def bifurcation_diagram(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    r_values: np.ndarray,
+    map_function: ParametricMapFunction = logistic_map,
+    initial_count: int = 32,
+    transient: int = 500,
+    samples: int = 200,
+    x_bins: int = 800,
+    x_range: Tuple[float, float] = (0.0, 1.0),
+    chunk_size: int = 256,
+    seed: Optional[int] = None,
+) -> BifurcationDiagram:
+    """Iterate initial_count random initial values in x_range for every r in r_values,
+    discard the first transient steps and bin the following samples steps."""
+    if initial_count < 1 or samples < 1 or x_bins < 1 or chunk_size < 1:
+        raise ValueError("initial_count, samples, x_bins and chunk_size must be positive!")
+    r_values = np.asarray(r_values, dtype=float)
+    x_edges = np.linspace(x_range[0], x_range[1], x_bins + 1)
+    density = np.zeros((len(r_values), x_bins), dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    for chunk_start in range(0, len(r_values), chunk_size):
+        r = r_values[chunk_start : chunk_start + chunk_size, np.newaxis]
+        x = rng.uniform(x_range[0], x_range[1], (len(r), initial_count))
+        with np.errstate(over="ignore", invalid="ignore"):
+            for _ in range(transient):
+                x = np.asarray(map_function(r=r, x=x))
+            density[chunk_start : chunk_start + len(r)] = _sample(
+                map_function, r, x, samples, x_range, x_bins
+            )
+    return BifurcationDiagram(r_values, x_edges, density)
+
+
+def _sample(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    map_function: ParametricMapFunction,
+    r: np.ndarray,
+    x: np.ndarray,
+    samples: int,
+    x_range: Tuple[float, float],
+    x_bins: int,
+) -> np.ndarray:
+    """Histogram of the next samples steps of x, one row per r. The bin indices are
+    collected over several steps and counted together."""
+    rows = np.arange(len(r))[:, np.newaxis] * x_bins
+    density = np.zeros(len(r) * x_bins, dtype=np.int64)
+    indices: List[np.ndarray] = []
+    collected = 0
+    scale = x_bins / (x_range[1] - x_range[0])
+    for step in range(samples):
+        x = np.asarray(map_function(r=r, x=x))
+        bins = np.floor((x - x_range[0]) * scale)
+        bins[x == x_range[1]] = x_bins - 1
+        valid = (bins >= 0) & (bins < x_bins)
+        indices.append((rows + bins.astype(np.int64, copy=False))[valid])
+        collected += indices[-1].size
+        if collected >= _FLUSH_SIZE or step == samples - 1:
+            density += np.bincount(np.concatenate(indices), minlength=len(density))
+            indices, collected = [], 0
+    return density.reshape(len(r), x_bins)
@@ -0,0 +1,70 @@
+"""A least-recently-used cache of precomputed frames
+
+Frames are computed on demand by get, or ahead of time by prefetch in a background
+thread, so that an interactive figure only has to swap the data of its artists.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+
+class FrameCache:
+    """compute(key) -> frame, with the max_size most recently used frames cached."""
+
+    def __init__(self, compute: Callable[[Any], Any], max_size: int = 128) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be positive!")
+        self._compute = compute
+        self._max_size = max_size
+        self._frames: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._frames
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._frames)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the frame of key, computing it (in the calling thread) if missing."""
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                return self._frames[key]
+        # NOTE: computed outside of the lock, so that a prefetching thread does not
+        #       block the caller; a frame may then be computed twice, which is harmless
+        frame = self._compute(key)
+        with self._lock:
+            self._frames[key] = frame
+            self._frames.move_to_end(key)
+            while len(self._frames) > self._max_size:
+                self._frames.popitem(last=False)
+        return frame
+
+    def prefetch(self, keys: Iterable[Hashable]) -> None:
+        """Compute the frames of keys, in order, in a background (daemon) thread."""
+        self.close()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._fill, args=(list(keys),), daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for the prefetching thread to finish."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self) -> None:
+        """Stop prefetching after the frame being computed."""
+        self._stop.set()
+        self.wait()
+
+    def _fill(self, keys: list) -> None:
+        for key in keys:
+            if self._stop.is_set():
+                return
+            self.get(key)
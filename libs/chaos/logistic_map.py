@@ -1,12 +1,23 @@
 """This module provides objects for chaotic processes"""
 
+import decimal
+from contextlib import nullcontext
+from functools import partial
 from types import SimpleNamespace
-from typing import Protocol, Union
+from typing import ContextManager, Dict, Iterator, Optional, Protocol, Union
 
 import numpy as np
-from scipy import fftpack
+
+from libs.chaos.jit import iterate
+from libs.chaos.spectral import welch_psd
 
 FloatOrArray = Union[float, np.ndarray]
+SeedLike = Union[int, np.random.SeedSequence, np.random.Generator]
+
+# NOTE: "decimal" orbits are object arrays of decimal.Decimal with DECIMAL_DIGITS digits,
+#       for verifying long orbits rather than for speed
+PRECISIONS: Dict[str, type] = {"float32": np.float32, "float64": np.float64, "decimal": object}
+DECIMAL_DIGITS = 60
 
 
 class MapFunction(Protocol):  # pylint: disable=too-few-public-methods
@@ -16,27 +27,113 @@ class MapFunction(Protocol):  # pylint: disable=too-few-public-methods
         pass
 
 
-def logistic_map(r: float, x: FloatOrArray) -> FloatOrArray:
+class ParametricMapFunction(Protocol):  # pylint: disable=too-few-public-methods
+    """Signature of map functions with a parameter r, such as logistic_map"""
+
+    def __call__(self, r: FloatOrArray, x: FloatOrArray) -> FloatOrArray:
+        pass
+
+
+def logistic_map(r: FloatOrArray, x: FloatOrArray) -> FloatOrArray:
     """Return next value of a logistic map, give parameter r and current value x."""
     return r * x * (1 - x)
 
 
-def cobweb(map_function: MapFunction, x0: float, length: int) -> np.ndarray:
+def logistic_map_derivative(r: FloatOrArray, x: FloatOrArray) -> FloatOrArray:
+    """Return the derivative of the logistic map with respect to x."""
+    return r * (1 - 2 * x)
+
+
+def cobweb(
+    map_function: MapFunction,
+    x0: float,
+    length: int,
+    jit: bool = False,
+    precision: str = "float64",
+) -> np.ndarray:
     """Return the points (xy-values) representing the cobweb diagram of the map_function."""
-    xy = np.zeros((length, 2))
-    xy[0, :] = [x0, 0]
-    for n in range(1, length - 1, 2):
-        xy[n, :] = [xy[n - 1, 0], map_function(x=xy[n - 1, 0])]  # type: ignore
-        xy[n + 1, :] = [xy[n, 1], xy[n, 1]]
+    return cobweb_batch(map_function, np.array([x0]), length, jit=jit, precision=precision)[0]
+
+
+def cobweb_batch(
+    map_function: MapFunction,
+    x0: np.ndarray,
+    length: int,
+    jit: bool = False,
+    precision: str = "float64",
+) -> np.ndarray:
+    """Return the cobweb diagrams of all initial values in x0 as a (len(x0), length, 2)
+    array. The orbits are computed once with sequence_batch and the staircase points
+    (x[k], x[k + 1]), (x[k + 1], x[k + 1]) are filled in by interleaving slices; the
+    last point of an even length stays at (0, 0)."""
+    steps = max((length - 1) // 2, 0)
+    orbits = sequence_batch(map_function, x0, steps + 1, jit=jit, precision=precision)
+    xy = np.zeros((len(x0), length, 2), dtype=orbits.dtype)
+    if length > 0:
+        xy[:, 0, 0] = orbits[:, 0]
+    xy[:, 1 : 2 * steps : 2, 0] = orbits[:, :-1]
+    xy[:, 1 : 2 * steps : 2, 1] = orbits[:, 1:]
+    xy[:, 2 : 2 * steps + 1 : 2, :] = orbits[:, 1:, np.newaxis]
     return xy
 
 
-def sequence(map_function: MapFunction, x0: float, length: int) -> np.ndarray:
+def sequence(
+    map_function: MapFunction,
+    x0: float,
+    length: int,
+    jit: bool = False,
+    precision: str = "float64",
+) -> np.ndarray:
     """Return a sequence points generated by the map_function with x0 as initial value."""
-    signal = [x0]
-    for _ in range(length - 1):
-        signal.append(map_function(x=signal[-1]))  # type: ignore
-    return np.array(signal)
+    return sequence_batch(map_function, np.array([x0]), length, jit=jit, precision=precision)[0]
+
+
+def sequence_batch(
+    map_function: MapFunction,
+    x0: np.ndarray,
+    length: int,
+    jit: bool = False,
+    precision: str = "float64",
+) -> np.ndarray:
+    """Return one sequence per initial value in x0, as the rows of a (len(x0), length)
+    array (with no columns for length 0). All sequences are advanced together, one
+    column (time step) per call of map_function, into an array laid out so that each
+    column is contiguous.
+
+    With jit=True the loop is compiled with Numba when it is installed and supports the
+    map_function (see libs.chaos.jit), with the same results; otherwise it runs as is.
+
+    precision is one of PRECISIONS, the dtype of the computation and of the result. For
+    "decimal", x0 and the float parameters bound by a functools.partial map_function are
+    converted exactly to decimal.Decimal; a plain map_function must accept Decimals. jit
+    only applies to "float64"."""
+    if length < 0:
+        raise ValueError("Length must not be negative!")
+    if length == 0:
+        return np.empty((len(x0), 0), dtype=PRECISIONS[precision])
+    if jit and precision == "float64":
+        compiled = iterate(map_function, x0, length)
+        if compiled is not None:
+            return compiled.T
+    signals: np.ndarray = np.empty((length, len(x0)), dtype=PRECISIONS[precision])
+    signals[0] = _to_precision(np.asarray(x0), precision)
+    map_function = _with_precision(map_function, precision)
+    with _precision_context(precision):
+        for t in range(1, length):
+            signals[t] = map_function(x=signals[t - 1])  # type: ignore
+    return signals.T
+
+
+def sequence_chunks(
+    map_function: MapFunction, x0: np.ndarray, length: int, chunk_size: int, jit: bool = False
+) -> Iterator[np.ndarray]:
+    """Yield the sequence_batch of x0 chunk_size time steps (columns) at a time, so that
+    sequences too long for memory can be processed chunk by chunk."""
+    x = np.asarray(x0, dtype=float)
+    for chunk_start in range(0, length, chunk_size):
+        chunk = sequence_batch(map_function, x, min(chunk_size, length - chunk_start), jit=jit)
+        yield chunk
+        x = np.asarray(map_function(x=chunk[:, -1]))  # type: ignore
 
 
 def curve(map_function: MapFunction, x: np.ndarray) -> np.ndarray:
@@ -45,27 +142,75 @@ def curve(map_function: MapFunction, x: np.ndarray) -> np.ndarray:
     return np.array([x, y]).T
 
 
-def generate_data(
-    map_function: MapFunction, sequences_count: int, sequences_length: int
+def generate_data(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    map_function: MapFunction,
+    sequences_count: int,
+    sequences_length: int,
+    seed: Optional[SeedLike] = None,
+    jit: bool = False,
+    precision: str = "float64",
 ) -> SimpleNamespace:
     """Construct signals and sequences from map_function
 
-    * sequences contains a list of sequences each with a different random initial value
-    * frequency_response is of the sequences[0]
+    The random initial values are drawn from np.random.default_rng(seed) if a seed (or
+    SeedSequence, or Generator) is given, so that the same seed gives the same initial
+    values for any map_function, and from the global numpy random state otherwise. jit and
+    precision are passed on to sequence_batch; the spectrum is computed in float64. See
+    libs.chaos.seeding to generate the sequences in a process pool.
+
+    * sequences is a (sequences_count, sequences_length) array, one sequence per row,
+      each with a different random initial value
+    * frequencies and power_spectrum are the Welch power spectral density averaged over
+      all sequences
     * curve_points is the range of map_function on [0,1] domain
     * cobweb_points is constructed from map_function and a random initial value
     """
-    sequences = [
-        sequence(map_function, initial_value, sequences_length)
-        for initial_value in np.random.random(sequences_count)
-    ]
-    cobweb_points = cobweb(map_function, np.random.random(), sequences_length)
-    frequency_response = fftpack.fft(sequences[0])
+    random = np.random.random if seed is None else np.random.default_rng(seed).random
+    sequences = sequence_batch(
+        map_function, random(sequences_count), sequences_length, jit=jit, precision=precision
+    )
+    cobweb_points = cobweb(map_function, random(), sequences_length, jit=jit, precision=precision)
+    return collect_data(map_function, sequences, cobweb_points)
+
+
+def collect_data(
+    map_function: MapFunction, sequences: np.ndarray, cobweb_points: np.ndarray
+) -> SimpleNamespace:
+    """Complete the sequences and cobweb_points with their power spectrum and the curve
+    of map_function into the data returned by generate_data."""
+    frequencies, power_spectrum = welch_psd(np.asarray(sequences, dtype=float))
     curve_domain = np.linspace(0, 1, 100)
     curve_points = curve(map_function, curve_domain)
     return SimpleNamespace(
         sequences=sequences,
         cobweb_points=cobweb_points,
-        frequency_response=frequency_response,
+        frequencies=frequencies,
+        power_spectrum=power_spectrum,
         curve_points=curve_points,
     )
+
+
+def _to_precision(values: np.ndarray, precision: str) -> np.ndarray:
+    if precision == "decimal":
+        return np.array([decimal.Decimal(float(value)) for value in values.ravel()]).reshape(
+            values.shape
+        )
+    return values.astype(PRECISIONS[precision])
+
+
+def _with_precision(map_function: MapFunction, precision: str) -> MapFunction:
+    """Bind the float parameters of a partial map_function as Decimals (exactly, so that
+    all precisions iterate the same map)."""
+    if precision != "decimal" or not isinstance(map_function, partial):
+        return map_function
+    keywords = {
+        name: decimal.Decimal(value) if isinstance(value, float) else value
+        for name, value in map_function.keywords.items()
+    }
+    return partial(map_function.func, *map_function.args, **keywords)
+
+
+def _precision_context(precision: str) -> ContextManager:
+    if precision == "decimal":
+        return decimal.localcontext(decimal.Context(prec=DECIMAL_DIGITS))
+    return nullcontext()
@@ -0,0 +1,75 @@
+"""Throughput and agreement of map orbits across precisions
+
+Nearby orbits of a chaotic map separate exponentially, so a rounded orbit follows the
+exact one only for a limited number of steps (about 50 for float64 at r = 3.9, and a few
+hundred for the 60 digits of "decimal"). compare_precisions iterates the same initial
+values in every precision, times them, and reports the step at which the orbits depart
+from those of the reference precision.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
+
+from libs.chaos.logistic_map import PRECISIONS, MapFunction, sequence_batch
+
+
+@dataclass
+class PrecisionResult:
+    # pylint: disable=missing-class-docstring
+    # pylint: disable=missing-function-docstring
+    precision: str
+    seconds: float
+    values: int
+    divergence_step: float  # median over the initial values
+
+    @property
+    def values_per_second(self) -> float:
+        return self.values / self.seconds if self.seconds > 0 else float("inf")
+
+
+def divergence_steps(orbits: np.ndarray, reference: np.ndarray, tolerance: float) -> np.ndarray:
+    """Return the first step at which each orbit (row) is farther than tolerance from
+    the same row of reference, or the length of the orbits if it never is."""
+    far = np.abs(np.asarray(orbits, dtype=float) - np.asarray(reference, dtype=float)) > tolerance
+    return np.where(far.any(axis=1), far.argmax(axis=1), far.shape[1])
+
+
+def compare_precisions(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    map_function: MapFunction,
+    x0: np.ndarray,
+    length: int,
+    precisions: Iterable[str] = tuple(PRECISIONS),
+    reference: str = "decimal",
+    tolerance: float = 1e-2,
+) -> List[PrecisionResult]:
+    """Iterate x0 in the reference and every other precision, and return the time and
+    divergence step from the reference orbits of each precision."""
+    precisions = list(precisions)
+    orbits, seconds = {}, {}
+    for precision in dict.fromkeys([reference, *precisions]):
+        start_time = time.perf_counter()
+        orbits[precision] = sequence_batch(map_function, x0, length, precision=precision)
+        seconds[precision] = time.perf_counter() - start_time
+    return [
+        PrecisionResult(
+            precision,
+            seconds[precision],
+            orbits[precision].size,
+            float(np.median(divergence_steps(orbits[precision], orbits[reference], tolerance))),
+        )
+        for precision in precisions
+    ]
+
+
+def format_results(results: List[PrecisionResult]) -> str:
+    """The results as a plain text table."""
+    lines = [f"{'precision':<12}{'seconds':>10}{'values/s':>12}{'divergence step':>17}"]
+    for result in results:
+        lines.append(
+            f"{result.precision:<12}{result.seconds:>10.3f}{result.values_per_second:>12.3g}"
+            f"{result.divergence_step:>17.1f}"
+        )
+    return "\n".join(lines)
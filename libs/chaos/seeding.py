@@ -0,0 +1,97 @@
+"""Reproducible generation of map data across a process pool
+
+The random initial values are drawn from independent streams: the seed is turned into a
+numpy SeedSequence (for a Generator, its own), whose spawned children seed one Generator
+per block of block_size sequences, and one for the cobweb. Blocks are the jobs of the
+process pool, and the stream of a block does not depend on the worker that runs it, so
+the combined output depends only on the seed and block_size, not on the number of
+workers. The children are derived without advancing the seed, so a SeedSequence or
+Generator passed twice gives the same data twice.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from types import SimpleNamespace
+from typing import List, Optional
+
+import numpy as np
+
+from libs.chaos.logistic_map import MapFunction, SeedLike, cobweb, collect_data, sequence_batch
+
+
+def spawn_generators(seed: SeedLike, count: int) -> List[np.random.Generator]:
+    """Return count Generators with independent streams, spawned from seed."""
+    return [np.random.default_rng(child) for child in _spawn(seed, count)]
+
+
+def generate_data_parallel(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    map_function: MapFunction,
+    sequences_count: int,
+    sequences_length: int,
+    seed: SeedLike,
+    workers: Optional[int] = None,
+    block_size: int = 64,
+    jit: bool = False,
+) -> SimpleNamespace:
+    """Return the same data as generate_data, with the sequences generated block by
+    block in a pool of workers processes (in this process if workers is 1).
+
+    map_function must be picklable, e.g. a functools.partial of a module level function
+    (not a lambda). The result is the same for any number of workers."""
+    if sequences_count < 1:
+        raise ValueError("Sequences count must be positive!")
+    if block_size < 1:
+        raise ValueError("Block size must be positive!")
+    cobweb_seed, blocks_seed = _spawn(seed, 2)
+    counts = [
+        min(block_size, sequences_count - start) for start in range(0, sequences_count, block_size)
+    ]
+    block_seeds = _spawn(blocks_seed, len(counts))
+    arguments = (
+        [map_function] * len(counts),
+        counts,
+        [sequences_length] * len(counts),
+        block_seeds,
+        [jit] * len(counts),
+    )
+    if workers == 1:
+        blocks = list(map(_block, *arguments))
+    else:
+        # NOTE: spawn (rather than fork) so that no state of this process leaks into them
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as executor:
+            blocks = list(executor.map(_block, *arguments))
+    cobweb_points = cobweb(
+        map_function, np.random.default_rng(cobweb_seed).random(), sequences_length, jit=jit
+    )
+    return collect_data(map_function, np.concatenate(blocks), cobweb_points)
+
+
+def _block(
+    map_function: MapFunction,
+    count: int,
+    length: int,
+    seed: np.random.SeedSequence,
+    jit: bool,
+) -> np.ndarray:
+    return sequence_batch(map_function, np.random.default_rng(seed).random(count), length, jit=jit)
+
+
+def _spawn(seed: SeedLike, count: int) -> List[np.random.SeedSequence]:
+    """The first count children of the SeedSequence of seed. Unlike SeedSequence.spawn
+    (and Generator.spawn) this does not advance the seed, so that the same seed always
+    gives the same children."""
+    if isinstance(seed, np.random.Generator):
+        # NOTE: the streams are spawned from the generator's own seed
+        sequence: np.random.SeedSequence = seed.bit_generator.seed_seq  # type: ignore
+    elif isinstance(seed, np.random.SeedSequence):
+        sequence = seed
+    else:
+        sequence = np.random.SeedSequence(seed)
+    return [
+        np.random.SeedSequence(
+            sequence.entropy,
+            spawn_key=(*sequence.spawn_key, i),
+            pool_size=sequence.pool_size,
+        )
+        for i in range(count)
+    ]
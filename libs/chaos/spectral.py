@@ -0,0 +1,106 @@
+"""Power spectral density of many sequences with Welch's method
+
+Every sequence is cut into overlapping segments, each segment is detrended (its mean
+removed) and multiplied by a Hann window (rectangular for segments of one value), and
+the periodograms of all segments of all sequences (one batched real FFT along the last
+axis) are averaged. WelchEstimator takes the sequences chunk by chunk, carrying the
+unfinished segment over to the next chunk, so that arbitrarily long sequences never
+need to be in memory at once; the result is the same as for the whole sequences at
+once.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+_BLOCK_SIZE = 1 << 22  # values transformed at once
+
+
+class WelchEstimator:
+    # pylint: disable=missing-function-docstring
+    """Running Welch estimate of the one-sided power spectral density."""
+
+    def __init__(
+        self,
+        segment_length: int = 256,
+        noverlap: Optional[int] = None,
+        sampling_rate: float = 1.0,
+    ) -> None:
+        """noverlap is the number of values shared by consecutive segments, by default
+        half a segment."""
+        noverlap = segment_length // 2 if noverlap is None else noverlap
+        if segment_length < 1 or not 0 <= noverlap < segment_length:
+            raise ValueError("Need segment_length > noverlap >= 0!")
+        self._segment_length = segment_length
+        self._step = segment_length - noverlap
+        self._sampling_rate = sampling_rate
+        # NOTE: periodic, as for spectra; the Hann window of a single value would be 0
+        self._window = (
+            np.hanning(segment_length + 1)[:-1] if segment_length > 1 else np.ones(segment_length)
+        )
+        self._power_sum = np.zeros(segment_length // 2 + 1)
+        self._segments = 0
+        self._tail: Optional[np.ndarray] = None
+
+    @property
+    def frequencies(self) -> np.ndarray:
+        return np.fft.rfftfreq(self._segment_length, d=1 / self._sampling_rate)
+
+    @property
+    def segments(self) -> int:
+        """The number of segments averaged so far."""
+        return self._segments
+
+    @property
+    def psd(self) -> np.ndarray:
+        if not self._segments:
+            raise ValueError("No complete segment yet!")
+        psd = self._power_sum / (self._segments * self._sampling_rate * np.sum(self._window**2))
+        # NOTE: one-sided; the power of the negative frequencies is added to the positive
+        #       ones, except for DC and (for even lengths) the Nyquist frequency
+        psd[1 : (self._segment_length + 1) // 2] *= 2
+        return psd
+
+    def update(self, chunk: np.ndarray) -> None:
+        """Add the next values of the sequences: an array with one row per sequence (or
+        a 1D array for a single sequence), continuing the rows of earlier chunks."""
+        chunk = np.atleast_2d(chunk)
+        if self._tail is None:
+            self._tail = chunk[:, :0]
+        if len(chunk) != len(self._tail):
+            raise ValueError(f"Expected {len(self._tail)} sequences, got {len(chunk)}!")
+        values = np.concatenate([self._tail, chunk], axis=1)
+        count = max((values.shape[1] - self._segment_length) // self._step + 1, 0)
+        block = max(1, _BLOCK_SIZE // (len(values) * self._segment_length))
+        for first in range(0, count, block):
+            self._add_segments(values, first, min(first + block, count))
+        self._tail = values[:, count * self._step :].copy()
+
+    def _add_segments(self, values: np.ndarray, first: int, last: int) -> None:
+        """Add the periodograms of the segments first..last-1 of all rows."""
+        windows = np.lib.stride_tricks.sliding_window_view(
+            values[:, first * self._step : (last - 1) * self._step + self._segment_length],
+            self._segment_length,
+            axis=1,
+        )[:, :: self._step]
+        segments = (windows - windows.mean(axis=-1, keepdims=True)) * self._window
+        spectra = np.fft.rfft(segments, axis=-1)
+        self._power_sum += np.sum(spectra.real**2 + spectra.imag**2, axis=(0, 1))
+        self._segments += segments.shape[0] * segments.shape[1]
+
+
+def welch_psd(
+    sequences: np.ndarray,
+    segment_length: int = 256,
+    noverlap: Optional[int] = None,
+    sampling_rate: float = 1.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the frequencies and the power spectral density averaged over all segments
+    of all sequences (rows); segment_length is capped at the sequence length."""
+    sequences = np.atleast_2d(sequences)
+    segment_length = min(segment_length, sequences.shape[1])
+    if noverlap is not None:
+        noverlap = min(noverlap, segment_length - 1)
+    estimator = WelchEstimator(segment_length, noverlap, sampling_rate)
+    estimator.update(sequences)
+    return estimator.frequencies, estimator.psd
@@ -3,25 +3,52 @@
 SlidingFigure: An object to plot the "logistic map" curve and
     processes, with interactive control of the "r" parameters of the
     "logistic map"
+plot_bifurcation_diagram: plot a bifurcation diagram as a raster image
 """
 
 from functools import partial
 from types import SimpleNamespace
-from typing import List
+from typing import Tuple
 
 import matplotlib.pyplot as plt
 import matplotlib.widgets
 import numpy as np
+from matplotlib.collections import LineCollection
 
+from libs.chaos.bifurcation import BifurcationDiagram
+from libs.chaos.frame_cache import FrameCache
 from libs.chaos.logistic_map import generate_data, logistic_map
 
+# NOTE: converged (periodic) processes have (almost) no power apart from a few peaks;
+#       the spectrum is clipped from below to keep the log scale readable
+_PSD_FLOOR = 1e-12
+
 
 class LogisticMapVisualizer:
     # pylint: disable=missing-class-docstring
     # pylint: disable=too-few-public-methods
-    def __init__(self, sequences_count: int, sequences_length: int):
+    # pylint: disable=too-many-instance-attributes
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        sequences_count: int,
+        sequences_length: int,
+        precompute: bool = False,
+        seed: int = 0,
+        r_step: float = 0.2,
+    ):
+        """With precompute=True the data of every slider step is computed from the same
+        seed in a background thread and kept in a FrameCache, so that moving the slider
+        only swaps the data of the plots."""
         self._sequences_count = sequences_count
         self._sequences_length = sequences_length
+        self._seed = seed
+        self._frames = None
+        if precompute:
+            r_values = np.arange(0.0, 4.0 + r_step / 2, r_step)
+            self._frames = FrameCache(self._compute_frame, max_size=len(r_values))
+            # NOTE: the steps next to the initial value are the first to be needed
+            order = np.argsort(np.abs(r_values - 0.2), kind="stable")
+            self._frames.prefetch(self._frame_key(r) for r in r_values[order])
         self._fig = plt.figure(figsize=(18, 8))
         self._axes = SimpleNamespace(
             curve_and_cobweb=plt.subplot2grid((9, 4), (0, 0), rowspan=8, colspan=1),
@@ -31,15 +58,30 @@ class LogisticMapVisualizer:
         )
         self._plots = SimpleNamespace(curve=None, cobweb=None, sequences=None, frequency=None)
         self._slider = matplotlib.widgets.Slider(
-            self._axes.slider, "r", 0.0, 4.0, valinit=0.2, valstep=0.2
+            self._axes.slider, "r", 0.0, 4.0, valinit=0.2, valstep=r_step
         )
         self._slider.on_changed(self._update)
         self._fig.tight_layout()
         self._draw_all()
         plt.show()
+        if self._frames is not None:
+            self._frames.close()
+
+    def _frame_key(self, r: float) -> Tuple[float, int]:
+        # NOTE: rounded, so that slider values such as 0.6000000000000001 hit the cache
+        return round(float(r), 9), self._seed
+
+    def _compute_frame(self, key: Tuple[float, int]) -> SimpleNamespace:
+        r, seed = key
+        logistic_map_func = partial(logistic_map, r=r)
+        return generate_data(
+            logistic_map_func, self._sequences_count, self._sequences_length, seed=seed
+        )
 
     def _generate_data(self) -> SimpleNamespace:
         r = self._slider.val
+        if self._frames is not None:
+            return self._frames.get(self._frame_key(r))
         logistic_map_func = partial(logistic_map, r=r)
         return generate_data(logistic_map_func, self._sequences_count, self._sequences_length)
 
@@ -48,7 +90,7 @@ class LogisticMapVisualizer:
         self._plot_curve(data.curve_points)
         self._plot_cobweb(data.cobweb_points)
         self._plot_sequences(data.sequences)
-        self._plot_frequency(data.frequency_response)
+        self._plot_frequency(data.frequencies, data.power_spectrum)
 
     def _plot_curve(self, points: np.ndarray):
         axis = self._axes.curve_and_cobweb
@@ -66,30 +108,67 @@ class LogisticMapVisualizer:
             0
         ]
 
-    def _plot_sequences(self, sequences: List[np.ndarray]):
+    def _plot_sequences(self, sequences: np.ndarray):
         axis = self._axes.sequences
-        self._plots.sequences = [axis.plot(s, "k", linewidth=0.3, alpha=0.6)[0] for s in sequences]
+        # NOTE: one artist for all processes, updated with a single set_segments
+        self._plots.sequences = LineCollection(
+            list(_sequence_segments(sequences)), colors="k", linewidths=0.3, alpha=0.6
+        )
+        axis.add_collection(self._plots.sequences)
+        axis.autoscale_view()
         axis.set_title(f"{len(sequences)} chaotic processes")
         axis.set_ylim([0, 1])
         axis.set_xlabel("t")
         axis.set_ylabel("x[t]")
 
-    def _plot_frequency(self, signal: np.ndarray):
+    def _plot_frequency(self, frequencies: np.ndarray, power_spectrum: np.ndarray):
         axis = self._axes.frequency
-        self._plots.frequency = axis.plot(signal, "k", linewidth=0.3, alpha=0.6)[0]
-        axis.set_title("frequency spectrum")
-        axis.set_ylim([signal.real.min() - 1, signal.real.max() + 1])
-        axis.set_xlabel("f")
-        axis.set_ylabel("spectrum")
+        power_spectrum = np.maximum(power_spectrum, _PSD_FLOOR)
+        self._plots.frequency = axis.semilogy(frequencies, power_spectrum, "k", linewidth=0.6)[0]
+        axis.set_title("power spectral density (Welch, all processes)")
+        axis.set_ylim(_log_limits(power_spectrum))
+        axis.set_xlabel("f [1/step]")
+        axis.set_ylabel("PSD")
 
     def _update(self, _):
         data = self._generate_data()
         self._plots.curve.set_ydata(data.curve_points[:, 1])
         self._plots.cobweb.set_data(data.cobweb_points[:, 0], data.cobweb_points[:, 1])
-        for i, p in enumerate(self._plots.sequences):
-            p.set_ydata(data.sequences[i])
-        self._plots.frequency.set_ydata(data.frequency_response)
-        self._plots.frequency.axes.set_ylim(
-            [data.frequency_response.real.min() - 1, data.frequency_response.real.max() + 1]
-        )
+        self._plots.sequences.set_segments(_sequence_segments(data.sequences))
+        power_spectrum = np.maximum(data.power_spectrum, _PSD_FLOOR)
+        self._plots.frequency.set_data(data.frequencies, power_spectrum)
+        self._plots.frequency.axes.set_ylim(_log_limits(power_spectrum))
         self._fig.canvas.draw_idle()
+
+
+def _sequence_segments(sequences: np.ndarray) -> np.ndarray:
+    """The (t, x[t]) points of every sequence, as (count, length, 2) line segments."""
+    sequences = np.asarray(sequences)
+    times = np.broadcast_to(np.arange(sequences.shape[1]), sequences.shape)
+    return np.stack([times, sequences], axis=-1)
+
+
+def _log_limits(values: np.ndarray) -> Tuple[float, float]:
+    return float(values.min()) / 2, max(float(values.max()), float(values.min()) * 10) * 2
+
+
+def plot_bifurcation_diagram(diagram: BifurcationDiagram):  # pragma: no cover
+    """Show the density of the diagram as one image instead of a scatter of its points."""
+    _, axis = plt.subplots(figsize=(12, 7))
+    axis.imshow(
+        diagram.image(),
+        extent=(
+            diagram.r_values[0],
+            diagram.r_values[-1],
+            diagram.x_edges[0],
+            diagram.x_edges[-1],
+        ),
+        aspect="auto",
+        cmap="gray_r",
+        interpolation="nearest",
+    )
+    axis.set_title("bifurcation diagram")
+    axis.set_xlabel("r")
+    axis.set_ylabel("x")
+    plt.tight_layout()
+    plt.show()
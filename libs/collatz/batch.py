@@ -0,0 +1,113 @@
+"""Vectorized batch stepping of Collatz values with NumPy"""
+
+from functools import partial
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from libs.collatz.successor_table import INT64_MAX, Successors, SuccessorTable
+
+MAX_SAFE = (INT64_MAX - 1) // 3  # the largest n for which 3n+1 fits into int64
+
+
+def step(values: np.ndarray) -> np.ndarray:
+    """Advance every value by one Collatz step; the caller must rule out overflow."""
+    odd = (values & 1).astype(bool)
+    return np.where(odd, values * 3 + 1, values >> 1)
+
+
+def overflows(values: np.ndarray) -> np.ndarray:
+    """Mask the values whose next step does not fit into int64."""
+    return ((values & 1) == 1) & (values > MAX_SAFE)
+
+
+def sequences_csr(successors: Successors, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the sequences of [start, end), read from the successors (which must hold
+    every value they visit), packed back to back into one int64 array, with sequence i
+    in values[offsets[i]:offsets[i + 1]]. All lanes are looked up at once per step:
+    SuccessorTable.lookup for a table, one dict lookup per lane for a dict. Raises
+    OverflowError if a value does not fit into int64."""
+    if isinstance(successors, SuccessorTable):
+        lookup = successors.lookup
+    else:
+        lookup = partial(_lookup, successors)
+    lanes = np.arange(end - start)
+    values = np.arange(start, end, dtype=np.int64)
+    visited: List[Tuple[np.ndarray, np.ndarray]] = []
+    while lanes.size:
+        visited.append((lanes, values))
+        running = values != 1
+        lanes, values = lanes[running], values[running]
+        values = lookup(values)
+    lengths = np.bincount(np.concatenate([lanes for lanes, _ in visited]), minlength=end - start)
+    offsets = np.zeros(end - start + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    packed = np.empty(offsets[-1], dtype=np.int64)
+    for index, (lanes, values) in enumerate(visited):
+        packed[offsets[lanes] + index] = values
+    return offsets, packed
+
+
+def fill_successors(table: SuccessorTable, start: int, end: int, batch_size: int = 1 << 20) -> None:
+    """Fill the table with the successors of every value visited from [start, end).
+
+    Start values are processed in batches; each batch is a frontier of lanes that
+    are advanced together with masked 3n+1 / n//2 updates. A lane in the dense part
+    of the table retires as soon as it reaches a known value, or a value another
+    lane is at in the same step. Lanes above the dense part are not looked up while
+    they climb; their successors are collected and merged into the table once per
+    batch, and they retire when they fall back into the dense part. Lanes whose next
+    step would overflow int64 are finished one by one with Python ints.
+    """
+    for batch_start in range(start, end, batch_size):
+        lanes = np.arange(batch_start, min(batch_start + batch_size, end), dtype=np.int64)
+        spill_keys: List[np.ndarray] = []
+        spill_values: List[np.ndarray] = []
+        while lanes.size:
+            lanes = _advance(table, lanes, spill_keys, spill_values)
+        table.update(np.concatenate(spill_keys), np.concatenate(spill_values))
+
+
+def _advance(
+    table: SuccessorTable,
+    lanes: np.ndarray,
+    spill_keys: List[np.ndarray],
+    spill_values: List[np.ndarray],
+) -> np.ndarray:
+    """Advance the lanes by one step and return the lanes that are still active."""
+    dense = table.dense
+    below = lanes < table.size
+    low = lanes[below]
+    low = low[dense[low] == 0]
+    # NOTE: mark each lane in the table with its own (negative) id; of several
+    #       lanes at the same value only the one whose mark survived continues.
+    marks = -np.arange(1, len(low) + 1, dtype=np.int64)
+    dense[low] = marks
+    low = low[dense[low] == marks]
+    high = lanes[~below]
+    overflow = overflows(high)
+    if overflow.any():
+        for n in high[overflow].tolist():
+            _fill_scalar(table, n)
+        high = high[~overflow]
+    next_low, next_high = step(low), step(high)
+    dense[low] = next_low
+    spill_keys.append(high)
+    spill_values.append(next_high)
+    return np.concatenate([next_low, next_high])
+
+
+def _lookup(successors: Dict[int, int], values: np.ndarray) -> np.ndarray:
+    try:
+        return np.fromiter(
+            (successors[n] for n in values.tolist()), dtype=np.int64, count=len(values)
+        )
+    except OverflowError as error:
+        raise OverflowError("A successor does not fit into int64") from error
+
+
+def _fill_scalar(table: SuccessorTable, n: int) -> None:
+    while n not in table:
+        next_value = n * 3 + 1 if n % 2 == 1 else n // 2
+        table[n] = next_value
+        n = next_value
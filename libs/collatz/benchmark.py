@@ -0,0 +1,173 @@
+"""Benchmarks of CollatzSequences across range sizes
+
+Every (case, mode, size) runs in a fresh process, so that its peak RSS is not shadowed
+by earlier runs and no cache survives between them. A case measures one of:
+
+* construction: CollatzSequences(1, size + 1), which computes the successors,
+* statistics, sequences, compact_graph, graph: the property on a constructed instance,
+
+in one of the caching modes (dict, compact, vectorized). The results are written as a
+JSON report, which compare() checks against a baseline report for regressions.
+"""
+
+import json
+import os
+import platform
+import resource
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from libs.collatz.collatz import CollatzSequences
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """measure returns the number of entries it produced from a constructed instance;
+    sizes above max_size are skipped (e.g. the full sequences grow as size * log(size))."""
+
+    measure: Optional[Callable[[CollatzSequences], int]]
+    max_size: int
+
+
+@dataclass
+class BenchmarkResult:
+    # pylint: disable=missing-class-docstring
+    # pylint: disable=missing-function-docstring
+    case: str
+    mode: str
+    size: int
+    seconds: float
+    peak_rss_mb: float
+    entries: int
+
+    @property
+    def entries_per_second(self) -> float:
+        return self.entries / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return self.case, self.mode, self.size
+
+
+CASES: Dict[str, BenchmarkCase] = {
+    "construction": BenchmarkCase(None, 10**7),
+    "statistics": BenchmarkCase(lambda collatz: len(collatz.statistics.stopping_times), 10**7),
+    "sequences": BenchmarkCase(lambda collatz: sum(map(len, collatz.sequences.values())), 10**5),
+    "compact_graph": BenchmarkCase(lambda collatz: len(collatz.compact_graph), 10**7),
+    "graph": BenchmarkCase(lambda collatz: collatz.graph.number_of_nodes(), 10**6),
+}
+MODES: Dict[str, Tuple[bool, bool]] = {  # (compact, vectorized)
+    "dict": (False, False),
+    "compact": (True, False),
+    "vectorized": (False, True),
+}
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+def run_case(case: str, mode: str, size: int) -> BenchmarkResult:
+    """Run one case in this process; the peak RSS is that of the whole process."""
+    start_time = time.perf_counter()
+    compact, vectorized = MODES[mode]
+    collatz = CollatzSequences(1, size + 1, compact=compact, vectorized=vectorized)
+    seconds = time.perf_counter() - start_time
+    entries = size
+    measure = CASES[case].measure
+    if measure is not None:
+        start_time = time.perf_counter()
+        entries = measure(collatz)
+        seconds = time.perf_counter() - start_time
+    # NOTE: ru_maxrss is in kilobytes on Linux (but in bytes on macOS)
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return BenchmarkResult(case, mode, size, seconds, peak_rss_mb, entries)
+
+
+def run_benchmarks(
+    cases: Iterable[str], modes: Iterable[str], sizes: Iterable[int], repeat: int = 1
+) -> List[BenchmarkResult]:
+    """Run every combination in a fresh process, keeping the fastest of repeat runs."""
+    results = []
+    for case in cases:
+        for mode in modes:
+            for size in sizes:
+                if size > CASES[case].max_size:
+                    continue
+                runs = [_run_in_subprocess(case, mode, size) for _ in range(repeat)]
+                results.append(min(runs, key=lambda result: result.seconds))
+    return results
+
+
+def write_report(results: List[BenchmarkResult], path: str) -> None:
+    """Write the results and where they were measured (commit, versions) as JSON."""
+    report = {"metadata": _metadata(), "results": [asdict(result) for result in results]}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+def read_report(path: str) -> List[BenchmarkResult]:
+    """Read the results of a report written by write_report."""
+    with open(path, encoding="utf-8") as file:
+        report = json.load(file)
+    return [BenchmarkResult(**result) for result in report["results"]]
+
+
+def compare(
+    baseline: List[BenchmarkResult], current: List[BenchmarkResult], tolerance: float = 0.2
+) -> List[str]:
+    """Describe every result that is more than tolerance (relative) slower, or uses
+    more memory, than the same (case, mode, size) in the baseline."""
+    baseline_results = {result.key: result for result in baseline}
+    regressions = []
+    for result in current:
+        if result.key not in baseline_results:
+            continue
+        before = baseline_results[result.key]
+        for metric in ("seconds", "peak_rss_mb"):
+            old, new = getattr(before, metric), getattr(result, metric)
+            if new > old * (1 + tolerance):
+                regressions.append(
+                    f"{'/'.join(map(str, result.key))} {metric}: {old:.3g} -> {new:.3g}"
+                )
+    return regressions
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """The results as a plain text table."""
+    lines = [f"{'case':<14}{'mode':<12}{'size':>10}{'seconds':>10}{'peak MB':>10}{'entries/s':>12}"]
+    for result in results:
+        lines.append(
+            f"{result.case:<14}{result.mode:<12}{result.size:>10}{result.seconds:>10.3f}"
+            f"{result.peak_rss_mb:>10.1f}{result.entries_per_second:>12.3g}"
+        )
+    return "\n".join(lines)
+
+
+def _run_in_subprocess(case: str, mode: str, size: int) -> BenchmarkResult:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(run_case, case, mode, size).result()
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
@@ -1,16 +1,38 @@
 """Functions to generate Collatz sequences"""
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import networkx as nx
+import numpy as np
+
+from libs.collatz.batch import fill_successors, sequences_csr
+from libs.collatz.graph import CollatzGraph
+from libs.collatz.statistics import CollatzStatistics
+from libs.collatz.store import CollatzStore
+from libs.collatz.successor_table import Successors, SuccessorTable
 
 
 class CollatzSequences:
     # pylint: disable=too-few-public-methods
+    # pylint: disable=too-many-instance-attributes
     # pylint: disable=missing-class-docstring
     # pylint: disable=missing-function-docstring
 
-    def __init__(self, start: int, end: int) -> None:
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        start: int,
+        end: int,
+        compact: bool = False,
+        vectorized: bool = False,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        """With compact=True the successors are kept in a SuccessorTable (8 bytes per
+        value below end) instead of a dict (roughly 100+ bytes per entry).
+        With vectorized=True they are computed in batches with NumPy, which implies a
+        SuccessorTable.
+        With cache_dir the successors and statistics are loaded from a CollatzStore in
+        that directory, which is first extended to end if needed. The successors then
+        cover the whole store, so the graph does too."""
         if start < 1:
             raise ValueError("Start must be positive!")
         if not start < end:
@@ -18,18 +40,78 @@ class CollatzSequences:
 
         self._start = start
         self._end = end
-        self._next_cached: Dict[int, int] = {1: 4, 4: 2, 2: 1}
+        self._vectorized = vectorized
+        self._next_cached: Successors = {}
         self._sequences: Dict[int, List[int]] = {}
+        self._statistics: Optional[CollatzStatistics] = None
+        self._compact_graph: Optional[CollatzGraph] = None
         self._graph: Optional[nx.DiGraph] = None
-        self._compute_pairs()
-        self._compute_sequences()
+        if cache_dir is not None:
+            store = CollatzStore(cache_dir)
+            store.extend(end)
+            self._next_cached = store.successor_table()
+            self._statistics = store.statistics(start, end)
+        else:
+            if compact or vectorized:
+                self._next_cached = SuccessorTable(end)
+            for key, value in {1: 4, 4: 2, 2: 1}.items():
+                self._next_cached[key] = value
+            self._compute_pairs()
 
     @property
     def sequences(self) -> Dict[int, list]:
+        """Full sequences, only materialized on first access (O(sum of lengths) memory)."""
+        if not self._sequences:
+            self._compute_sequences()
         return self._sequences
 
+    @property
+    def statistics(self) -> CollatzStatistics:
+        if self._statistics is None:
+            self._statistics = CollatzStatistics.from_successors(
+                self._next_cached, self._start, self._end
+            )
+        return self._statistics
+
+    def iter_sequences(
+        self, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[int]]]:
+        """Yield (start value, sequence) pairs in order, walking the successors on demand,
+        so only one sequence is held in memory at a time."""
+        for initial_value in self._range(start, end):
+            n = initial_value
+            sequence = [n]
+            while n != 1:
+                n = self._next_cached[n]
+                sequence.append(n)
+            yield initial_value, sequence
+
+    def iter_sequence_chunks(
+        self, chunk_size: int, start: Optional[int] = None, end: Optional[int] = None
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield the sequences chunk_size start values at a time as NumPy arrays
+        (start values, offsets, values): sequence i of a chunk is
+        values[offsets[i]:offsets[i + 1]]. Peak memory is one chunk.
+
+        The chunks are read from the successors with one vectorized lookup per step (see
+        batch.sequences_csr), so they come from the persisted table with cache_dir.
+        Raises OverflowError if a value does not fit into int64; iter_sequences walks
+        those with Python ints."""
+        initial_values = self._range(start, end)
+        for chunk_start in range(initial_values.start, initial_values.stop, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, initial_values.stop)
+            offsets, values = sequences_csr(self._next_cached, chunk_start, chunk_end)
+            yield np.arange(chunk_start, chunk_end), offsets, values
+
+    @property
+    def compact_graph(self) -> CollatzGraph:
+        if self._compact_graph is None:
+            self._compact_graph = CollatzGraph.from_successors(self._next_cached)
+        return self._compact_graph
+
     @property
     def graph(self) -> nx.DiGraph:
+        """The compact graph converted to networkx, only on first access."""
         return self._as_graph()
 
     @staticmethod
@@ -37,6 +119,10 @@ class CollatzSequences:
         return n * 3 + 1 if n % 2 == 1 else n // 2
 
     def _compute_pairs(self):
+        if self._vectorized:
+            assert isinstance(self._next_cached, SuccessorTable)
+            fill_successors(self._next_cached, self._start, self._end)
+            return
         for initial_value in range(self._start, self._end):
             n = initial_value
             while True:
@@ -60,13 +146,18 @@ class CollatzSequences:
             sequence.append(n)
         return sequence
 
+    def _range(self, start: Optional[int], end: Optional[int]) -> range:
+        start = self._start if start is None else start
+        end = self._end if end is None else end
+        if not self._start <= start <= end <= self._end:
+            raise ValueError(f"[{start}, {end}) is not within [{self._start}, {self._end})!")
+        return range(start, end)
+
     def _compute_sequences(self):
         for n in range(self._start, self._end):
             self._sequences[n] = self._sequence(n)
 
     def _as_graph(self) -> nx.DiGraph:
         if self._graph is None:
-            self._graph = nx.DiGraph()
-            for key, value in self._next_cached.items():
-                self._graph.add_edge(key, value)
+            self._graph = self.compact_graph.to_networkx()
         return self._graph
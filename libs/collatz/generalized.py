@@ -0,0 +1,221 @@
+"""Generalized Collatz maps: qn+1 and other piecewise-affine maps of positive integers
+
+Unlike 3n+1, orbits of such maps may end in other cycles than 1-4-2 or grow without
+bound. GeneralizedCollatz labels each start value with the cycle its orbit falls
+into (or DIVERGED) and the number of steps before it gets there:
+
+* an orbit is followed with Brent's algorithm over the successors (O(1) state per
+  orbit) until it closes a cycle, and then walked again to label its values,
+* labels are kept in arrays indexed by value, so every value below end is labeled once
+  and a later orbit stops as soon as it reaches a labeled value or a cycle member,
+* orbits that do not close a cycle within max_steps steps (i.e. transient plus cycle
+  length exceeds max_steps), or exceed max_value before, are labeled as DIVERGED.
+
+Every label depends on the orbit of its value only, not on the range it was found from.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from libs.collatz.successor_table import INT64_MAX, SuccessorTable
+
+DIVERGED = -1
+_UNKNOWN = -2
+
+
+@dataclass(frozen=True)
+class AffineMap:
+    """n -> (a * n + b) // d with (a, b, d) = coefficients[n % len(coefficients)].
+
+    The division must be exact for every n of the residue class, i.e. d must divide
+    both a * len(coefficients) and a * r + b.
+    """
+
+    # pylint: disable=missing-function-docstring
+    coefficients: Tuple[Tuple[int, int, int], ...]
+
+    def __post_init__(self) -> None:
+        if not self.coefficients:
+            raise ValueError("At least one residue class is needed!")
+        for r, (a, b, d) in enumerate(self.coefficients):
+            if d < 1 or (a * self.modulus) % d or (a * r + b) % d:
+                raise ValueError(
+                    f"({a} * n + {b}) / {d} is not an integer for n % {self.modulus} == {r}!"
+                )
+
+    @property
+    def modulus(self) -> int:
+        return len(self.coefficients)
+
+    def __call__(self, n: int) -> int:
+        a, b, d = self.coefficients[n % self.modulus]
+        return (a * n + b) // d
+
+
+def qx_plus_one(q: int) -> AffineMap:
+    """n -> n / 2 for even n and q * n + 1 for odd n; q = 3 is the Collatz map."""
+    return AffineMap(((1, 0, 2), (q, 1, 1)))
+
+
+class GeneralizedCollatz:
+    # pylint: disable=too-many-instance-attributes
+    # pylint: disable=missing-function-docstring
+    """Cycle labels of the orbits of mapping for the start values in [start, end)."""
+
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        mapping: AffineMap,
+        start: int,
+        end: int,
+        max_steps: int = 10_000,
+        max_value: int = INT64_MAX,
+    ) -> None:
+        """The successors of values below end are cached in a SuccessorTable; those of
+        larger values are recomputed, as diverging orbits would otherwise cache up to
+        max_steps values each."""
+        if start < 1:
+            raise ValueError("Start must be positive!")
+        if not start < end:
+            raise ValueError("End must be greater than or equal to start!")
+        self._mapping = mapping
+        self._start = start
+        self._end = end
+        self._max_steps = max_steps
+        self._max_value = max_value
+        self._successors = SuccessorTable(end)
+        # NOTE: labels are indexed by value, so that orbits dropping below start are
+        #       shared too; cycle ids index self._cycles, transients count steps
+        self._cycle_ids = np.full(end, _UNKNOWN, dtype=np.int32)
+        self._transients = np.full(end, _UNKNOWN, dtype=np.int32)
+        self._cycles: List[List[int]] = []
+        self._members: Dict[int, int] = {}  # value on a cycle -> its id
+        for n in range(start, end):
+            if self._cycle_ids[n] == _UNKNOWN:
+                self._label_orbit(n)
+
+    @property
+    def successors(self) -> SuccessorTable:
+        return self._successors
+
+    @property
+    def cycles(self) -> List[List[int]]:
+        """The cycles found, each starting at its smallest value."""
+        return self._cycles
+
+    @property
+    def cycle_ids(self) -> np.ndarray:
+        """Index into cycles of the cycle each start value ends in, or DIVERGED."""
+        return self._cycle_ids[self._start : self._end]
+
+    @property
+    def transients(self) -> np.ndarray:
+        """Steps from each start value to its cycle (0 on the cycle), or DIVERGED."""
+        return self._transients[self._start : self._end]
+
+    @property
+    def on_cycle(self) -> np.ndarray:
+        """Whether each start value is a member of a cycle."""
+        return self.transients == 0
+
+    @property
+    def diverged(self) -> np.ndarray:
+        return self.cycle_ids == DIVERGED
+
+    def _next(self, n: int) -> int:
+        if n < self._end:
+            cached = int(self._successors.dense[n])
+            if cached:
+                return cached
+        value = self._mapping(n)
+        if value < 1:
+            raise ValueError(f"The map sends {n} to the non-positive value {value}!")
+        if n < self._end:
+            self._successors[n] = value
+        return value
+
+    def _label_orbit(self, n: int) -> None:
+        """Follow the orbit of n with Brent's algorithm until it reaches a labeled value
+        or a known cycle member, exceeds max_value, or closes a new cycle, then walk it
+        again from n to label the values on the way.
+
+        If the i-th value of the orbit closes its cycle (of length c) within max_steps
+        steps, the transient of n is at most i + max_steps - c, and Brent's hare detects
+        the cycle before step 2 * (i + max_steps + 2) + max_steps - 2. So if the hare
+        takes 5 * (max_steps + 1) steps without any of the above, the first
+        max_steps + 1 values of the orbit are DIVERGED, and the rest is left to be
+        labeled from its own start."""
+        limit = 5 * (self._max_steps + 1)
+        power = length = 1
+        tortoise, hare, steps = n, n, 0
+        while True:
+            target = self._target(hare)
+            if target is not None:
+                self._label_path(n, steps, *target)
+                if hare > self._max_value:
+                    self._label(hare, DIVERGED, DIVERGED)
+                return
+            if steps == limit:
+                self._label_path(n, self._max_steps + 1, DIVERGED, DIVERGED)
+                return
+            if power == length:
+                tortoise, power, length = hare, 2 * power, 0
+            hare = self._next(hare)
+            steps += 1
+            length += 1
+            if hare == tortoise:
+                self._close_cycle(n, length)
+                return
+
+    def _target(self, n: int) -> Optional[Tuple[int, int]]:
+        """The labels of n if an orbit can stop at n, else None."""
+        if n in self._members:
+            return self._members[n], 0
+        if n < self._end and self._cycle_ids[n] != _UNKNOWN:
+            return int(self._cycle_ids[n]), int(self._transients[n])
+        if n > self._max_value:
+            return DIVERGED, DIVERGED
+        return None
+
+    def _close_cycle(self, n: int, length: int) -> None:
+        """Label the orbit of n, which ends in a new cycle of the given length."""
+        entry, hare = n, n
+        for _ in range(length):
+            hare = self._next(hare)
+        transient = 0
+        while entry != hare:
+            entry, hare = self._next(entry), self._next(hare)
+            transient += 1
+        if length > self._max_steps:
+            self._label_path(n, transient + length, DIVERGED, DIVERGED)
+            return
+        cycle = [entry]
+        while len(cycle) < length:
+            cycle.append(self._next(cycle[-1]))
+        i = cycle.index(min(cycle))
+        cycle = cycle[i:] + cycle[:i]
+        cycle_id = len(self._cycles)
+        self._members.update(dict.fromkeys(cycle, cycle_id))
+        self._cycles.append(cycle)
+        for member in cycle:
+            self._label(member, cycle_id, 0)
+        self._label_path(n, transient, cycle_id, 0)
+
+    def _label_path(self, n: int, count: int, cycle_id: int, transient: int) -> None:
+        """Label the count values of the orbit from n, which then reaches a value with
+        the given labels. A value closes its cycle after its transient plus the cycle
+        length steps; where that is more than max_steps it is DIVERGED."""
+        length = len(self._cycles[cycle_id]) if cycle_id != DIVERGED else 0
+        for i in range(count):
+            steps = transient + count - i
+            if cycle_id == DIVERGED or steps + length > self._max_steps:
+                self._label(n, DIVERGED, DIVERGED)
+            else:
+                self._label(n, cycle_id, steps)
+            n = self._next(n)
+
+    def _label(self, n: int, cycle_id: int, transient: int) -> None:
+        if n < self._end and self._cycle_ids[n] == _UNKNOWN:
+            self._cycle_ids[n] = cycle_id
+            self._transients[n] = transient
@@ -0,0 +1,153 @@
+"""A compact graph of the Collatz successor map"""
+
+from typing import Optional
+
+import networkx as nx
+import numpy as np
+
+from libs.collatz.successor_table import Successors, SuccessorTable
+
+
+class CollatzGraph:
+    """The successor map as arrays instead of a networkx DiGraph.
+
+    Nodes are the values, sorted. Every node has exactly one successor, kept as a node
+    index per node. The predecessors are kept CSR-style: the predecessors of node i are
+    predecessors[indptr[i]:indptr[i + 1]]. Apart from the 1 -> 4 -> 2 -> 1 cycle the
+    graph is a tree rooted at 1, which the depth and subtree queries rely on.
+    """
+
+    # pylint: disable=missing-function-docstring
+
+    def __init__(self, values: np.ndarray, successors: np.ndarray) -> None:
+        order = np.argsort(values)
+        self._nodes = values[order]
+        if not self._nodes.size or self._nodes[0] != 1:
+            raise ValueError("The graph must contain 1!")
+        self._successors = self._nodes.searchsorted(successors[order])
+        self._indptr = np.zeros(len(self._nodes) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._successors, minlength=len(self._nodes)), out=self._indptr[1:])
+        self._predecessors = np.argsort(self._successors, kind="stable")
+        self._depths: Optional[np.ndarray] = None
+        self._subtree_sizes: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_successors(cls, successors: Successors) -> "CollatzGraph":
+        if isinstance(successors, SuccessorTable):
+            return cls(*successors.to_arrays())
+        values = np.fromiter(successors.keys(), dtype=np.int64, count=len(successors))
+        return cls(values, np.fromiter(successors.values(), dtype=np.int64, count=len(values)))
+
+    @property
+    def nodes(self) -> np.ndarray:
+        return self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def index(self, n: int) -> int:
+        i = int(self._nodes.searchsorted(n))
+        if i == len(self._nodes) or self._nodes[i] != n:
+            raise KeyError(n)
+        return i
+
+    def successor(self, n: int) -> int:
+        return int(self._nodes[self._successors[self.index(n)]])
+
+    def predecessors(self, n: int) -> np.ndarray:
+        i = self.index(n)
+        return self._nodes[self._predecessors[self._indptr[i] : self._indptr[i + 1]]]
+
+    def in_degrees(self) -> np.ndarray:
+        return np.diff(self._indptr)
+
+    def in_degree(self, n: int) -> int:
+        i = self.index(n)
+        return int(self._indptr[i + 1] - self._indptr[i])
+
+    def merge_points(self) -> np.ndarray:
+        """The values at which two or more sequences merge (the 1 -> 4 edge of the
+        cycle does not count)."""
+        degrees = self.in_degrees()
+        degrees[self._successors[0]] -= 1
+        return self._nodes[degrees >= 2]
+
+    def depths(self) -> np.ndarray:
+        """Number of steps from each node to 1, by a level by level breadth first search
+        from 1 over the predecessors."""
+        if self._depths is None:
+            depths = np.full(len(self._nodes), -1, dtype=np.int64)
+            depths[0] = 0
+            frontier = np.zeros(1, dtype=np.int64)
+            depth = 0
+            while frontier.size:
+                children = self._predecessors[_ranges(self._indptr, frontier)]
+                frontier = children[depths[children] < 0]
+                depth += 1
+                depths[frontier] = depth
+            self._depths = depths
+        return self._depths
+
+    def depth(self, n: int) -> int:
+        return int(self.depths()[self.index(n)])
+
+    def subtree_sizes(self) -> np.ndarray:
+        """Number of nodes whose path to 1 passes through each node (itself included)."""
+        if self._subtree_sizes is None:
+            depths = self.depths()
+            sizes = np.ones(len(self._nodes), dtype=np.int64)
+            order = np.argsort(depths, kind="stable")
+            bounds = np.searchsorted(depths[order], np.arange(depths.max() + 2))
+            for depth in range(depths.max(), 0, -1):
+                level = order[bounds[depth] : bounds[depth + 1]]
+                np.add.at(sizes, self._successors[level], sizes[level])
+            self._subtree_sizes = sizes
+        return self._subtree_sizes
+
+    def subtree_size(self, n: int) -> int:
+        return int(self.subtree_sizes()[self.index(n)])
+
+    def edges(self) -> np.ndarray:
+        """(node index, successor node index) per node."""
+        return np.column_stack([np.arange(len(self._nodes)), self._successors])
+
+    def radial_layout(self) -> np.ndarray:
+        """(x, y) per node for a radial tree drawing: the radius of a node is its depth
+        and each node gets an angular wedge proportional to its subtree size, carved out
+        of its successor's wedge. Computed top down, level by level, in O(n)."""
+        depths = self.depths()
+        sizes = self.subtree_sizes().astype(np.float64)
+        wedge_starts = np.zeros(len(self._nodes))
+        wedge_widths = np.zeros(len(self._nodes))
+        wedge_widths[0] = 2 * np.pi
+        frontier = np.zeros(1, dtype=np.int64)
+        while frontier.size:
+            children = self._predecessors[_ranges(self._indptr, frontier)]
+            parents = np.repeat(frontier, self._indptr[frontier + 1] - self._indptr[frontier])
+            tree_edge = depths[children] == depths[parents] + 1  # drops the 1 -> 4 edge
+            children, parents = children[tree_edge], parents[tree_edge]
+            # NOTE: children come grouped by parent, so the sizes of the earlier siblings
+            #       are an exclusive cumulative sum restarted at every group.
+            before = np.cumsum(sizes[children]) - sizes[children]
+            first = np.ones(len(children), dtype=bool)
+            first[1:] = parents[1:] != parents[:-1]
+            before -= before[first][np.cumsum(first) - 1]
+            share = wedge_widths[parents] / (sizes[parents] - 1)
+            wedge_starts[children] = wedge_starts[parents] + share * before
+            wedge_widths[children] = share * sizes[children]
+            frontier = children
+        angles = wedge_starts + wedge_widths / 2
+        return np.column_stack([depths * np.cos(angles), depths * np.sin(angles)])
+
+    def to_networkx(self) -> nx.DiGraph:
+        graph = nx.DiGraph()
+        graph.add_edges_from(zip(self._nodes.tolist(), self._nodes[self._successors].tolist()))
+        return graph
+
+
+def _ranges(indptr: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(indptr[r], indptr[r + 1]) over the rows, vectorized."""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(counts.sum())
@@ -0,0 +1,146 @@
+"""Multi-process, sharded computation of Collatz statistics
+
+The range [start, end) is cut into shards that are processed independently in
+worker processes. A worker only follows each start value of its shard [a, b) until
+the sequence first drops below a (its "exit"), so its memory is bounded by the shard
+size. The driver merges the shards in order: by the time a shard is merged, the
+statistics of every exit are already known, either from an earlier shard or, for
+exits below start, from a direct walk.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from libs.collatz.batch import overflows, step
+from libs.collatz.statistics import CollatzStatistics
+from libs.collatz.successor_table import INT64_MAX
+
+
+@dataclass(eq=False)
+class CollatzShard:
+    """Partial result for the start values in [start, start + len(exits)).
+
+    For each start value: the first value of its sequence below start (or 1), the
+    number of steps to get there and the peak value (and its step) before it.
+    """
+
+    start: int
+    exits: np.ndarray
+    stopping_times: np.ndarray
+    peak_values: np.ndarray
+    peak_indices: np.ndarray
+
+
+def compute_shard(start: int, end: int) -> CollatzShard:
+    """Follow all start values in [start, end) together until they drop below start."""
+    values = np.arange(start, end, dtype=np.int64)
+    stopping_times = np.zeros(len(values), dtype=np.int32)
+    peak_values = np.zeros(len(values), dtype=np.int64)
+    peak_indices = np.zeros(len(values), dtype=np.int32)
+    active = np.arange(len(values))
+    while active.size:
+        current = values[active]
+        running = (current >= start) & (current != 1)
+        active, current = active[running], current[running]
+        higher = current > peak_values[active]
+        peak_values[active[higher]] = current[higher]
+        peak_indices[active[higher]] = stopping_times[active[higher]]
+        overflow = overflows(current)
+        for i in active[overflow].tolist():
+            values[i], stopping_times[i], peak_values[i], peak_indices[i] = _walk(
+                int(values[i]),
+                start,
+                int(stopping_times[i]),
+                int(peak_values[i]),
+                int(peak_indices[i]),
+            )
+        active, current = active[~overflow], current[~overflow]
+        values[active] = step(current)
+        stopping_times[active] += 1
+    return CollatzShard(start, values, stopping_times, peak_values, peak_indices)
+
+
+def merge_shards(shards: Iterable[CollatzShard], start: int, end: int) -> CollatzStatistics:
+    """Merge shards covering [start, end) in increasing order into one result."""
+    merged = CollatzStatistics(
+        start,
+        np.zeros(end - start, dtype=np.int32),
+        np.zeros(end - start, dtype=np.int64),
+        np.zeros(end - start, dtype=np.int32),
+    )
+    below_start: Dict[int, Tuple[int, int, int]] = {}
+    for shard in shards:
+        merge_shard(merged, shard, below_start)
+    return merged
+
+
+def merge_shard(
+    merged: CollatzStatistics,
+    shard: CollatzShard,
+    below_start: Dict[int, Tuple[int, int, int]],
+) -> None:
+    """Merge one shard into merged, which must already hold every value between
+    merged.start and shard.start. The statistics of exits below merged.start are
+    walked and cached in below_start."""
+    exits_steps, exits_peaks, exits_indices = _exit_statistics(shard.exits, merged, below_start)
+    later = exits_peaks > shard.peak_values
+    window = slice(shard.start - merged.start, shard.start - merged.start + len(shard.exits))
+    merged.stopping_times[window] = shard.stopping_times + exits_steps
+    merged.peak_values[window] = np.where(later, exits_peaks, shard.peak_values)
+    merged.peak_indices[window] = np.where(
+        later, shard.stopping_times + exits_indices, shard.peak_indices
+    )
+
+
+def parallel_statistics(
+    start: int, end: int, shard_size: int = 1 << 20, max_workers: Optional[int] = None
+) -> CollatzStatistics:
+    """Compute the statistics of [start, end) over a pool of worker processes.
+
+    The result is the same as CollatzSequences(start, end).statistics.
+    """
+    if start < 1:
+        raise ValueError("Start must be positive!")
+    if not start < end:
+        raise ValueError("End must be greater than or equal to start!")
+    shard_starts = range(start, end, shard_size)
+    shard_ends = [min(shard_start + shard_size, end) for shard_start in shard_starts]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        shards = executor.map(compute_shard, shard_starts, shard_ends)
+        return merge_shards(shards, start, end)
+
+
+def _exit_statistics(
+    exits: np.ndarray, merged: CollatzStatistics, below_start: Dict[int, Tuple[int, int, int]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Look up the statistics of the exits, walking (and caching) those below start."""
+    steps = np.zeros(len(exits), dtype=np.int32)
+    peaks = np.zeros(len(exits), dtype=np.int64)
+    indices = np.zeros(len(exits), dtype=np.int32)
+    known = (exits >= merged.start) & (exits != 1)
+    steps[known] = merged.stopping_times[exits[known] - merged.start]
+    peaks[known] = merged.peak_values[exits[known] - merged.start]
+    indices[known] = merged.peak_indices[exits[known] - merged.start]
+    for i in np.flatnonzero(~known).tolist():
+        exit_value = int(exits[i])
+        if exit_value not in below_start:
+            below_start[exit_value] = _walk(exit_value, 1, 0, 0, 0)[1:]
+        steps[i], peaks[i], indices[i] = below_start[exit_value]
+    return steps, peaks, indices
+
+
+def _walk(n: int, stop: int, steps: int, peak: int, peak_index: int) -> Tuple[int, int, int, int]:
+    """Follow n with python ints until it drops below stop (or reaches 1)."""
+    while n >= stop and n != 1:
+        if n > peak:
+            peak, peak_index = n, steps
+        n = n * 3 + 1 if n % 2 == 1 else n // 2
+        steps += 1
+    if n == 1 and peak < 1:
+        peak, peak_index = 1, steps
+    if peak > INT64_MAX:
+        raise OverflowError(f"The peak value {peak} does not fit into int64")
+    return n, steps, peak, peak_index
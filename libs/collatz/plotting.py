@@ -1,103 +1,218 @@
 """Plotting utils"""
 
-from typing import Dict
+import os
+from collections import deque
+from typing import Deque, List, Tuple, Union
 
 import matplotlib
 import matplotlib.pyplot as plt
 import networkx as nx
 import numpy as np
 from matplotlib import animation
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+from PIL import Image
 
 from libs.collatz.collatz import CollatzSequences
 
 BACKEND = ["Agg", "TkAgg", "Qt5Agg"][2]
-matplotlib.use(BACKEND)
+try:
+    matplotlib.use(BACKEND)
+except ImportError:  # pragma: no cover
+    # NOTE: e.g. on a server without Qt; exporting does not need an interactive backend
+    matplotlib.use("Agg")
+
+EXTENSIONS = (".gif", ".mp4")
+# NOTE: Pillow keeps every GIF frame in memory until the file is written
+PILLOW_MAX_BYTES = 1 << 30
+
+
+class _FFMpegFrameWriter(animation.FFMpegWriter):
+    """Pipes ready-made RGBA frames into ffmpeg, which streams them into an .mp4 or a
+    .gif, instead of drawing the whole figure for every frame as grab_frame does."""
+
+    # pylint: disable=missing-function-docstring
+    def write_frame(self, rgba: np.ndarray) -> None:
+        self._proc.stdin.write(rgba.tobytes())  # type: ignore
+
+
+class _PillowFrameWriter(animation.PillowWriter):
+    """Collects ready-made frames for Pillow, which writes them all at the end.
+
+    The frames are quantized to 256 colors as they come (fast octree), which is much
+    faster than Pillow's default for GIFs and keeps one byte per pixel in memory."""
+
+    # pylint: disable=missing-function-docstring
+    def write_frame(self, rgba: np.ndarray) -> None:
+        image = Image.fromarray(rgba[..., :3])
+        self._frames.append(image.quantize(method=Image.Quantize.FASTOCTREE))  # type: ignore
+
+
+class _TimeseriesFrames:
+    """Draws one sequence per frame into a single LineCollection.
+
+    Sequences fade out by exp(-fade * age); only the window of sequences still above
+    min_alpha is kept and their alphas are precomputed, so a frame costs O(window) no
+    matter how many frames came before it.
+    """
+
+    # pylint: disable=too-few-public-methods
+    def __init__(
+        self, ax: Axes, collatz_sequences: CollatzSequences, fade: float, min_alpha: float
+    ) -> None:
+        statistics = collatz_sequences.statistics
+        self._max_length = int(statistics.stopping_times.max()) + 1
+        window = max(1, int(np.ceil(np.log(1 / min_alpha) / fade)))
+        self._alphas = np.exp(-fade * np.arange(window))[::-1]
+        self._colors = to_rgba_array(plt.rcParams["axes.prop_cycle"].by_key()["color"])
+        self._window: Deque[Tuple[int, np.ndarray]] = deque(maxlen=window)
+        self.lines = LineCollection([], linewidths=1.5)
+        ax.add_collection(self.lines)
+        # Marker for the first entry of each sequence
+        (self.marker,) = ax.plot([], [], "rx", markersize=12)
+        ax.set_xlim(0, self._max_length - 1)
+        ax.set_ylim(1, int(statistics.peak_values.max()))
+        ax.set_xlabel("Step")
+        ax.set_ylabel("Value (in logarithmic scale)")
+        ax.set_yscale("log")
+        ax.set_title("Collatz Sequences")
+        ax.grid(True)
+
+    def __call__(self, frame: Tuple[int, List[int]]) -> list:
+        initial_value, y = frame
+        x = np.arange(self._max_length - len(y), self._max_length)
+        self._window.append((initial_value, np.column_stack([x, y])))
+        colors = self._colors[[i % len(self._colors) for i, _ in self._window]]
+        colors[:, 3] = self._alphas[-len(self._window) :]
+        self.lines.set_segments([segment for _, segment in self._window])
+        self.lines.set_color(colors)  # type: ignore
+        # mark the position of the initial value on the y-axis
+        self.marker.set_data([0], [y[0]])
+        return [self.lines, self.marker]
 
 
 def plot_sequences_as_timeseries_animated(
-    collatz_sequences: CollatzSequences, time_delay: int = 200
+    collatz_sequences: CollatzSequences,
+    time_delay: int = 200,
+    fade: float = 0.1,
+    min_alpha: float = 1e-3,
 ):  # pragma: no cover
     """Animate the plotting of sequences as time series."""
-    sequences: Dict[int, list] = collatz_sequences.sequences
-
-    def init():
-        ax.set_xlim(0, max(len(s) for s in sequences.values()) - 1)
-        ax.set_ylim(1, max(max(s) for s in sequences.values()))
-        marker.set_data([], [])
-        return lines + [marker]
-
-    def animate(i):
-        init_value = i + 1
-        # fade out previous sequences
-        for j in range(init_value):
-            lines[j].set_alpha(np.exp(-0.1 * (init_value - j)))
-        # draw a new sequence
-        y = sequences[init_value]
-        x = list(range(max_length - len(y), max_length))
-        lines[i].set_data(x, y)
-        lines[i].set_alpha(1)
-        # mark the position of the initial value on the y-axis
-        marker.set_data([0], [y[0]])
-        # plt.savefig(f"collatz_conjecture/images/frame_{i:03d}.png")
-        # $ convert -delay 5 -loop 0 collatz_conjecture/images/*.png collatz_sequence.gif
-        return lines + [marker]
-
-    max_length = max(len(s) for s in sequences.values())
     fig, ax = plt.subplots(figsize=(10, 6))
-
-    # Marker for the first entry of each sequence
-    (marker,) = ax.plot([], [], "rx", markersize=12)
-    lines = [ax.plot([], [], marker="o", linestyle="-", alpha=0)[0] for _ in sequences]
-
+    frames = _TimeseriesFrames(ax, collatz_sequences, fade, min_alpha)
     _ = animation.FuncAnimation(
         fig,
-        animate,
-        frames=len(sequences),
-        init_func=init,
+        frames,
+        frames=collatz_sequences.iter_sequences(),
+        init_func=lambda: [frames.lines, frames.marker],
         interval=time_delay,
         blit=True,
         repeat=False,
+        cache_frame_data=False,
     )
-
-    ax.set_xlabel("Step")
-    ax.set_ylabel("Value (in logarithmic scale)")
-    ax.set_yscale("log")
-    plt.title("Collatz Sequences")
-    plt.grid(True)
     plt.tight_layout()
     plt.show()
 
 
-def plot_sequences_as_graph(collatz_sequences: CollatzSequences):  # pragma: no cover
-    # pylint: disable=missing-function-docstring
-    graph: nx.DiGraph = collatz_sequences.graph
-    layouts = {
-        "spring_layout": nx.spring_layout(graph),
-        "circular_layout": nx.circular_layout(graph),
-        "random_layout": nx.random_layout(graph),
-        "shell_layout": nx.shell_layout(graph),
-        "spectral_layout": nx.spectral_layout(graph),
-        "kamada_kawai_layout": nx.kamada_kawai_layout(graph),
-        "planar_layout": nx.planar_layout(graph),
-        "spiral_layout": nx.spiral_layout(graph),
-    }
-
-    _, axes = plt.subplots(2, 4, figsize=(16, 8))
-    axes = axes.flatten()
-
-    for ax, (layout_name, pos) in zip(axes, layouts.items()):
-        nx.draw(
-            graph,
-            pos,
-            ax=ax,
-            with_labels=True,
-            node_size=100,
-            node_color="skyblue",
-            font_size=5,
-            font_color="black",
-            arrows=True,
-        )
-        ax.set_title(layout_name)
-
+def export_sequences_as_timeseries_animated(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    collatz_sequences: CollatzSequences,
+    path: str,
+    fps: int = 20,
+    dpi: int = 100,
+    fade: float = 0.1,
+    min_alpha: float = 1e-3,
+) -> None:
+    """Render the time series animation offscreen (Agg) into a .gif or .mp4 file.
+
+    No display is needed and the sequences are streamed, one frame at a time, through a
+    pipe into ffmpeg, which must be on the PATH. Without ffmpeg a .gif is written with
+    Pillow instead, which holds all frames in memory: that is refused (ValueError) for
+    more than PILLOW_MAX_BYTES of frames.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError(f"Unsupported file type {extension!r}, expected one of {EXTENSIONS}")
+    fig = Figure(figsize=(10, 6), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    frames = _TimeseriesFrames(ax, collatz_sequences, fade, min_alpha)
+    fig.tight_layout()
+    writer = _frame_writer(extension, fps, len(collatz_sequences.statistics.stopping_times), canvas)
+    with writer.saving(fig, path, dpi):
+        # NOTE: the axes, ticks and labels are the same in every frame and drawing them
+        #       dominates the frame time, so they are drawn once and every frame only
+        #       draws its artists onto a copy of that background (blitting)
+        frames.lines.set_visible(False)
+        frames.marker.set_visible(False)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        frames.lines.set_visible(True)
+        frames.marker.set_visible(True)
+        for frame in collatz_sequences.iter_sequences():
+            canvas.restore_region(background)
+            for artist in frames(frame):
+                ax.draw_artist(artist)
+            writer.write_frame(np.asarray(canvas.buffer_rgba()))
+
+
+def _frame_writer(
+    extension: str, fps: int, count: int, canvas: FigureCanvasAgg
+) -> Union[_FFMpegFrameWriter, _PillowFrameWriter]:
+    if extension == ".gif" and not _FFMpegFrameWriter.isAvailable():
+        width, height = canvas.get_width_height()
+        if count * width * height > PILLOW_MAX_BYTES:
+            raise ValueError(
+                f"{count} frames of {width}x{height} exceed the memory of a GIF without "
+                "ffmpeg, install ffmpeg or export fewer sequences!"
+            )
+        return _PillowFrameWriter(fps=fps)
+    return _FFMpegFrameWriter(fps=fps)
+
+
+LAYOUTS = {
+    "radial_layout": None,  # computed by CollatzGraph in O(n)
+    "spring_layout": nx.spring_layout,
+    "circular_layout": nx.circular_layout,
+    "random_layout": nx.random_layout,
+    "shell_layout": nx.shell_layout,
+    "spectral_layout": nx.spectral_layout,
+    "kamada_kawai_layout": nx.kamada_kawai_layout,
+    "planar_layout": nx.planar_layout,
+    "spiral_layout": nx.spiral_layout,
+}
+
+
+def plot_sequences_as_graph(
+    collatz_sequences: CollatzSequences, layout: str = "radial_layout", max_labels: int = 200
+):  # pragma: no cover
+    """Plot the graph with only the requested layout.
+
+    Edges are drawn as a single (rasterized) LineCollection, so that graphs with 10^5+
+    nodes render in seconds with the radial layout. Nodes are labeled only for graphs
+    of at most max_labels nodes. The networkx layouts need the networkx graph and some
+    of them (spectral, kamada kawai) are O(n^2) or worse.
+    """
+    graph = collatz_sequences.compact_graph
+    if LAYOUTS[layout] is None:
+        positions = graph.radial_layout()
+    else:
+        pos = LAYOUTS[layout](collatz_sequences.graph)
+        positions = np.array([pos[n] for n in graph.nodes.tolist()])
+
+    _, ax = plt.subplots(figsize=(10, 10))
+    edges = LineCollection(
+        positions[graph.edges()], colors="k", linewidths=0.3, alpha=0.6, rasterized=True
+    )
+    ax.add_collection(edges)
+    ax.scatter(positions[:, 0], positions[:, 1], s=4, c="skyblue", zorder=2, rasterized=True)
+    if len(graph) <= max_labels:
+        for n, (x, y) in zip(graph.nodes.tolist(), positions.tolist()):
+            ax.annotate(str(n), (x, y), fontsize=5, ha="center", va="center")
+    ax.set_title(f"{layout} ({len(graph)} nodes)")
+    ax.set_aspect("equal")
+    ax.axis("off")
     plt.tight_layout()
     plt.show()
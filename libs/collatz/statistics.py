@@ -0,0 +1,72 @@
+"""Per start value statistics of Collatz sequences"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from libs.collatz.successor_table import Successors
+
+
+@dataclass(eq=False)
+class CollatzStatistics:
+    """Per start value in [start, start + len(stopping_times)): the number of steps to
+    reach 1, the largest value on the way and the (first) step at which it is reached."""
+
+    start: int
+    stopping_times: np.ndarray
+    peak_values: np.ndarray
+    peak_indices: np.ndarray
+
+    @property
+    def end(self) -> int:  # pylint: disable=missing-function-docstring
+        return self.start + len(self.stopping_times)
+
+    @classmethod
+    def from_successors(cls, successors: Successors, start: int, end: int) -> "CollatzStatistics":
+        """Memoized dynamic programming over the successor map.
+
+        Memory is linear in the size of the range: the memo holds one entry per value in
+        [start, end), values below start are cached in a dict as they are walked through
+        (as parallel.merge_shard does), and values above end are not memoized.
+        """
+        stopping_times = np.full(end - start, -1, dtype=np.int32)
+        peak_values = np.zeros(end - start, dtype=np.int64)
+        peak_indices = np.zeros(end - start, dtype=np.int32)
+        below_start: Dict[int, Tuple[int, int, int]] = {1: (0, 1, 0)}
+        if start == 1:
+            stopping_times[0], peak_values[0] = 0, 1
+        for initial_value in range(start, end):
+            if stopping_times[initial_value - start] >= 0:
+                continue
+            path = []
+            n = initial_value
+            while True:
+                if n < start:
+                    if n in below_start:
+                        break
+                elif n < end and stopping_times[n - start] >= 0:
+                    break
+                path.append(n)
+                n = successors[n]
+            steps, peak, peak_index = (
+                below_start[n]
+                if n < start
+                else (
+                    int(stopping_times[n - start]),
+                    int(peak_values[n - start]),
+                    int(peak_indices[n - start]),
+                )
+            )
+            for n in reversed(path):
+                steps += 1
+                if n > peak:
+                    peak, peak_index = n, 0
+                else:
+                    peak_index += 1
+                if start <= n < end:
+                    i = n - start
+                    stopping_times[i], peak_values[i], peak_indices[i] = steps, peak, peak_index
+                elif n < start:
+                    below_start[n] = steps, peak, peak_index
+        return cls(start, stopping_times, peak_values, peak_indices)
@@ -0,0 +1,138 @@
+"""Persistent on-disk cache of Collatz successors and statistics
+
+A CollatzStore keeps the successors and statistics of every value in [1, end) in
+memory-mapped files in a directory, so that later runs (in the same or in other
+processes) only compute the missing tail, and never load the whole store into RAM:
+
+* successors.bin: dense int64 successors indexed by value,
+* spill_NNN.keys.npy / spill_NNN.values.npy: sorted segments of the successors of
+  values that climbed above the store when they were computed,
+* stopping_times.bin, peak_values.bin, peak_indices.bin: statistics indexed by value,
+* meta.json: the end of the store and the number of spill segments.
+
+Extending the store takes an exclusive lock on the directory; reading does not.
+"""
+
+import fcntl
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from libs.collatz.batch import fill_successors
+from libs.collatz.parallel import compute_shard, merge_shard
+from libs.collatz.statistics import CollatzStatistics
+from libs.collatz.successor_table import SuccessorTable
+from libs.common.mmap_store import MemoryMappedStore
+
+_DTYPES: Dict[str, np.dtype] = {
+    "successors": np.dtype(np.int64),
+    "stopping_times": np.dtype(np.int32),
+    "peak_values": np.dtype(np.int64),
+    "peak_indices": np.dtype(np.int32),
+}
+_SHARD_SIZE = 1 << 20
+
+
+class CollatzStore(MemoryMappedStore):
+    # pylint: disable=missing-function-docstring
+    """Successors and statistics of [1, end) persisted in memory-mapped files."""
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._meta = self._read_meta()
+
+    @property
+    def end(self) -> int:
+        return self._meta["end"]
+
+    def extend(self, end: int, chunk_size: int = 1 << 24) -> None:
+        """Compute and persist whatever is missing of [1, end), chunk by chunk, so that
+        only one chunk's worth of new spill-over entries is held in RAM at a time."""
+        with open(self._path("lock"), "w", encoding="utf-8") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._meta = self._read_meta()
+            while self.end < end:
+                self._extend_chunk(min(self.end + chunk_size, end))
+
+    def successor_table(self) -> SuccessorTable:
+        """A read-only SuccessorTable over the memory-mapped successors."""
+        if self.end == 1:
+            raise ValueError("The store is empty!")
+        return SuccessorTable.from_arrays(self._open("successors"), self._segments())
+
+    def statistics(self, start: int, end: int) -> CollatzStatistics:
+        """Statistics of [start, end) as read-only views into the memory-mapped files."""
+        if not 1 <= start < end <= self.end:
+            raise ValueError(f"[{start}, {end}) is not within the store [1, {self.end})!")
+        return CollatzStatistics(
+            start,
+            self._open("stopping_times")[start:end],
+            self._open("peak_values")[start:end],
+            self._open("peak_indices")[start:end],
+        )
+
+    def _extend_chunk(self, end: int) -> None:
+        start = self.end
+        arrays = {
+            name: self._grow_file(f"{name}.bin", dtype, (end,)) for name, dtype in _DTYPES.items()
+        }
+        segments_count = self._extend_successors(arrays["successors"], start, end)
+        self._extend_statistics(arrays, start, end)
+        for array in arrays.values():
+            array.flush()
+        self._write_meta({"end": end, "segments": segments_count})
+
+    def _extend_successors(self, successors: np.memmap, start: int, end: int) -> int:
+        """Fill the successors of [start, end), return the new number of segments."""
+        # NOTE: drop leftovers of an interrupted extension, then move the spilled
+        #       values that now fall into the dense part over
+        successors[start:] = 0
+        segments = self._segments()
+        for keys, values in segments:
+            lo, hi = keys.searchsorted([start, end])
+            successors[keys[lo:hi]] = values[lo:hi]
+        table = SuccessorTable.from_arrays(successors, segments)
+        if start == 1:
+            for key, value in {1: 4, 4: 2, 2: 1}.items():
+                table[key] = value
+        fill_successors(table, start, end)
+        new_segments = table.freeze()
+        for i, (keys, values) in enumerate(new_segments, start=len(segments)):
+            np.save(self._path(f"spill_{i:03d}.keys.npy"), keys)
+            np.save(self._path(f"spill_{i:03d}.values.npy"), values)
+        return len(segments) + len(new_segments)
+
+    @staticmethod
+    def _extend_statistics(arrays: Dict[str, np.memmap], start: int, end: int) -> None:
+        """Fill the statistics of [start, end); every exit of a shard of it lies in
+        [1, start) or in an earlier shard, which are stored already."""
+        merged = CollatzStatistics(
+            1,
+            arrays["stopping_times"][1:],
+            arrays["peak_values"][1:],
+            arrays["peak_indices"][1:],
+        )
+        below_start: Dict[int, Tuple[int, int, int]] = {}
+        for shard_start in range(start, end, _SHARD_SIZE):
+            shard = compute_shard(shard_start, min(shard_start + _SHARD_SIZE, end))
+            merge_shard(merged, shard, below_start)
+
+    def _segments(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        return [
+            (
+                np.load(self._path(f"spill_{i:03d}.keys.npy"), mmap_mode="r"),
+                np.load(self._path(f"spill_{i:03d}.values.npy"), mmap_mode="r"),
+            )
+            for i in range(self._meta["segments"])
+        ]
+
+    def _open(self, name: str) -> np.memmap:
+        path = self._path(f"{name}.bin")
+        return np.memmap(path, dtype=_DTYPES[name], mode="r", shape=(self.end,))
+
+    def _read_meta(self) -> dict:
+        if not os.path.exists(self._path("meta.json")):
+            return {"end": 1, "segments": 0}
+        return super()._read_meta()
@@ -0,0 +1,229 @@
+"""Compact storage for the Collatz successor map"""
+
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+class SuccessorTable:
+    """A mapping from a value to its successor, stored compactly.
+
+    Values in [0, size) live in a dense int64 array indexed by value, where zero
+    marks an unknown successor; that costs 8 bytes per value below size, visited
+    or not. Values that climb above size spill over into sorted int64 key/value
+    segments at 16 bytes per entry. A plain Dict[int, int] costs roughly 100+ bytes
+    per entry. Values that do not fit into int64 are kept in a plain dict.
+
+    New spill-over entries are buffered in a small dict and flushed into a sorted
+    segment once the buffer is full. Segments are merged so that there are only
+    logarithmically many of them to search.
+    """
+
+    # pylint: disable=missing-function-docstring
+    _PENDING_LIMIT = 1 << 16
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("Size must be positive!")
+        self._dense = np.zeros(size, dtype=np.int64)
+        self._size = size
+        self._segments: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._frozen = 0  # the first _frozen segments are never merged
+        self._pending: Dict[int, int] = {}
+        self._big: Dict[int, int] = {}
+
+    @classmethod
+    def from_arrays(
+        cls, dense: np.ndarray, segments: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> "SuccessorTable":
+        """Wrap existing (e.g. memory-mapped) arrays without copying them.
+
+        The given segments are frozen: they are searched but never merged, and keys
+        that fall into the dense part are shadowed by it.
+        """
+        table = cls(1)
+        table._dense = dense
+        table._size = len(dense)
+        table._segments = list(segments)
+        table._frozen = len(segments)
+        return table
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def dense(self) -> np.ndarray:
+        """The dense part, indexed by value; zero marks an unknown successor."""
+        return self._dense
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays; the (small) dict buffers are not counted."""
+        return self._dense.nbytes + sum(k.nbytes + v.nbytes for k, v in self._segments)
+
+    def __contains__(self, n: int) -> bool:
+        if 0 <= n < self._size:
+            return bool(self._dense[n]) or n in self._big
+        if n in self._pending or n in self._big:
+            return True
+        return self._search(n) is not None
+
+    def __getitem__(self, n: int) -> int:
+        if 0 <= n < self._size:
+            value = int(self._dense[n])
+            if value:
+                return value
+            return self._big[n]
+        if n in self._pending:
+            return self._pending[n]
+        if n in self._big:
+            return self._big[n]
+        found = self._search(n)
+        if found is None:
+            raise KeyError(n)
+        return found
+
+    def __setitem__(self, n: int, value: int) -> None:
+        if abs(n) > INT64_MAX or abs(value) > INT64_MAX:
+            self._big[n] = value
+        elif 0 <= n < self._size:
+            self._dense[n] = value
+        else:
+            self._pending[n] = value
+            if len(self._pending) >= self._PENDING_LIMIT:
+                self._flush()
+
+    def __len__(self) -> int:
+        self._flush()
+        spilled = sum(int(np.count_nonzero(self._spilled(keys))) for keys, _ in self._segments)
+        return int(np.count_nonzero(self._dense)) + spilled + len(self._big)
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        """Yield (value, successor) pairs, dense values first in ascending order."""
+        self._flush()
+        keys = np.flatnonzero(self._dense)
+        yield from zip(keys.tolist(), self._dense[keys].tolist())
+        for keys, values in self._segments:
+            spilled = self._spilled(keys)
+            yield from zip(keys[spilled].tolist(), values[spilled].tolist())
+        yield from self._big.items()
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return all (value, successor) pairs as two int64 arrays."""
+        self._flush()
+        if self._big:
+            raise OverflowError("The table holds values that do not fit into int64")
+        dense_keys = np.flatnonzero(self._dense)
+        keys = [dense_keys] + [k[self._spilled(k)] for k, _ in self._segments]
+        values = [self._dense[dense_keys]] + [v[self._spilled(k)] for k, v in self._segments]
+        return np.concatenate(keys).astype(np.int64), np.concatenate(values).astype(np.int64)
+
+    def freeze(self) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Freeze the segments added since the last call and return them, e.g. to
+        persist them."""
+        self._flush()
+        segments = self._segments[self._frozen :]
+        self._frozen = len(self._segments)
+        return segments
+
+    def contains(self, values: np.ndarray) -> np.ndarray:
+        """Vectorized membership test for an int64 array of values."""
+        self._flush()
+        found = np.zeros(len(values), dtype=bool)
+        dense = (values >= 0) & (values < self._size)
+        found[dense] = self._dense[values[dense]] != 0
+        if self._big:
+            found |= np.fromiter((v in self._big for v in values.tolist()), bool, len(values))
+        spill = np.flatnonzero(~dense)
+        for keys, _ in self._segments:
+            if not spill.size:
+                break
+            i = keys.searchsorted(values[spill])
+            hit = keys[np.minimum(i, len(keys) - 1)] == values[spill]
+            found[spill[hit]] = True
+            spill = spill[~hit]
+        return found
+
+    def lookup(self, values: np.ndarray) -> np.ndarray:
+        """Vectorized __getitem__ for an int64 array of values; raises OverflowError if a
+        successor does not fit into int64."""
+        self._flush()
+        found = np.zeros(len(values), dtype=np.int64)
+        dense = (values >= 0) & (values < self._size)
+        found[dense] = self._dense[values[dense]]
+        spill = np.flatnonzero(~dense)
+        for keys, segment_values in self._segments:
+            if not spill.size:
+                break
+            i = np.minimum(keys.searchsorted(values[spill]), len(keys) - 1)
+            hit = keys[i] == values[spill]
+            found[spill[hit]] = segment_values[i[hit]]
+            spill = spill[~hit]
+        # NOTE: the rest is in the dict of big values, or missing (KeyError)
+        rest = np.concatenate([np.flatnonzero(dense & (found == 0)), spill])
+        if rest.size:
+            n = int(values[rest[0]])
+            raise OverflowError(f"The successor {self[n]} of {n} does not fit into int64")
+        return found
+
+    def update(self, keys: np.ndarray, values: np.ndarray) -> None:
+        """Vectorized insertion of int64 (key, value) pairs; repeated keys are dropped."""
+        dense = (keys >= 0) & (keys < self._size)
+        self._dense[keys[dense]] = values[dense]
+        keys, values = keys[~dense], values[~dense]
+        keys, first = np.unique(keys, return_index=True)
+        values = values[first]
+        new = ~self.contains(keys)
+        if new.any():
+            self._add_segment(keys[new], values[new])
+
+    def _search(self, n: int) -> Optional[int]:
+        if abs(n) > INT64_MAX:
+            return None
+        for keys, values in self._segments:
+            i = int(keys.searchsorted(n))
+            if i < len(keys) and keys[i] == n:
+                return int(values[i])
+        return None
+
+    def _spilled(self, keys: np.ndarray) -> np.ndarray:
+        return (keys < 0) | (keys >= self._size)
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        keys = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+        values = np.fromiter(self._pending.values(), dtype=np.int64, count=len(self._pending))
+        self._pending = {}
+        self._add_segment(keys, values)
+
+    def _add_segment(self, keys: np.ndarray, values: np.ndarray) -> None:
+        order = np.argsort(keys, kind="stable")
+        self._segments.append((keys[order], values[order]))
+        # NOTE: merge the two youngest segments while the older one is not larger;
+        #       like a binary counter this keeps O(log n) segments around.
+        while len(self._segments) - self._frozen > 1 and len(self._segments[-2][0]) <= 2 * len(
+            self._segments[-1][0]
+        ):
+            newer_keys, newer_values = self._segments.pop()
+            older_keys, older_values = self._segments.pop()
+            self._segments.append(_merge(older_keys, older_values, newer_keys, newer_values))
+
+
+def _merge(
+    keys_a: np.ndarray, values_a: np.ndarray, keys_b: np.ndarray, values_b: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge two sorted segments, dropping duplicated keys."""
+    keys = np.concatenate([keys_a, keys_b])
+    values = np.concatenate([values_a, values_b])
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    unique = np.ones(len(keys), dtype=bool)
+    unique[1:] = keys[1:] != keys[:-1]
+    return keys[unique], values[unique]
+
+
+Successors = Union[Dict[int, int], SuccessorTable]
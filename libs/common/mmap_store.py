@@ -0,0 +1,40 @@
+"""Directories of memory-mapped files
+
+The on-disk stores (libs.collatz.store, libs.lorenz.trajectory_store) keep their arrays
+in raw memory-mapped files in a directory, next to a meta.json describing them; this is
+the file handling they share.
+"""
+
+import json
+import os
+from typing import Tuple
+
+import numpy as np
+
+
+class MemoryMappedStore:  # pylint: disable=too-few-public-methods
+    """Base of the stores keeping memory-mapped files and a meta.json in a directory."""
+
+    _directory: str
+    _meta: dict
+
+    def _grow_file(self, name: str, dtype: np.dtype, shape: Tuple[int, ...]) -> np.memmap:
+        """Grow the file name to shape (zero filled) and map it for writing."""
+        path = self._path(name)
+        with open(path, "ab") as file:
+            file.truncate(int(np.prod(shape)) * dtype.itemsize)
+        return np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+
+    def _read_meta(self) -> dict:
+        with open(self._path("meta.json"), encoding="utf-8") as file:
+            return json.load(file)
+
+    def _write_meta(self, meta: dict) -> None:
+        # NOTE: write and rename, so that readers never see a half written file
+        with open(self._path("meta.json.tmp"), "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+        os.replace(self._path("meta.json.tmp"), self._path("meta.json"))
+        self._meta = meta
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory, name)
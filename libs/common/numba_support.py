@@ -0,0 +1,13 @@
+"""Optional Numba support
+
+numba is a requirement, but it is imported here once, as the module or None, so that the
+compiled fast paths (libs.chaos.jit, libs.lorenz.integrators) fall back to their NumPy
+paths where it cannot be installed.
+"""
+
+__all__ = ["numba"]
+
+try:
+    import numba
+except ImportError:  # pragma: no cover
+    numba = None  # type: ignore
@@ -0,0 +1,216 @@
+"""Fixed-step Runge-Kutta integrators of the Lorenz system
+
+integrate advances one point, or an (N, 3) ensemble of points, with a fixed time step
+and an explicit Runge-Kutta tableau from TABLEAUS:
+
+* rk4: the classic fourth order method, 4 stages per step,
+* dopri5: the fifth order Dormand-Prince weights (those of solve_ivp's RK45) with a
+  fixed step, 6 stages per step.
+
+By default (jit=True) the whole loop over steps runs compiled with Numba, with no Python
+call per step. The NumPy kernel (jit=False, or without Numba) runs a Python loop over
+the steps, each a few vectorized operations on the whole ensemble: it is only meant for
+large ensembles, which share its Python overhead per step, and is far too slow for long
+single trajectories. compare_integrators measures the accuracy and throughput of each
+against solve_ivp.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from libs.common.numba_support import numba
+from libs.lorenz.lorenz import LorenzParameters, LorenzSystem, TimeLine, lorenz_ensemble_system
+
+# (a, b) of explicit Runge-Kutta methods; a is strictly lower triangular, and c is not
+# needed since the Lorenz system is autonomous
+TABLEAUS: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+    "rk4": (
+        np.array([[0, 0, 0, 0], [1 / 2, 0, 0, 0], [0, 1 / 2, 0, 0], [0, 0, 1, 0]]),
+        np.array([1 / 6, 1 / 3, 1 / 3, 1 / 6]),
+    ),
+    "dopri5": (
+        np.array(
+            [
+                [0, 0, 0, 0, 0, 0],
+                [1 / 5, 0, 0, 0, 0, 0],
+                [3 / 40, 9 / 40, 0, 0, 0, 0],
+                [44 / 45, -56 / 15, 32 / 9, 0, 0, 0],
+                [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0, 0],
+                [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656, 0],
+            ]
+        ),
+        np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+    ),
+}
+
+
+@dataclass
+class IntegratorResult:
+    # pylint: disable=missing-class-docstring
+    # pylint: disable=missing-function-docstring
+    method: str
+    seconds: float
+    samples: int
+    max_error: float
+
+    @property
+    def samples_per_second(self) -> float:
+        return self.samples / self.seconds if self.seconds > 0 else float("inf")
+
+
+def integrate(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    parameters: LorenzParameters,
+    initial_points: np.ndarray,
+    dt: float,
+    steps: int,
+    method: str = "rk4",
+    save_every: int = 1,
+    jit: bool = True,
+) -> np.ndarray:
+    """Take steps steps of size dt from initial_points and return every save_every-th
+    point (starting with the initial one): a (3, T) array for a single (3,) point, as
+    LorenzSystem.solve, or an (N, 3, T) array for (N, 3) points, as LorenzEnsemble.solve."""
+    if steps < 0 or save_every < 1:
+        raise ValueError("Need steps >= 0 and save_every >= 1!")
+    a, b = TABLEAUS[method]
+    points = np.asarray(initial_points, dtype=float)
+    states = np.atleast_2d(points)
+    if states.ndim != 2 or states.shape[1] != 3:
+        raise ValueError("Initial points must be a (3,) or an (N, 3) array!")
+    out = np.empty((len(states), 3, steps // save_every + 1))
+    kernel = _compiled_kernel() if jit and numba is not None else _numpy_kernel
+    kernel(states, dt, steps, save_every, a, b, *_arguments(parameters), out)
+    return out[0] if points.ndim == 1 else out
+
+
+def compare_integrators(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    parameters: LorenzParameters,
+    initial_point: Sequence[float],
+    time_end: float,
+    dt: float,
+    methods: Iterable[str] = tuple(TABLEAUS),
+    jit: bool = True,
+) -> List[IntegratorResult]:
+    """Integrate initial_point up to time_end with every method, and with LorenzSystem
+    (adaptive solve_ivp, as "solve_ivp", sampled at the same times), and return their
+    time and largest distance from a reference solution (DOP853 with tight tolerances)
+    at the steps.
+
+    Errors grow exponentially along a chaotic trajectory, so keep time_end short (a few
+    time units) for the errors to compare the methods rather than the chaos."""
+    steps = int(round(time_end / dt))
+    time_line = TimeLine(0, steps * dt, steps + 1)  # type: ignore
+    reference = solve_ivp(
+        LorenzSystem.lorenz_system,
+        (time_line.start, time_line.end),
+        initial_point,
+        t_eval=time_line.times,
+        args=_arguments(parameters),
+        method="DOP853",
+        rtol=1e-12,
+        atol=1e-12,
+    ).y
+    runs: Dict[str, Callable[[], np.ndarray]] = {
+        "solve_ivp": LorenzSystem(time_line, parameters, initial_point).solve
+    }
+    for method in methods:
+        runs[method] = lambda method=method: integrate(  # type: ignore
+            parameters, np.asarray(initial_point), dt, steps, method=method, jit=jit
+        )
+    if jit and numba is not None:
+        integrate(parameters, np.asarray(initial_point), dt, 1)  # NOTE: compile
+    results = []
+    for method, run in runs.items():
+        start_time = time.perf_counter()
+        points = run()
+        seconds = time.perf_counter() - start_time
+        results.append(
+            IntegratorResult(method, seconds, steps + 1, float(np.max(np.abs(points - reference))))
+        )
+    return results
+
+
+def format_results(results: List[IntegratorResult]) -> str:
+    """The results as a plain text table."""
+    lines = [f"{'method':<12}{'seconds':>10}{'samples/s':>12}{'max error':>12}"]
+    for result in results:
+        lines.append(
+            f"{result.method:<12}{result.seconds:>10.3f}{result.samples_per_second:>12.3g}"
+            f"{result.max_error:>12.3g}"
+        )
+    return "\n".join(lines)
+
+
+def _arguments(parameters: LorenzParameters) -> Tuple[float, float, float]:
+    return parameters.sigma, parameters.rho, parameters.beta
+
+
+def _numpy_kernel(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    states: np.ndarray,
+    dt: float,
+    steps: int,
+    save_every: int,
+    a: np.ndarray,
+    b: np.ndarray,
+    sigma: float,
+    rho: float,
+    beta: float,
+    out: np.ndarray,
+) -> None:
+    # NOTE: the flattened states, as lorenz_ensemble_system takes them; the zero
+    #       coefficients of the tableau are skipped
+    stages = [[(dt * a[stage, m], m) for m in np.flatnonzero(a[stage])] for stage in range(len(b))]
+    weights = [(dt * b[index], index) for index in np.flatnonzero(b)]
+    slopes = np.empty((len(b), states.size))
+    x = states.ravel().copy()
+    out[..., 0] = states
+    for step in range(1, steps + 1):
+        for stage, terms in enumerate(stages):
+            point = x.copy()
+            for coefficient, m in terms:
+                point += coefficient * slopes[m]
+            slopes[stage] = lorenz_ensemble_system(0, point, sigma, rho, beta)
+        for coefficient, index in weights:
+            x += coefficient * slopes[index]
+        if step % save_every == 0:
+            out[..., step // save_every] = x.reshape(states.shape)
+
+
+@lru_cache(maxsize=1)
+def _compiled_kernel() -> Callable:
+    # NOTE: the compiled body is not seen by coverage
+    @numba.njit
+    def kernel(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+        states, dt, steps, save_every, a, b, sigma, rho, beta, out
+    ):  # pragma: no cover
+        slopes = np.empty((b.size, 3))
+        for i in range(states.shape[0]):
+            x, y, z = states[i, 0], states[i, 1], states[i, 2]
+            out[i, :, 0] = states[i]
+            for step in range(1, steps + 1):
+                for stage in range(b.size):
+                    px, py, pz = x, y, z
+                    for m in range(stage):
+                        coefficient = dt * a[stage, m]
+                        px += coefficient * slopes[m, 0]
+                        py += coefficient * slopes[m, 1]
+                        pz += coefficient * slopes[m, 2]
+                    slopes[stage, 0] = sigma * (py - px)
+                    slopes[stage, 1] = px * (rho - pz) - py
+                    slopes[stage, 2] = px * py - beta * pz
+                for stage in range(b.size):
+                    coefficient = dt * b[stage]
+                    x += coefficient * slopes[stage, 0]
+                    y += coefficient * slopes[stage, 1]
+                    z += coefficient * slopes[stage, 2]
+                if step % save_every == 0:
+                    out[i, 0, step // save_every] = x
+                    out[i, 1, step // save_every] = y
+                    out[i, 2, step // save_every] = z
+
+    return kernel
@@ -4,10 +4,10 @@
 # pylint: disable=missing-function-docstring
 
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Iterator, List, Sequence
 
 import numpy as np
-from scipy.integrate import solve_ivp
+from scipy.integrate import RK45, solve_ivp
 from scipy.integrate._ivp.ivp import OdeResult
 
 
@@ -44,15 +44,22 @@ class LorenzSystem:
         parameters: LorenzParameters,
         initial_points: Sequence[float],
     ):
+        """Nothing is integrated before solve or iter_solve is called."""
         self._time_line = time_line
         self._parameters = parameters
-        self._solution: OdeResult = solve_ivp(
-            self.lorenz_system,
-            (time_line.start, time_line.end),
-            initial_points,
-            args=(parameters.sigma, parameters.rho, parameters.beta),
-            dense_output=True,
-        )
+        self._initial_points = np.asarray(initial_points, dtype=float)
+
+    @property
+    def time_line(self) -> TimeLine:
+        return self._time_line
+
+    @property
+    def parameters(self) -> LorenzParameters:
+        return self._parameters
+
+    @property
+    def initial_points(self) -> np.ndarray:
+        return self._initial_points
 
     @staticmethod
     def lorenz_system(t: float, point, sigma: float, rho: float, beta: float):
@@ -65,4 +72,110 @@ class LorenzSystem:
 
     def solve(self) -> np.ndarray:
         """Solve for the actual points on the attractor"""
-        return self._solution.sol(self._time_line.times)
+        blocks = list(self.iter_solve(len(self._time_line.times) or 1))
+        return np.concatenate(blocks, axis=1) if blocks else np.empty((3, 0))
+
+    def iter_solve(self, chunk_size: int = 1 << 16) -> Iterator[np.ndarray]:
+        """Yield the points of solve in (3, chunk_size) blocks (the last one may be
+        shorter), integrating only as far as the next block needs.
+
+        The RK45 solver is stepped directly and the times of each step are evaluated with
+        its interpolant, as solve_ivp does, so the points are the same as in one call;
+        but no dense output is kept, and memory is bounded by chunk_size."""
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive!")
+        parameters = self._parameters
+        solver = RK45(
+            lambda t, point: self.lorenz_system(
+                t, point, parameters.sigma, parameters.rho, parameters.beta
+            ),
+            self._time_line.start,
+            self._initial_points,
+            self._time_line.end,
+        )
+        # NOTE: the times decrease for a time line integrated backwards (start > end)
+        times = solver.direction * self._time_line.times
+        done = 0
+        pending: List[np.ndarray] = []
+        pending_count = 0
+        while done < len(times):
+            message = solver.step()
+            if solver.status == "failed":
+                raise RuntimeError(f"Integration failed at t={solver.t}: {message}")
+            stop = int(np.searchsorted(times, solver.direction * solver.t, side="right"))
+            if stop == done:
+                continue
+            values = solver.dense_output()(self._time_line.times[done:stop])
+            done = stop
+            pending.append(values)
+            pending_count += values.shape[1]
+            while pending_count >= chunk_size:
+                block = np.concatenate(pending, axis=1)
+                yield block[:, :chunk_size]
+                pending, pending_count = [block[:, chunk_size:]], pending_count - chunk_size
+        if pending_count:
+            yield np.concatenate(pending, axis=1)
+
+
+def lorenz_ensemble_system(t: float, states: np.ndarray, sigma: float, rho: float, beta: float):
+    """The Lorenz system for many points at once, flattened as x0, y0, z0, x1, ... along
+    the first axis of states; one call evaluates all of them."""
+    # pylint: disable=unused-argument
+    x, y, z = states[0::3], states[1::3], states[2::3]
+    derivatives = np.empty_like(states)
+    derivatives[0::3] = sigma * (y - x)
+    derivatives[1::3] = x * (rho - z) - y
+    derivatives[2::3] = x * y - beta * z
+    return derivatives
+
+
+def nearby_points(point: Sequence[float], count: int, radius: float, seed=None) -> np.ndarray:
+    """Return count points drawn uniformly from the cube of half width radius around point
+    as a (count, 3) array, e.g. the initial points of a sensitivity study."""
+    offsets = np.random.default_rng(seed).uniform(-radius, radius, size=(count, 3))
+    return np.asarray(point, dtype=float) + offsets
+
+
+class LorenzEnsemble:
+    def __init__(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self,
+        time_line: TimeLine,
+        parameters: LorenzParameters,
+        initial_points: np.ndarray,
+        rtol: float = 1e-3,
+        atol: float = 1e-6,
+    ):
+        """Integrate the (N, 3) initial_points together, as one flattened system of 3N
+        equations, so that each step costs a few vectorized calls whatever N is.
+
+        The step size is shared and controlled by the error of all points together (rtol
+        and atol as in solve_ivp), so a single trajectory may be less accurate than when
+        solved alone by LorenzSystem; lower the tolerances to compensate."""
+        initial_points = np.asarray(initial_points, dtype=float)
+        if initial_points.ndim != 2 or initial_points.shape[1] != 3:
+            raise ValueError("Initial points must be an (N, 3) array!")
+        self._time_line = time_line
+        self._parameters = parameters
+        self._initial_points = initial_points
+        self._rtol = rtol
+        self._atol = atol
+
+    @property
+    def size(self) -> int:
+        return len(self._initial_points)
+
+    def solve(self) -> np.ndarray:
+        """Solve for the points of all trajectories at the times of the time line, as an
+        (N, 3, len(times)) array; no dense output is kept."""
+        parameters = self._parameters
+        solution: OdeResult = solve_ivp(
+            lorenz_ensemble_system,
+            (self._time_line.start, self._time_line.end),
+            self._initial_points.ravel(),
+            t_eval=self._time_line.times,
+            args=(parameters.sigma, parameters.rho, parameters.beta),
+            rtol=self._rtol,
+            atol=self._atol,
+            vectorized=True,
+        )
+        return solution.y.reshape(self.size, 3, -1)
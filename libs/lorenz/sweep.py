@@ -0,0 +1,134 @@
+"""Parameter sweeps of the Lorenz system over a process pool
+
+Every parameter point is integrated in a worker process, which reduces its trajectory
+to a LorenzSummary before sending it back, so that only a few numbers per point travel
+between processes. The driver keeps a bounded number of jobs in flight and yields the
+summaries in the order of the parameters, so that its memory stays flat however many
+parameter points there are.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import product
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from libs.lorenz.lorenz import LorenzParameters, TimeLine
+
+
+@dataclass
+class LorenzSummary:
+    """Statistics of a trajectory after its transient: the largest Lyapunov exponent,
+    the successive local maxima of z (as in the Lorenz map) and the number of switches
+    between the two lobes of the attractor (sign changes of x)."""
+
+    parameters: LorenzParameters
+    lyapunov_exponent: float
+    z_maxima: np.ndarray
+    lobe_switches: int
+
+
+def parameter_grid(
+    sigmas: Iterable[float], rhos: Iterable[float], betas: Iterable[float]
+) -> Iterator[LorenzParameters]:
+    """Yield the LorenzParameters of every combination, lazily."""
+    for sigma, rho, beta in product(sigmas, rhos, betas):
+        yield LorenzParameters(sigma, rho, beta)
+
+
+def summarize(  # pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+    parameters: LorenzParameters,
+    time_line: TimeLine,
+    initial_point: Sequence[float] = (1.0, 1.0, 1.0),
+    transient: float = 10.0,
+    renormalization: float = 1.0,
+    rtol: float = 1e-6,
+    atol: float = 1e-9,
+) -> LorenzSummary:
+    """Integrate the trajectory together with a tangent vector (the linearized system),
+    in segments of renormalization time units. The tangent vector is rescaled to unit
+    length after every segment, and the logarithms of its growth over the segments after
+    the transient average to the largest Lyapunov exponent. z and x are sampled at the
+    times of time_line after the transient."""
+    if renormalization <= 0:
+        raise ValueError("Renormalization time must be positive!")
+    settled = time_line.start + transient
+    if not settled < time_line.end:
+        raise ValueError("Transient must be shorter than the time line!")
+    args = (parameters.sigma, parameters.rho, parameters.beta)
+    times = time_line.times[time_line.times >= settled]
+    boundaries = np.append(
+        np.arange(time_line.start, time_line.end, renormalization), time_line.end
+    )
+    state = np.concatenate([np.asarray(initial_point, dtype=float), np.ones(3) / np.sqrt(3)])
+    log_growth = duration = 0.0
+    samples: List[np.ndarray] = []
+    for t0, t1 in zip(boundaries[:-1], boundaries[1:]):
+        solution = solve_ivp(
+            _tangent_system, (t0, t1), state, args=args, rtol=rtol, atol=atol, dense_output=True
+        )
+        inside = times[(times >= t0) & ((times < t1) | (t1 == time_line.end))]
+        if inside.size:
+            samples.append(solution.sol(inside)[[0, 2]])
+        state = solution.y[:, -1]
+        growth = np.linalg.norm(state[3:])
+        state[3:] /= growth
+        if t0 >= settled:
+            log_growth += np.log(growth)
+            duration += t1 - t0
+    x, z = np.concatenate(samples, axis=1) if samples else np.empty((2, 0))
+    peaks = (z[1:-1] > z[:-2]) & (z[1:-1] >= z[2:])
+    lobes = np.sign(x[x != 0])
+    return LorenzSummary(
+        parameters,
+        float(log_growth / duration) if duration else float("nan"),
+        z[1:-1][peaks],
+        int(np.count_nonzero(lobes[1:] != lobes[:-1])),
+    )
+
+
+def sweep(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+    parameters: Iterable[LorenzParameters],
+    time_line: TimeLine,
+    initial_point: Sequence[float] = (1.0, 1.0, 1.0),
+    transient: float = 10.0,
+    renormalization: float = 1.0,
+    max_workers: Optional[int] = None,
+) -> Iterator[LorenzSummary]:
+    """Yield the summary of every parameter point, in order, computed over a pool of
+    worker processes; parameters may be a lazy iterable such as parameter_grid."""
+    job = partial(
+        summarize,
+        time_line=time_line,
+        initial_point=tuple(initial_point),
+        transient=transient,
+        renormalization=renormalization,
+    )
+    in_flight = 4 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future] = deque()
+        for point in parameters:
+            pending.append(executor.submit(job, point))
+            if len(pending) >= in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _tangent_system(t: float, state: np.ndarray, sigma: float, rho: float, beta: float):
+    """The Lorenz system for (x, y, z) and its linearization for a tangent vector."""
+    # pylint: disable=unused-argument
+    x, y, z, dx, dy, dz = state
+    return [
+        sigma * (y - x),
+        x * (rho - z) - y,
+        x * y - beta * z,
+        sigma * (dy - dx),
+        (rho - z) * dx - dy - x * dz,
+        y * dx + x * dy - beta * dz,
+    ]
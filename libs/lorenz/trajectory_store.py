@@ -0,0 +1,147 @@
+"""On-disk storage of Lorenz trajectories
+
+A TrajectoryStore keeps one trajectory (or one ensemble of trajectories) in a directory,
+so that later analysis can reopen long runs without integrating them again:
+
+* points.bin: the float64 samples, time major, i.e. a (length, 3) array for a single
+  trajectory and a (length, N, 3) array for an ensemble,
+* meta.json: the parameters, the time line and the initial points of the run, the shape
+  of a sample and the number of samples written so far.
+
+Blocks are appended as they are integrated (e.g. from LorenzSystem.iter_solve), growing
+the file, and windows are read back as views into the memory-mapped file, so neither
+side holds more than a block in RAM. The samples are not compressed, so that any
+window can be mapped directly. Appending takes an exclusive lock on the directory;
+reading does not, and reads meta.json again every time, so that readers see the blocks
+appended since they opened the store.
+"""
+
+import fcntl
+import os
+from dataclasses import asdict
+from typing import Optional, Tuple
+
+import numpy as np
+
+from libs.common.mmap_store import MemoryMappedStore
+from libs.lorenz.lorenz import LorenzParameters, LorenzSystem, TimeLine
+
+_DTYPE = np.dtype(np.float64)
+
+
+class TrajectoryStore(MemoryMappedStore):
+    # pylint: disable=missing-function-docstring
+    """Samples of a Lorenz trajectory persisted in a memory-mapped file."""
+
+    def __init__(self, directory: str) -> None:
+        """Open the store that create made in directory."""
+        self._directory = directory
+        if not os.path.exists(self._path("meta.json")):
+            raise ValueError(f"There is no trajectory store in {directory}!")
+        self._meta = self._read_meta()
+
+    @classmethod
+    def create(
+        cls,
+        directory: str,
+        time_line: TimeLine,
+        parameters: LorenzParameters,
+        initial_points: np.ndarray,
+    ) -> "TrajectoryStore":
+        """Create an empty store for the run with these settings in directory; the
+        initial_points are a (3,) point or (N, 3) points."""
+        os.makedirs(directory, exist_ok=True)
+        store = cls.__new__(cls)
+        store._directory = directory
+        if os.path.exists(store._path("meta.json")):
+            raise FileExistsError(f"There is a trajectory store in {directory} already!")
+        points = np.asarray(initial_points, dtype=float)
+        with open(store._path("points.bin"), "wb"):
+            pass
+        store._write_meta(
+            {
+                "time_line": [time_line.start, time_line.end, len(time_line.times)],
+                "parameters": asdict(parameters),
+                "initial_points": points.tolist(),
+                "sample_shape": list(points.shape),
+                "length": 0,
+            }
+        )
+        return store
+
+    @property
+    def time_line(self) -> TimeLine:
+        return TimeLine(*self._meta["time_line"])
+
+    @property
+    def parameters(self) -> LorenzParameters:
+        return LorenzParameters(**self._meta["parameters"])
+
+    @property
+    def initial_points(self) -> np.ndarray:
+        return np.array(self._meta["initial_points"])
+
+    @property
+    def sample_shape(self) -> Tuple[int, ...]:
+        return tuple(self._meta["sample_shape"])
+
+    @property
+    def length(self) -> int:
+        """The number of samples written so far, by any writer: meta.json is read again,
+        so that a store opened for reading sees the blocks appended since."""
+        self._meta = self._read_meta()
+        return self._meta["length"]
+
+    @property
+    def complete(self) -> bool:
+        return self.length == self._meta["time_line"][2]
+
+    def append(self, block: np.ndarray) -> None:
+        """Append the next samples, a block with time along the last axis as yielded by
+        LorenzSystem.iter_solve (3, k) or returned by LorenzEnsemble.solve (N, 3, k)."""
+        block = np.asarray(block, dtype=_DTYPE)
+        if block.shape[:-1] != self.sample_shape:
+            raise ValueError(f"Expected samples of shape {self.sample_shape}, got {block.shape}!")
+        with open(self._path("lock"), "w", encoding="utf-8") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            start = self.length
+            end = start + block.shape[-1]
+            if end > self._meta["time_line"][2]:
+                raise ValueError("The block does not fit into the time line!")
+            points = self._grow_file("points.bin", _DTYPE, (end,) + self.sample_shape)
+            points[start:end] = np.moveaxis(block, -1, 0)
+            points.flush()
+            self._write_meta({**self._meta, "length": end})
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Samples [start, stop) with time along the last axis, as in append, as a
+        read-only view into the memory-mapped file; it includes the samples appended
+        since the store was opened."""
+        length = self.length
+        stop = length if stop is None else stop
+        if not 0 <= start <= stop <= length:
+            raise ValueError(f"[{start}, {stop}) is not within the store [0, {length})!")
+        if not length:
+            return np.empty(self.sample_shape + (0,))
+        points = np.memmap(
+            self._path("points.bin"), dtype=_DTYPE, mode="r", shape=(length,) + self.sample_shape
+        )
+        return np.moveaxis(points[start:stop], 0, -1)
+
+    def times(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """The times of the samples [start, stop)."""
+        stop = self.length if stop is None else stop
+        return self.time_line.times[start:stop]
+
+
+def store_solution(
+    lorenz: LorenzSystem, directory: str, chunk_size: int = 1 << 16
+) -> TrajectoryStore:
+    """Integrate lorenz block by block (see LorenzSystem.iter_solve) straight into a new
+    store in directory."""
+    store = TrajectoryStore.create(
+        directory, lorenz.time_line, lorenz.parameters, lorenz.initial_points
+    )
+    for block in lorenz.iter_solve(chunk_size):
+        store.append(block)
+    return store
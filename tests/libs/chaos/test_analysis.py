@@ -0,0 +1,59 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.chaos.analysis import detect_periods, lyapunov_exponents
+from libs.chaos.logistic_map import logistic_map_derivative
+
+R_VALUES = np.array([2.8, 3.2, 3.5, 3.55, 3.83, 3.9, 4.0])
+
+
+def test_detect_periods():
+    assert detect_periods(R_VALUES, seed=1).tolist() == [1, 2, 4, 8, 3, 0, 0]
+    # the period 8 orbit is not found when only periods up to 4 are looked for
+    assert detect_periods(R_VALUES[:4], max_period=4, seed=1).tolist() == [1, 2, 4, 0]
+
+
+def test_detect_periods_other_map():
+    # x -> r - x is periodic with period 2 except at its fixed point r / 2
+    periods = detect_periods(np.array([1.0]), map_function=lambda r, x: r - x, seed=0)
+    assert periods.tolist() == [2]
+
+
+@pytest.mark.parametrize("derivative", [logistic_map_derivative, None])
+def test_lyapunov_exponents(derivative):
+    exponents = lyapunov_exponents(R_VALUES, derivative=derivative, initial_count=4, seed=1)
+    assert exponents.shape == (len(R_VALUES),)
+    # periodic orbits are stable, chaotic ones are not
+    assert np.all(exponents[:5] < 0)
+    assert np.all(exponents[5:] > 0)
+    # ln|f'(x*)| at the fixed point x* = 1 - 1 / r, where f'(x*) = 2 - r
+    assert exponents[0] == pytest.approx(np.log(0.8), abs=1e-6)
+    assert exponents[-1] == pytest.approx(np.log(2), abs=0.02)
+
+
+def test_lyapunov_exponents_finite_differences_match_derivative():
+    r_values = np.linspace(2.5, 4.0, 200)
+    np.testing.assert_allclose(
+        lyapunov_exponents(r_values, seed=2),
+        lyapunov_exponents(r_values, derivative=logistic_map_derivative, seed=2),
+        atol=1e-5,
+    )
+
+
+def test_lyapunov_exponents_superstable():
+    # r = 2 sends every orbit to the critical point 1/2, where f' = 0
+    exponent = lyapunov_exponents(np.array([2.0]), derivative=logistic_map_derivative)[0]
+    assert np.isfinite(exponent) and exponent < -30
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        lyapunov_exponents(R_VALUES, steps=0)
+    with pytest.raises(ValueError):
+        detect_periods(R_VALUES, max_period=0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
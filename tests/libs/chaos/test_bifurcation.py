@@ -0,0 +1,61 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.chaos.bifurcation import bifurcation_diagram
+
+
+def test_bifurcation_diagram_fixed_point_and_period_two():
+    diagram = bifurcation_diagram(np.array([2.5, 3.2]), initial_count=8, samples=10, x_bins=100)
+    assert diagram.density.shape == (2, 100)
+    assert diagram.x_edges.tolist() == pytest.approx(np.linspace(0, 1, 101).tolist())
+    # the fixed point 1 - 1 / r = 0.6
+    assert np.flatnonzero(diagram.density[0]).tolist() == [60]
+    assert diagram.density[0].sum() == 80
+    # the period 2 orbit 0.513..., 0.799...
+    assert np.flatnonzero(diagram.density[1]).tolist() == [51, 79]
+    assert diagram.density[1].tolist().count(40) == 2
+
+
+def test_bifurcation_diagram_chunks_and_seed():
+    r_values = np.linspace(3.4, 4.0, 50)
+    diagram = bifurcation_diagram(r_values, chunk_size=7, seed=3)
+    assert diagram.density.sum() == 50 * 32 * 200
+    # the initial values are drawn in the same order whatever the chunk size
+    np.testing.assert_array_equal(
+        diagram.density, bifurcation_diagram(r_values, chunk_size=64, seed=3).density
+    )
+    assert not np.array_equal(diagram.density, bifurcation_diagram(r_values, seed=4).density)
+
+
+def test_bifurcation_diagram_drops_points_out_of_range():
+    # r > 4 sends most orbits to -inf
+    diagram = bifurcation_diagram(np.array([3.0, 4.5]), transient=100, samples=5)
+    assert diagram.density[0].sum() == 32 * 5
+    assert diagram.density[1].sum() == 0
+    # the largest x falls into the last bin
+    diagram = bifurcation_diagram(
+        np.array([4.0]), map_function=lambda r, x: x * 0 + 1, samples=1, x_bins=10
+    )
+    assert diagram.density.tolist() == [[0] * 9 + [32]]
+
+
+def test_bifurcation_diagram_image():
+    diagram = bifurcation_diagram(np.linspace(2.5, 4.0, 30), samples=20, x_bins=40)
+    image = diagram.image()
+    assert image.shape == (40, 30)
+    assert image.min() == 0 and image.max() == 1
+    # the first column holds the fixed point 0.6, i.e. row 40 - 24 - 1 from the top
+    assert np.flatnonzero(image[:, 0]).tolist() == [15]
+    empty = bifurcation_diagram(np.array([4.5]), samples=5, x_bins=10)
+    assert not empty.image().any()
+
+
+def test_bifurcation_diagram_invalid():
+    with pytest.raises(ValueError):
+        bifurcation_diagram(np.array([3.0]), samples=0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,70 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from libs.chaos.frame_cache import FrameCache
+
+
+def test_frame_cache_computes_once():
+    compute = MagicMock(side_effect=lambda key: key * 2)
+    cache = FrameCache(compute)
+    assert cache.get(3) == 6
+    assert cache.get(3) == 6
+    compute.assert_called_once_with(3)
+    assert 3 in cache
+    assert len(cache) == 1
+
+
+def test_frame_cache_evicts_least_recently_used():
+    cache = FrameCache(lambda key: key, max_size=2)
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)
+    cache.get(3)
+    assert 1 in cache and 3 in cache
+    assert 2 not in cache
+
+
+def test_frame_cache_prefetch():
+    threads = set()
+
+    def compute(key):
+        threads.add(threading.current_thread())
+        return -key
+
+    cache = FrameCache(compute)
+    cache.prefetch(range(10))
+    cache.wait(timeout=10)
+    assert len(cache) == 10
+    assert threading.current_thread() not in threads
+    assert cache.get(9) == -9
+
+
+def test_frame_cache_close_stops_prefetching():
+    started, release = threading.Event(), threading.Event()
+
+    def compute(key):
+        started.set()
+        release.wait(timeout=10)
+        return key
+
+    cache = FrameCache(compute)
+    cache.prefetch(range(100))
+    started.wait(timeout=10)
+    release.set()
+    cache.close()
+    assert len(cache) < 100
+    # wait and close without a thread do nothing
+    FrameCache(compute).close()
+
+
+def test_frame_cache_invalid():
+    with pytest.raises(ValueError):
+        FrameCache(lambda key: key, max_size=0)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
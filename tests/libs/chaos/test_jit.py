@@ -0,0 +1,116 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import inspect
+from functools import partial
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from libs.chaos import jit
+from libs.chaos.logistic_map import (
+    cobweb_batch,
+    generate_data,
+    logistic_map,
+    sequence,
+    sequence_batch,
+    sequence_chunks,
+)
+
+
+def _doubling_map(x):
+    return 2 * x % 1
+
+
+def _two_parameters(a, b, x):
+    return a * x + b
+
+
+@pytest.mark.parametrize(
+    "map_function, expected",
+    [
+        (partial(logistic_map, r=3.9), (logistic_map, 3.9)),
+        (partial(logistic_map, r=np.float64(3)), (logistic_map, 3.0)),
+        (_doubling_map, (_doubling_map, None)),
+    ],
+)
+def test_compilable(map_function, expected):
+    assert jit.compilable(map_function) == expected
+
+
+@pytest.mark.parametrize(
+    "map_function",
+    [
+        partial(logistic_map, 3.9),
+        partial(logistic_map, r=np.array([3.9])),
+        partial(_two_parameters, a=1, b=2),
+        lambda x, y=1: x,
+        np.sin,
+    ],
+)
+def test_compilable_unsupported(map_function):
+    assert jit.compilable(map_function) is None
+    assert jit.iterate(map_function, np.array([0.1]), 5) is None
+
+
+@pytest.mark.parametrize("map_function", [partial(logistic_map, r=3.9), _doubling_map])
+def test_jit_matches_numpy(map_function):
+    # bit for bit, whether the loop is compiled (with numba) or falls back (without)
+    x0 = np.random.default_rng(0).random(8)
+    np.testing.assert_array_equal(
+        sequence_batch(map_function, x0, 300, jit=True), sequence_batch(map_function, x0, 300)
+    )
+    np.testing.assert_array_equal(
+        cobweb_batch(map_function, x0, 31, jit=True), cobweb_batch(map_function, x0, 31)
+    )
+    np.testing.assert_array_equal(
+        sequence(map_function, 0.3, 50, jit=True), sequence(map_function, 0.3, 50)
+    )
+    np.testing.assert_array_equal(
+        np.concatenate(list(sequence_chunks(map_function, x0, 100, 30, jit=True)), axis=1),
+        sequence_batch(map_function, x0, 100),
+    )
+    np.testing.assert_array_equal(
+        generate_data(map_function, 4, 20, seed=1, jit=True).sequences,
+        generate_data(map_function, 4, 20, seed=1).sequences,
+    )
+
+
+def test_jit_without_numba():
+    with patch("libs.chaos.jit.numba", None):
+        assert jit.iterate(partial(logistic_map, r=3.9), np.array([0.1]), 5) is None
+        result = sequence_batch(partial(logistic_map, r=3.9), np.array([0.1]), 5, jit=True)
+    np.testing.assert_array_equal(
+        result, sequence_batch(partial(logistic_map, r=3.9), np.array([0.1]), 5)
+    )
+
+
+def test_sequence_batch_uses_compiled_orbits():
+    orbits = np.arange(6.0).reshape(3, 2)
+    with patch("libs.chaos.logistic_map.iterate", return_value=orbits) as iterate:
+        result = sequence_batch(_doubling_map, np.array([0.0, 1.0]), 3, jit=True)
+    iterate.assert_called_once()
+    np.testing.assert_array_equal(result, orbits.T)
+
+
+def test_jit_compiles_with_numba():
+    orbits = jit.iterate(partial(logistic_map, r=3.9), np.array([0.1, 0.2]), 10)
+    assert orbits is not None and orbits.shape == (10, 2)
+    assert jit.iterate(_doubling_map, np.array([0.1, 0.2]), 10) is not None
+
+
+def _python_only_map(x):
+    return x / 2 + 0 * len(inspect.signature(_doubling_map).parameters)
+
+
+def test_jit_falls_back_when_compilation_fails():
+    # numba cannot type inspect, so the NumPy loop runs
+    assert jit.iterate(_python_only_map, np.array([0.5]), 3) is None
+    np.testing.assert_array_equal(
+        sequence_batch(_python_only_map, np.array([0.5]), 3, jit=True),
+        sequence_batch(_python_only_map, np.array([0.5]), 3),
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
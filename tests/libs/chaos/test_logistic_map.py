@@ -1,12 +1,23 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
+import decimal
 from functools import partial
 from types import SimpleNamespace
 
 import numpy as np
 import pytest
 
-from libs.chaos.logistic_map import cobweb, curve, generate_data, logistic_map, sequence
+from libs.chaos.logistic_map import (
+    DECIMAL_DIGITS,
+    PRECISIONS,
+    cobweb,
+    cobweb_batch,
+    curve,
+    generate_data,
+    logistic_map,
+    sequence,
+    sequence_batch,
+)
 
 
 def _linear_map(x: float) -> float:
@@ -77,6 +88,22 @@ def test_cobweb_with_logistic_map(map_function, x0, length, expected):
     )
 
 
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 9, 10])
+def test_cobweb_batch(length):
+    map_function = partial(logistic_map, r=3.9)
+    x0 = np.array([0.1, 0.3, 0.7])
+    result = cobweb_batch(map_function, x0, length)
+    assert result.shape == (3, length, 2)
+    for initial_value, xy in zip(x0, result):
+        expected = np.zeros((length, 2))
+        if length:
+            expected[0] = [initial_value, 0]
+        for n in range(1, length - 1, 2):
+            expected[n] = [expected[n - 1, 0], map_function(x=expected[n - 1, 0])]
+            expected[n + 1] = [expected[n, 1], expected[n, 1]]
+        np.testing.assert_array_equal(xy, expected)
+
+
 @pytest.mark.parametrize(
     "map_function, x0, length, expected",
     [
@@ -130,6 +157,30 @@ def test_sequence_with_logistic_map(map_function, x0, length, expected):
     )
 
 
+@pytest.mark.parametrize("map_function", [_linear_map, partial(logistic_map, r=3.9)])
+def test_sequence_batch(map_function):
+    x0 = np.array([0.1, 0.25, 0.5, 0.75])
+    result = sequence_batch(map_function, x0, 50)
+    assert result.shape == (4, 50)
+    # every time step (column) is contiguous
+    assert result[:, 7].flags.c_contiguous
+    for initial_value, row in zip(x0, result):
+        expected = [initial_value]
+        for _ in range(49):
+            expected.append(map_function(x=expected[-1]))
+        np.testing.assert_array_equal(row, expected)
+
+
+def test_sequence_batch_empty():
+    assert sequence_batch(_linear_map, np.array([]), 5).shape == (0, 5)
+    assert sequence_batch(_linear_map, np.array([0.5]), 1).tolist() == [[0.5]]
+    for jit in (False, True):
+        assert sequence_batch(_linear_map, np.array([0.5, 0.7]), 0, jit=jit).shape == (2, 0)
+    assert sequence(_linear_map, 0.5, 0, precision="decimal").shape == (0,)
+    with pytest.raises(ValueError):
+        sequence_batch(_linear_map, np.array([0.5]), -1)
+
+
 @pytest.mark.parametrize(
     "map_function, x, expected",
     [
@@ -179,20 +230,63 @@ def test_generate_data(map_function, sequences_count, sequences_length):
     assert isinstance(result, SimpleNamespace)
     assert hasattr(result, "sequences")
     assert hasattr(result, "cobweb_points")
-    assert hasattr(result, "frequency_response")
+    assert hasattr(result, "frequencies")
+    assert hasattr(result, "power_spectrum")
     assert hasattr(result, "curve_points")
 
+    assert isinstance(result.sequences, np.ndarray)
     assert len(result.sequences) == sequences_count
     assert all(len(seq) == sequences_length for seq in result.sequences)
 
     cobweb_shape = (sequences_length, 2)
     assert result.cobweb_points.shape == cobweb_shape
 
-    assert len(result.frequency_response) == sequences_length
+    assert len(result.frequencies) == len(result.power_spectrum) == sequences_length // 2 + 1
 
     curve_shape = (100, 2)
     assert result.curve_points.shape == curve_shape
 
 
+def test_generate_data_seed():
+    first = generate_data(partial(logistic_map, r=3.9), 4, 20, seed=7)
+    second = generate_data(partial(logistic_map, r=3.9), 4, 20, seed=7)
+    np.testing.assert_array_equal(first.sequences, second.sequences)
+    np.testing.assert_array_equal(first.cobweb_points, second.cobweb_points)
+    other = generate_data(partial(logistic_map, r=3.9), 4, 20, seed=8)
+    assert not np.array_equal(first.sequences, other.sequences)
+
+
+@pytest.mark.parametrize("precision", ["float32", "float64", "decimal"])
+def test_precision(precision):
+    map_function = partial(logistic_map, r=3.9)
+    orbits = sequence_batch(map_function, np.array([0.1, 0.2]), 30, precision=precision)
+    assert orbits.dtype == PRECISIONS[precision]
+    reference = sequence_batch(map_function, np.array([0.1, 0.2]), 30)
+    # the orbits agree closely before chaos amplifies the rounding errors
+    np.testing.assert_allclose(orbits[:, :5].astype(float), reference[:, :5], rtol=1e-5)
+    points = cobweb(map_function, 0.1, 9, precision=precision)
+    assert points.dtype == PRECISIONS[precision]
+    np.testing.assert_allclose(points.astype(float), cobweb(map_function, 0.1, 9), rtol=1e-5)
+    assert sequence(map_function, 0.1, 4, precision=precision).dtype == PRECISIONS[precision]
+    data = generate_data(map_function, 3, 20, seed=1, precision=precision)
+    assert data.sequences.dtype == PRECISIONS[precision]
+    assert data.power_spectrum.dtype == np.float64
+
+
+def test_precision_decimal():
+    orbit = sequence(partial(logistic_map, r=3.9), 0.1, 100, precision="decimal")
+    assert isinstance(orbit[-1], decimal.Decimal)
+    # x0 and r are converted exactly, so the first step is exact
+    with decimal.localcontext(decimal.Context(prec=DECIMAL_DIGITS)):
+        r, x0 = decimal.Decimal(3.9), decimal.Decimal(0.1)
+        assert orbit[1] == r * x0 * (1 - x0)
+    # float64 departs from the exact orbit within ~50 steps, 60 digits hold much longer
+    exact = sequence(partial(logistic_map, r=3.9), 0.1, 100)
+    assert abs(float(orbit[99]) - exact[99]) > 1e-2
+    # plain map functions get Decimals
+    linear = sequence(_linear_map, 0.5, 3, precision="decimal")
+    assert all(isinstance(value, decimal.Decimal) for value in linear)
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__]))
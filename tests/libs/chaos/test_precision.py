@@ -0,0 +1,48 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+from functools import partial
+
+import numpy as np
+import pytest
+
+from libs.chaos.logistic_map import logistic_map
+from libs.chaos.precision import (
+    PrecisionResult,
+    compare_precisions,
+    divergence_steps,
+    format_results,
+)
+
+
+def test_divergence_steps():
+    reference = np.zeros((3, 5))
+    orbits = np.array([[0, 0, 1, 1, 0], [0, 0, 0, 0, 0], [1, 0, 0, 0, 0]], dtype=float)
+    assert divergence_steps(orbits, reference, 0.5).tolist() == [2, 5, 0]
+
+
+def test_compare_precisions():
+    x0 = np.random.default_rng(0).random(20)
+    results = compare_precisions(partial(logistic_map, r=3.9), x0, 200)
+    assert [result.precision for result in results] == ["float32", "float64", "decimal"]
+    steps = {result.precision: result.divergence_step for result in results}
+    assert steps["float32"] < steps["float64"] < steps["decimal"] == 200
+    assert all(result.values == 20 * 200 for result in results)
+    assert all(result.values_per_second > 0 for result in results)
+
+
+def test_compare_precisions_reference():
+    x0 = np.random.default_rng(0).random(5)
+    results = compare_precisions(
+        partial(logistic_map, r=2.5), x0, 50, precisions=["float32"], reference="float64"
+    )
+    # a stable fixed point keeps all precisions together
+    assert len(results) == 1 and results[0].divergence_step == 50
+
+
+def test_format_results():
+    table = format_results([PrecisionResult("float64", 0.0, 10, 50.0)])
+    assert "float64" in table.splitlines()[1] and "inf" in table
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
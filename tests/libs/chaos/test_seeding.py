@@ -0,0 +1,79 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+from functools import partial
+
+import numpy as np
+import pytest
+
+from libs.chaos.logistic_map import generate_data, logistic_map
+from libs.chaos.seeding import generate_data_parallel, spawn_generators
+
+
+def test_spawn_generators():
+    first = [generator.random(5) for generator in spawn_generators(3, 4)]
+    second = [generator.random(5) for generator in spawn_generators(np.random.SeedSequence(3), 4)]
+    np.testing.assert_array_equal(first, second)
+    assert len({tuple(values) for values in first}) == 4
+    third = [generator.random(5) for generator in spawn_generators(np.random.default_rng(3), 4)]
+    np.testing.assert_array_equal(first, third)
+
+
+def test_generate_data_parallel_does_not_depend_on_workers():
+    map_function = partial(logistic_map, r=3.9)
+    serial = generate_data_parallel(map_function, 23, 40, seed=11, workers=1, block_size=5)
+    pooled = generate_data_parallel(map_function, 23, 40, seed=11, workers=3, block_size=5)
+    assert serial.sequences.shape == (23, 40)
+    assert len({tuple(row) for row in serial.sequences[:, :1]}) == 23
+    for name in ("sequences", "cobweb_points", "frequencies", "power_spectrum", "curve_points"):
+        np.testing.assert_array_equal(getattr(serial, name), getattr(pooled, name))
+
+
+def test_generate_data_parallel_seed():
+    map_function = partial(logistic_map, r=3.9)
+    first = generate_data_parallel(map_function, 4, 20, seed=7, workers=1)
+    second = generate_data_parallel(map_function, 4, 20, seed=8, workers=1)
+    assert not np.array_equal(first.sequences, second.sequences)
+    # the data is that of generate_data, from other random initial values
+    reference = generate_data(map_function, 4, 20, seed=7)
+    assert first.sequences.shape == reference.sequences.shape
+    assert first.frequencies.shape == reference.frequencies.shape
+    np.testing.assert_array_equal(first.curve_points, reference.curve_points)
+
+
+@pytest.mark.parametrize(
+    "make_seed", [np.random.SeedSequence, np.random.default_rng], ids=["sequence", "generator"]
+)
+def test_generate_data_parallel_repeats_for_the_same_seed(make_seed):
+    map_function = partial(logistic_map, r=3.9)
+    seed = make_seed(5)
+    first = generate_data_parallel(map_function, 10, 20, seed=seed, workers=1, block_size=3)
+    second = generate_data_parallel(map_function, 10, 20, seed=seed, workers=1, block_size=3)
+    np.testing.assert_array_equal(first.sequences, second.sequences)
+    np.testing.assert_array_equal(first.cobweb_points, second.cobweb_points)
+    np.testing.assert_array_equal(
+        first.sequences,
+        generate_data_parallel(map_function, 10, 20, seed=5, workers=1, block_size=3).sequences,
+    )
+    assert [g.random() for g in spawn_generators(seed, 2)] == [
+        g.random() for g in spawn_generators(seed, 2)
+    ]
+
+
+def test_generate_data_seed_sequence():
+    map_function = partial(logistic_map, r=3.9)
+    np.testing.assert_array_equal(
+        generate_data(map_function, 4, 20, seed=np.random.SeedSequence(7)).sequences,
+        generate_data(map_function, 4, 20, seed=np.random.default_rng(7)).sequences,
+    )
+
+
+@pytest.mark.parametrize("sequences_count, block_size", [(0, 4), (4, 0)])
+def test_generate_data_parallel_invalid(sequences_count, block_size):
+    with pytest.raises(ValueError):
+        generate_data_parallel(
+            partial(logistic_map, r=3.9), sequences_count, 20, seed=0, block_size=block_size
+        )
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
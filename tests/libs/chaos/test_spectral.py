@@ -0,0 +1,98 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import warnings
+from functools import partial
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from libs.chaos.logistic_map import logistic_map, sequence_batch, sequence_chunks
+from libs.chaos.spectral import WelchEstimator, welch_psd
+
+
+@pytest.mark.parametrize(
+    "segment_length, noverlap, sampling_rate", [(64, None, 1.0), (63, 10, 2.0), (32, 0, 1.0)]
+)
+def test_welch_psd_matches_scipy(segment_length, noverlap, sampling_rate):
+    sequences = np.random.default_rng(0).random((4, 1000))
+    frequencies, psd = welch_psd(sequences, segment_length, noverlap, sampling_rate)
+    expected_frequencies, expected_psd = signal.welch(
+        sequences, fs=sampling_rate, nperseg=segment_length, noverlap=noverlap, axis=-1
+    )
+    np.testing.assert_allclose(frequencies, expected_frequencies)
+    np.testing.assert_allclose(psd, expected_psd.mean(axis=0))
+
+
+def test_welch_psd_short_sequences():
+    frequencies, psd = welch_psd(np.array([0.1, 0.9, 0.1, 0.9]), noverlap=100)
+    assert frequencies.tolist() == [0.0, 0.25, 0.5]
+    # the segment is capped at the length of the sequences, which peak at Nyquist
+    assert np.argmax(psd) == 2
+
+
+def test_welch_psd_single_values():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        frequencies, psd = welch_psd(np.array([[0.3], [0.5]]))
+    assert frequencies.tolist() == [0.0]
+    assert psd.tolist() == [0.0]
+
+
+def test_welch_psd_period_two():
+    sequences = sequence_batch(partial(logistic_map, r=3.2), np.full(3, 0.3), 2000)[:, 1000:]
+    frequencies, psd = welch_psd(sequences, 64)
+    assert frequencies[np.argmax(psd)] == 0.5
+
+
+@pytest.mark.parametrize("chunk_size", [1, 37, 100, 1000])
+def test_welch_estimator_streaming_matches_batch(chunk_size):
+    map_function = partial(logistic_map, r=3.9)
+    x0 = np.array([0.1, 0.2, 0.3])
+    estimator = WelchEstimator(segment_length=50, noverlap=20)
+    for chunk in sequence_chunks(map_function, x0, 1000, chunk_size):
+        estimator.update(chunk)
+    _, expected = welch_psd(sequence_batch(map_function, x0, 1000), 50, 20)
+    assert estimator.segments == 3 * ((1000 - 50) // 30 + 1)
+    np.testing.assert_allclose(estimator.psd, expected)
+
+
+def test_welch_estimator_blocks():
+    sequences = np.random.default_rng(1).random((2, 500))
+    with patch("libs.chaos.spectral._BLOCK_SIZE", 100):
+        _, psd = welch_psd(sequences, 32)
+    np.testing.assert_allclose(psd, welch_psd(sequences, 32)[1])
+
+
+def test_welch_estimator_single_sequence():
+    estimator = WelchEstimator(segment_length=8)
+    estimator.update(np.arange(6.0))
+    with pytest.raises(ValueError):
+        _ = estimator.psd
+    estimator.update(np.arange(6.0, 12.0))
+    assert estimator.segments == 2
+    assert estimator._tail.shape == (1, 4)
+    with pytest.raises(ValueError):
+        estimator.update(np.zeros((2, 5)))
+
+
+@pytest.mark.parametrize("segment_length, noverlap", [(0, None), (8, 8), (8, -1)])
+def test_welch_estimator_invalid(segment_length, noverlap):
+    with pytest.raises(ValueError):
+        WelchEstimator(segment_length, noverlap)
+
+
+def test_sequence_chunks():
+    map_function = partial(logistic_map, r=3.7)
+    x0 = np.array([0.2, 0.6])
+    chunks = list(sequence_chunks(map_function, x0, 25, 10))
+    assert [chunk.shape for chunk in chunks] == [(2, 10), (2, 10), (2, 5)]
+    np.testing.assert_array_equal(
+        np.concatenate(chunks, axis=1), sequence_batch(map_function, x0, 25)
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
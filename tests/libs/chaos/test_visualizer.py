@@ -12,6 +12,10 @@ from matplotlib.widgets import Slider
 from libs.chaos.visualizer import LogisticMapVisualizer
 
 
+def _sequences_ydata(visualizer):
+    return [segment[:, 1] for segment in visualizer._plots.sequences.get_segments()]
+
+
 @patch("matplotlib.pyplot.show")
 @patch("libs.chaos.logistic_map.generate_data")
 def test_logistic_map_visualizer(mock_generate_data, mock_show):
@@ -19,7 +23,8 @@ def test_logistic_map_visualizer(mock_generate_data, mock_show):
     mock_data = SimpleNamespace(
         sequences=[np.array([0.1, 0.2, 0.3])],
         cobweb_points=np.array([[0.1, 0.2], [0.2, 0.3], [0.3, 0.4]]),
-        frequency_response=np.array([1.0, 0.5, 0.2]),
+        frequencies=np.array([0.0, 1 / 3]),
+        power_spectrum=np.array([1.0, 0.5]),
         curve_points=np.random.rand(100, 2),  # Ensure 100 points for curve
     )
     mock_generate_data.return_value = mock_data
@@ -30,7 +35,7 @@ def test_logistic_map_visualizer(mock_generate_data, mock_show):
     # Cache initial values
     initial_curve_ydata = visualizer._plots.curve.get_ydata().copy()
     initial_cobweb_xdata, initial_cobweb_ydata = visualizer._plots.cobweb.get_data()
-    initial_sequences_ydata = [p.get_ydata().copy() for p in visualizer._plots.sequences]
+    initial_sequences_ydata = _sequences_ydata(visualizer)
     initial_frequency_ydata = visualizer._plots.frequency.get_ydata().copy()
 
     # Check if the plots are created
@@ -46,7 +51,8 @@ def test_logistic_map_visualizer(mock_generate_data, mock_show):
     new_mock_data = SimpleNamespace(
         sequences=[np.array([0.3, 0.2, 0.1])],
         cobweb_points=np.array([[0.3, 0.2], [0.2, 0.1], [0.1, 0.0]]),
-        frequency_response=np.array([0.5, 0.25, 0.1]),
+        frequencies=np.array([0.0, 1 / 3]),
+        power_spectrum=np.array([0.5, 0.25]),
         curve_points=np.random.rand(100, 2),  # Ensure 100 points for curve
     )
     mock_generate_data.return_value = new_mock_data
@@ -64,8 +70,8 @@ def test_logistic_map_visualizer(mock_generate_data, mock_show):
         assert not np.array_equal(visualizer._plots.cobweb.get_data()[0], initial_cobweb_xdata)
         assert not np.array_equal(visualizer._plots.cobweb.get_data()[1], initial_cobweb_ydata)
         assert all(
-            not np.array_equal(p.get_ydata(), initial_ydata)
-            for p, initial_ydata in zip(visualizer._plots.sequences, initial_sequences_ydata)
+            not np.array_equal(ydata, initial_ydata)
+            for ydata, initial_ydata in zip(_sequences_ydata(visualizer), initial_sequences_ydata)
         )
         assert not np.array_equal(visualizer._plots.frequency.get_ydata(), initial_frequency_ydata)
 
@@ -77,10 +83,8 @@ def test_logistic_map_visualizer(mock_generate_data, mock_show):
         assert (
             visualizer._plots.cobweb.get_data()[1].shape == new_mock_data.cobweb_points[:, 1].shape
         )
-        assert visualizer._plots.sequences[0].get_ydata().shape == new_mock_data.sequences[0].shape
-        assert (
-            visualizer._plots.frequency.get_ydata().shape == new_mock_data.frequency_response.shape
-        )
+        assert _sequences_ydata(visualizer)[0].shape == new_mock_data.sequences[0].shape
+        assert visualizer._plots.frequency.get_ydata().shape == new_mock_data.power_spectrum.shape
 
 
 @pytest.mark.parametrize("sequences_count, sequences_length", [(1, 3), (2, 5)])
@@ -92,7 +96,8 @@ def test_logistic_map_visualizer_param(
     mock_data = SimpleNamespace(
         sequences=[np.random.rand(sequences_length) for _ in range(sequences_count)],
         cobweb_points=np.random.rand(sequences_length, 2),
-        frequency_response=np.random.rand(sequences_length),
+        frequencies=np.linspace(0, 0.5, sequences_length // 2 + 1),
+        power_spectrum=np.random.rand(sequences_length // 2 + 1),
         curve_points=np.random.rand(100, 2),  # Ensure 100 points for curve
     )
     mock_generate_data.return_value = mock_data
@@ -101,8 +106,29 @@ def test_logistic_map_visualizer_param(
         sequences_count=sequences_count, sequences_length=sequences_length
     )
 
-    assert len(visualizer._plots.sequences) == sequences_count
-    assert all(len(p.get_ydata()) == sequences_length for p in visualizer._plots.sequences)
+    ydata = _sequences_ydata(visualizer)
+    assert len(ydata) == sequences_count
+    assert all(len(y) == sequences_length for y in ydata)
+    assert visualizer._axes.sequences.get_xlim()[1] >= sequences_length - 1
+
+
+@patch("matplotlib.pyplot.show")
+def test_logistic_map_visualizer_precompute(mock_show):
+    visualizer = LogisticMapVisualizer(
+        sequences_count=3, sequences_length=8, precompute=True, seed=5, r_step=0.5
+    )
+    # the prefetching stopped when the (mocked) window was closed, get fills in the rest
+    frame = visualizer._frames.get((3.5, 5))
+
+    with patch("libs.chaos.visualizer.generate_data") as mock_generate_data:
+        visualizer._slider.set_val(3.5)
+        mock_generate_data.assert_not_called()
+    np.testing.assert_array_equal(_sequences_ydata(visualizer), frame.sequences)
+    np.testing.assert_array_equal(visualizer._plots.cobweb.get_data()[0], frame.cobweb_points[:, 0])
+    # the same seed gives the same initial values for all r
+    assert (
+        frame.sequences[:, 0].tolist() == visualizer._frames.get((0.5, 5)).sequences[:, 0].tolist()
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,17 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+
+def _assert_statistics_equal(result, expected):
+    assert result.start == expected.start
+    assert result.end == expected.end
+    np.testing.assert_array_equal(result.stopping_times, expected.stopping_times)
+    np.testing.assert_array_equal(result.peak_values, expected.peak_values)
+    np.testing.assert_array_equal(result.peak_indices, expected.peak_indices)
+
+
+@pytest.fixture(name="assert_same_statistics")
+def _assert_same_statistics():
+    return _assert_statistics_equal
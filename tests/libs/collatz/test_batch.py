@@ -0,0 +1,55 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.collatz import batch
+from libs.collatz.successor_table import INT64_MAX, SuccessorTable
+
+
+def _scalar_successors(start, end):
+    successors = {1: 4, 4: 2, 2: 1}
+    for n in range(start, end):
+        while n not in successors:
+            successors[n] = n * 3 + 1 if n % 2 == 1 else n // 2
+            n = successors[n]
+    return successors
+
+
+def _seeded_table(size):
+    table = SuccessorTable(size)
+    for key, value in {1: 4, 4: 2, 2: 1}.items():
+        table[key] = value
+    return table
+
+
+def test_step():
+    values = np.array([1, 2, 3, 10, 27], dtype=np.int64)
+    np.testing.assert_array_equal(batch.step(values), [4, 1, 10, 5, 82])
+
+
+def test_overflows():
+    values = np.array([3, batch.MAX_SAFE, batch.MAX_SAFE + 1, batch.MAX_SAFE + 2], dtype=np.int64)
+    assert batch.MAX_SAFE * 3 + 1 <= INT64_MAX < (batch.MAX_SAFE + 1) * 3 + 1
+    np.testing.assert_array_equal(batch.overflows(values), [False, False, True, False])
+
+
+@pytest.mark.parametrize("start, end, batch_size", [(1, 1000, 64), (300, 2000, 7), (1, 2, 4)])
+def test_fill_successors(start, end, batch_size):
+    table = _seeded_table(end)
+    batch.fill_successors(table, start, end, batch_size=batch_size)
+    expected = _scalar_successors(start, end)
+    assert dict(table.items()) == expected
+    assert len(table) == len(expected)
+
+
+def test_fill_successors_overflow(monkeypatch):
+    # pretend int64 overflows early, the affected lanes must fall back to python ints
+    monkeypatch.setattr(batch, "MAX_SAFE", 100)
+    table = _seeded_table(30)
+    batch.fill_successors(table, 1, 30, batch_size=8)
+    assert dict(table.items()) == _scalar_successors(1, 30)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,99 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import json
+import os
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from libs.collatz.benchmark import (
+    CASES,
+    MODES,
+    BenchmarkResult,
+    compare,
+    format_results,
+    read_report,
+    run_benchmarks,
+    run_case,
+    write_report,
+)
+
+
+@pytest.mark.parametrize("mode", list(MODES))
+@pytest.mark.parametrize("case", list(CASES))
+def test_run_case(case, mode):
+    result = run_case(case, mode, 100)
+    assert result.key == (case, mode, 100)
+    assert result.seconds >= 0
+    assert result.peak_rss_mb > 0
+    assert result.entries_per_second > 0
+
+
+def test_run_case_entries():
+    assert run_case("construction", "dict", 100).entries == 100
+    assert run_case("statistics", "dict", 100).entries == 100
+    # the sequences of 1..3 are [1], [2, 1] and [3, 10, 5, 16, 8, 4, 2, 1]
+    assert run_case("sequences", "dict", 3).entries == 11
+    assert run_case("compact_graph", "dict", 3).entries == 8
+    assert run_case("graph", "dict", 3).entries == 8
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(["construction", "sequences"], ["compact"], [10, 2 * 10**5], repeat=2)
+    # the sequences of 2 * 10^5 values exceed the size limit of the case
+    assert [result.key for result in results] == [
+        ("construction", "compact", 10),
+        ("construction", "compact", 2 * 10**5),
+        ("sequences", "compact", 10),
+    ]
+
+
+def test_report_round_trip(tmp_path):
+    path = os.path.join(tmp_path, "report.json")
+    results = [BenchmarkResult("construction", "dict", 1000, 0.5, 100.0, 1000)]
+    write_report(results, path)
+    assert read_report(path) == results
+    with open(path, encoding="utf-8") as file:
+        metadata = json.load(file)["metadata"]
+    assert set(metadata) == {"commit", "time", "python", "numpy", "platform", "cpu_count"}
+
+
+def test_report_without_git(tmp_path):
+    path = os.path.join(tmp_path, "report.json")
+    with patch("subprocess.run", side_effect=subprocess.CalledProcessError(1, "git")):
+        write_report([], path)
+    with open(path, encoding="utf-8") as file:
+        assert json.load(file)["metadata"]["commit"] is None
+
+
+def test_compare():
+    baseline = [
+        BenchmarkResult("construction", "dict", 1000, 1.0, 100.0, 1000),
+        BenchmarkResult("graph", "dict", 1000, 1.0, 100.0, 1000),
+    ]
+    current = [
+        BenchmarkResult("construction", "dict", 1000, 1.1, 130.0, 1000),
+        BenchmarkResult("graph", "dict", 1000, 2.0, 100.0, 1000),
+        BenchmarkResult("graph", "dict", 10000, 9.0, 100.0, 10000),
+    ]
+    assert compare(baseline, current) == [
+        "construction/dict/1000 peak_rss_mb: 100 -> 130",
+        "graph/dict/1000 seconds: 1 -> 2",
+    ]
+    assert not compare(baseline, current, tolerance=1.5)
+
+
+def test_format_results():
+    results = [
+        BenchmarkResult("construction", "dict", 1000, 0.5, 100.0, 1000),
+        BenchmarkResult("graph", "dict", 1000, 0.0, 100.0, 1000),
+    ]
+    lines = format_results(results).splitlines()
+    assert len(lines) == 3
+    assert lines[1].split() == ["construction", "dict", "1000", "0.500", "100.0", "2e+03"]
+    assert lines[2].split()[-1] == "inf"
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -1,9 +1,13 @@
 # pylint: disable=missing-module-docstring
 # pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import tracemalloc
+
 import networkx as nx
+import numpy as np
 import pytest
 
-from libs.collatz.collatz import CollatzSequences
+from libs.collatz.collatz import CollatzSequences, CollatzStatistics
 
 
 def test_collatz_sequences_init():
@@ -52,6 +56,105 @@ def test_compute_sequences():
     ]
 
 
+@pytest.mark.parametrize("start, end", [(1, 10), (1, 2), (5, 300), (27, 28)])
+def test_compact_matches_dict(start, end):
+    collatz = CollatzSequences(start, end)
+    compact = CollatzSequences(start, end, compact=True)
+    assert compact.sequences == collatz.sequences
+    assert dict(compact._next_cached.items()) == collatz._next_cached
+    assert set(compact.graph.edges) == set(collatz.graph.edges)
+
+
+@pytest.mark.parametrize("start, end", [(1, 10), (1, 2), (5, 300), (27, 28), (1, 5000)])
+def test_vectorized_matches_dict(start, end):
+    collatz = CollatzSequences(start, end)
+    vectorized = CollatzSequences(start, end, vectorized=True)
+    assert dict(vectorized._next_cached.items()) == collatz._next_cached
+    assert len(vectorized._next_cached) == len(collatz._next_cached)
+    assert vectorized.sequences == collatz.sequences
+
+
+def test_sequences_are_lazy():
+    collatz = CollatzSequences(1, 10)
+    assert not collatz._sequences
+    assert collatz.sequences[3] == [3, 10, 5, 16, 8, 4, 2, 1]
+    assert collatz._sequences
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("start, end", [(1, 10), (1, 2), (5, 300), (27, 28), (10**6, 10**6 + 50)])
+def test_statistics_match_sequences(start, end, compact):
+    collatz = CollatzSequences(start, end, compact=compact)
+    statistics = collatz.statistics
+    assert isinstance(statistics, CollatzStatistics)
+    assert statistics is collatz.statistics
+    assert statistics.start == start
+    assert statistics.end == end
+    assert not collatz._sequences
+
+    sequences = [collatz.sequences[n] for n in range(start, end)]
+    np.testing.assert_array_equal(statistics.stopping_times, [len(s) - 1 for s in sequences])
+    np.testing.assert_array_equal(statistics.peak_values, [max(s) for s in sequences])
+    np.testing.assert_array_equal(statistics.peak_indices, [s.index(max(s)) for s in sequences])
+
+
+def test_statistics_memory_does_not_grow_with_end():
+    tracemalloc.start()
+    statistics = CollatzSequences(10**7, 10**7 + 10).statistics
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 1 << 20
+    assert statistics.stopping_times.tolist()[:2] == [145, 114]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_iter_sequences(compact):
+    collatz = CollatzSequences(3, 60, compact=compact)
+    assert dict(collatz.iter_sequences()) == collatz.sequences
+    assert list(collatz.iter_sequences(10, 12)) == [
+        (10, [10, 5, 16, 8, 4, 2, 1]),
+        (11, [11, 34, 17, 52, 26, 13, 40, 20, 10, 5, 16, 8, 4, 2, 1]),
+    ]
+    assert not list(collatz.iter_sequences(7, 7))
+    with pytest.raises(ValueError):
+        list(collatz.iter_sequences(1, 10))
+    with pytest.raises(ValueError):
+        list(collatz.iter_sequences(10, 61))
+
+
+@pytest.mark.parametrize("options", [{}, {"compact": True}, {"vectorized": True}, {"cache": True}])
+@pytest.mark.parametrize("chunk_size", [1, 7, 100])
+def test_iter_sequence_chunks(tmp_path, chunk_size, options):
+    if options.pop("cache", False):
+        options["cache_dir"] = str(tmp_path)
+    collatz = CollatzSequences(1, 60, **options)
+    chunks = list(collatz.iter_sequence_chunks(chunk_size))
+    assert len(chunks) == -(-59 // chunk_size)
+    assert all(len(starts) <= chunk_size for starts, _, _ in chunks)
+    unpacked = {
+        int(starts[i]): values[offsets[i] : offsets[i + 1]].tolist()
+        for starts, offsets, values in chunks
+        for i in range(len(starts))
+    }
+    assert unpacked == collatz.sequences
+
+
+def test_iter_sequence_chunks_reads_successors():
+    collatz = CollatzSequences(1, 10)
+    collatz._next_cached[3] = 1  # NOTE: not a Collatz step, so the table must be read
+    starts, offsets, values = next(collatz.iter_sequence_chunks(4, 3, 4))
+    assert starts.tolist() == [3] and values[offsets[0] : offsets[1]].tolist() == [3, 1]
+
+
+def test_iter_sequence_chunks_overflow():
+    # NOTE: 3 * (2**62 + 1) + 1 does not fit into int64
+    collatz = CollatzSequences(2**62, 2**62 + 2)
+    assert len(list(collatz.iter_sequence_chunks(1, 2**62, 2**62 + 1))) == 1
+    with pytest.raises(OverflowError):
+        list(collatz.iter_sequence_chunks(2))
+    assert dict(collatz.iter_sequences())[2**62 + 1][1] == 3 * (2**62 + 1) + 1
+
+
 def test_as_graph():
     collatz = CollatzSequences(1, 10)
     graph = collatz.graph
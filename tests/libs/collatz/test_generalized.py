@@ -0,0 +1,124 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.collatz.collatz import CollatzSequences
+from libs.collatz.generalized import DIVERGED, AffineMap, GeneralizedCollatz, qx_plus_one
+from libs.collatz.successor_table import INT64_MAX
+
+
+def _reference(mapping, n, max_steps, max_value=INT64_MAX):
+    """Cycle (starting at its minimum) and transient of the orbit of n, or None if it
+    does not close the cycle within max_steps steps or exceeds max_value before."""
+    seen = {}
+    while n not in seen:
+        if len(seen) == max_steps or n > max_value:
+            return None, DIVERGED
+        seen[n] = len(seen)
+        n = mapping(n)
+    cycle = [value for value, i in seen.items() if i >= seen[n]]
+    i = cycle.index(min(cycle))
+    return cycle[i:] + cycle[:i], seen[n]
+
+
+def test_affine_map():
+    collatz = qx_plus_one(3)
+    assert collatz.modulus == 2
+    assert [collatz(n) for n in range(1, 7)] == [4, 1, 10, 2, 16, 3]
+    # n -> n / 3, (4n - 1) / 3 or (4n + 1) / 3
+    conway = AffineMap(((1, 0, 3), (4, -1, 3), (4, 1, 3)))
+    assert [conway(n) for n in range(1, 7)] == [1, 3, 1, 5, 7, 2]
+
+
+@pytest.mark.parametrize(
+    "coefficients", [(), ((1, 0, 2), (3, 0, 2)), ((1, 0, 0), (3, 1, 1)), ((1, 0, 4), (3, 1, 1))]
+)
+def test_affine_map_not_integer(coefficients):
+    with pytest.raises(ValueError):
+        AffineMap(coefficients)
+
+
+def test_generalized_collatz_3n_plus_1():
+    engine = GeneralizedCollatz(qx_plus_one(3), 1, 1000)
+    assert engine.cycles == [[1, 4, 2]]
+    assert np.all(engine.cycle_ids == 0)
+    assert not engine.diverged.any()
+    assert np.flatnonzero(engine.on_cycle).tolist() == [0, 1, 3]
+    statistics = CollatzSequences(1, 1000).statistics
+    # the orbits enter the cycle at 4 (from 8) or at 1 (from 2), 8 and 2 excluded
+    expected = statistics.stopping_times - np.where(np.isin(np.arange(1, 1000), [1, 2, 4]), 0, 2)
+    expected[[1, 3]] = 0
+    assert engine.transients.tolist() == expected.tolist()
+
+
+@pytest.mark.parametrize("q, start, end", [(1, 1, 100), (3, 5, 300), (5, 1, 300), (7, 2, 100)])
+def test_generalized_collatz_matches_reference(q, start, end):
+    mapping = qx_plus_one(q)
+    engine = GeneralizedCollatz(mapping, start, end, max_steps=200)
+    for n, cycle_id, transient in zip(range(start, end), engine.cycle_ids, engine.transients):
+        cycle, expected_transient = _reference(mapping, n, 10_000)
+        if cycle_id == DIVERGED:
+            assert transient == DIVERGED
+            assert cycle is None or expected_transient + len(cycle) > 200
+        else:
+            assert engine.cycles[cycle_id] == cycle
+            assert transient == expected_transient
+
+
+@pytest.mark.parametrize(
+    "q, max_steps, max_value",
+    [(3, 50, INT64_MAX), (3, 20, 5000), (5, 60, INT64_MAX), (7, 40, 10**6), (3, 0, INT64_MAX)],
+)
+@pytest.mark.parametrize("start", [1, 300])
+def test_generalized_collatz_labels_every_value(q, max_steps, max_value, start):
+    # every label is that of the orbit of its own value, whatever the start
+    mapping = qx_plus_one(q)
+    engine = GeneralizedCollatz(mapping, start, 1000, max_steps=max_steps, max_value=max_value)
+    for n, cycle_id, transient in zip(range(start, 1000), engine.cycle_ids, engine.transients):
+        cycle, expected_transient = _reference(mapping, n, max_steps, max_value)
+        assert (engine.cycles[cycle_id] if cycle_id != DIVERGED else None) == cycle, n
+        assert transient == expected_transient, n
+
+
+def test_generalized_collatz_5n_plus_1_cycles():
+    engine = GeneralizedCollatz(qx_plus_one(5), 1, 100, max_value=10**12)
+    assert engine.cycles == [
+        [1, 6, 3, 16, 8, 4, 2],
+        [13, 66, 33, 166, 83, 416, 208, 104, 52, 26],
+        [17, 86, 43, 216, 108, 54, 27, 136, 68, 34],
+    ]
+    assert engine.diverged[7 - 1]
+    assert engine.cycle_ids[[26 - 1, 27 - 1]].tolist() == [1, 2]
+
+
+def test_generalized_collatz_caps():
+    # 27 takes 111 steps to reach 1 and peaks at 9232
+    assert GeneralizedCollatz(qx_plus_one(3), 27, 28, max_steps=50).diverged.all()
+    assert GeneralizedCollatz(qx_plus_one(3), 27, 28, max_value=9000).diverged.all()
+    assert not GeneralizedCollatz(qx_plus_one(3), 27, 28, max_value=9232).diverged.any()
+    # 13 is on a cycle of length 10 of 5n+1
+    assert GeneralizedCollatz(qx_plus_one(5), 13, 14, max_steps=9).diverged.all()
+    assert not GeneralizedCollatz(qx_plus_one(5), 13, 14, max_steps=10).diverged.any()
+
+
+def test_generalized_collatz_fixed_point_and_successors():
+    # n -> n / 2 for even n, n for odd n: every odd value is a fixed point
+    engine = GeneralizedCollatz(AffineMap(((1, 0, 2), (1, 0, 1))), 1, 10)
+    assert engine.cycles == [[1], [3], [5], [7], [9]]
+    assert engine.transients.tolist() == [0, 1, 0, 2, 0, 1, 0, 3, 0]
+    assert engine.successors[6] == 3
+
+
+def test_generalized_collatz_invalid():
+    with pytest.raises(ValueError):
+        GeneralizedCollatz(qx_plus_one(3), 0, 10)
+    with pytest.raises(ValueError):
+        GeneralizedCollatz(qx_plus_one(3), 10, 10)
+    # n -> n / 2 for even n and n - 3 for odd n, so 3 -> 0
+    with pytest.raises(ValueError):
+        GeneralizedCollatz(AffineMap(((1, 0, 2), (1, -3, 1))), 1, 10)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,111 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import networkx as nx
+import numpy as np
+import pytest
+
+from libs.collatz.collatz import CollatzSequences
+from libs.collatz.graph import CollatzGraph
+from libs.collatz.successor_table import INT64_MAX, SuccessorTable
+
+
+@pytest.fixture(name="collatz")
+def _collatz():
+    return CollatzSequences(1, 100)
+
+
+def test_graph_init():
+    with pytest.raises(ValueError):
+        CollatzGraph(np.array([2, 4]), np.array([1, 2]))
+    with pytest.raises(ValueError):
+        CollatzGraph(np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+
+    table = SuccessorTable(10)
+    table[INT64_MAX + 1] = 1
+    with pytest.raises(OverflowError):
+        CollatzGraph.from_successors(table)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_graph_structure(compact):
+    collatz = CollatzSequences(1, 100, compact=compact)
+    graph = collatz.compact_graph
+    assert graph is collatz.compact_graph
+    expected = dict(collatz._next_cached.items())
+    assert len(graph) == len(expected)
+    np.testing.assert_array_equal(graph.nodes, sorted(expected))
+    assert all(graph.successor(n) == m for n, m in expected.items())
+    with pytest.raises(KeyError):
+        graph.index(15000)
+    with pytest.raises(KeyError):
+        graph.index(10**12)
+
+
+def test_graph_to_networkx(collatz):
+    graph = collatz.compact_graph.to_networkx()
+    assert isinstance(graph, nx.DiGraph)
+    assert set(graph.edges) == set(collatz._next_cached.items())
+    graph = collatz.graph
+    assert collatz.graph is graph
+
+
+def test_graph_degrees(collatz):
+    graph = collatz.compact_graph
+    reference = collatz.graph
+    assert all(graph.in_degree(n) == reference.in_degree(n) for n in reference.nodes)
+    assert sorted(graph.predecessors(4).tolist()) == [1, 8]
+    assert graph.predecessors(16).tolist() == [5, 32]
+    assert graph.predecessors(27).tolist() == [54]
+    merge_points = {n for n in reference.nodes if len(set(reference.predecessors(n)) - {1}) >= 2}
+    assert set(graph.merge_points().tolist()) == merge_points
+    assert 4 not in merge_points
+
+
+def test_graph_depths(collatz):
+    graph = collatz.compact_graph
+    for n in graph.nodes.tolist():
+        assert graph.depth(n) == len(list(_walk(n))) - 1
+    assert graph.depth(1) == 0
+    assert graph.depth(27) == 111
+
+
+def test_graph_subtree_sizes(collatz):
+    graph = collatz.compact_graph
+    tree = collatz.graph.copy()
+    tree.remove_edge(1, 4)
+    for n in graph.nodes.tolist():
+        assert graph.subtree_size(n) == len(nx.ancestors(tree, n)) + 1
+    assert graph.subtree_size(1) == len(graph)
+
+
+def test_graph_edges(collatz):
+    graph = collatz.compact_graph
+    edges = graph.nodes[graph.edges()]
+    assert set(map(tuple, edges.tolist())) == set(collatz._next_cached.items())
+
+
+@pytest.mark.parametrize("end", [2, 100, 1000])
+def test_graph_radial_layout(end):
+    graph = CollatzSequences(1, end).compact_graph
+    positions = graph.radial_layout()
+    assert positions.shape == (len(graph), 2)
+    np.testing.assert_allclose(np.hypot(*positions.T), graph.depths())
+
+    # siblings get disjoint wedges, so no two nodes share a position
+    assert len(np.unique(positions.round(9), axis=0)) == len(graph)
+    # a node lies within the wedge of its successor (the angle is measured around 0)
+    angles = np.arctan2(positions[:, 1], positions[:, 0]) % (2 * np.pi)
+    for node, successor in graph.edges()[graph.depths() >= 2].tolist():
+        assert abs(angles[node] - angles[successor]) < np.pi
+
+
+def _walk(n):
+    yield n
+    while n != 1:
+        n = n * 3 + 1 if n % 2 else n // 2
+        yield n
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
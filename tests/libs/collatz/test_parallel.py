@@ -0,0 +1,55 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.collatz import batch
+from libs.collatz.collatz import CollatzSequences
+from libs.collatz.parallel import compute_shard, merge_shards, parallel_statistics
+
+
+def test_compute_shard():
+    shard = compute_shard(5, 9)
+    # 5 -> 16 -> 8 -> 4, 6 -> 3, 7 -> ... -> 13 -> 40 -> 20 -> 10 -> 5 -> 16 -> 8 -> 4, 8 -> 4
+    np.testing.assert_array_equal(shard.exits, [4, 3, 4, 4])
+    np.testing.assert_array_equal(shard.stopping_times, [3, 1, 14, 1])
+    np.testing.assert_array_equal(shard.peak_values, [16, 6, 52, 8])
+    np.testing.assert_array_equal(shard.peak_indices, [1, 0, 5, 0])
+
+
+@pytest.mark.parametrize(
+    "start, end, shard_size", [(1, 2, 4), (1, 100, 7), (27, 1000, 64), (500, 501, 1)]
+)
+def test_merge_shards(start, end, shard_size, assert_same_statistics):
+    shards = (compute_shard(a, min(a + shard_size, end)) for a in range(start, end, shard_size))
+    assert_same_statistics(
+        merge_shards(shards, start, end), CollatzSequences(start, end).statistics
+    )
+
+
+def test_compute_shard_overflow(monkeypatch, assert_same_statistics):
+    # pretend int64 overflows early, the affected lanes must fall back to python ints
+    monkeypatch.setattr(batch, "MAX_SAFE", 20)
+    shards = [compute_shard(1, 50), compute_shard(50, 100)]
+    assert_same_statistics(merge_shards(shards, 1, 100), CollatzSequences(1, 100).statistics)
+
+
+def test_compute_shard_peak_overflow(monkeypatch):
+    monkeypatch.setattr("libs.collatz.parallel.INT64_MAX", 50)
+    monkeypatch.setattr(batch, "MAX_SAFE", 10)
+    with pytest.raises(OverflowError):
+        compute_shard(20, 30)
+
+
+def test_parallel_statistics(assert_same_statistics):
+    with pytest.raises(ValueError):
+        parallel_statistics(0, 10)
+    with pytest.raises(ValueError):
+        parallel_statistics(10, 10)
+
+    result = parallel_statistics(3, 3000, shard_size=500, max_workers=2)
+    assert_same_statistics(result, CollatzSequences(3, 3000).statistics)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,82 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from PIL import Image
+
+from libs.collatz import plotting
+from libs.collatz.collatz import CollatzSequences
+from libs.collatz.plotting import _TimeseriesFrames, export_sequences_as_timeseries_animated
+
+
+def test_timeseries_frames_keep_a_window():
+    collatz_sequences = CollatzSequences(1, 50)
+    ax = Figure().add_subplot()
+    frames = _TimeseriesFrames(ax, collatz_sequences, fade=1.0, min_alpha=0.1)
+    for frame in collatz_sequences.iter_sequences():
+        artists = frames(frame)
+    assert artists == [frames.lines, frames.marker]
+    # exp(-age) >= 0.1 for ages 0, 1, 2
+    assert len(frames.lines.get_segments()) == 3
+    alphas = frames.lines.get_colors()[:, 3]
+    assert np.allclose(alphas, np.exp(-np.arange(3))[::-1])
+    # the newest sequence is right-aligned and marked on the y-axis
+    newest = frames.lines.get_segments()[-1]
+    assert newest[-1].tolist() == [frames._max_length - 1, 1]
+    assert newest[0, 1] == 49
+    assert list(frames.marker.get_ydata()) == [49]
+    assert ax.get_ylim()[1] == pytest.approx(
+        max(max(s) for s in collatz_sequences.sequences.values())
+    )
+
+
+def test_export_sequences_as_timeseries_animated_gif(tmp_path):
+    path = os.path.join(tmp_path, "collatz.gif")
+    with patch.object(plotting._FFMpegFrameWriter, "isAvailable", return_value=False):
+        export_sequences_as_timeseries_animated(CollatzSequences(3, 10), path, dpi=20)
+    with Image.open(path) as image:
+        assert image.n_frames == 7
+
+
+def test_export_sequences_as_timeseries_animated_ffmpeg(tmp_path):
+    with (
+        patch.object(plotting._FFMpegFrameWriter, "isAvailable", return_value=True),
+        patch("matplotlib.animation.subprocess.Popen") as popen,
+    ):
+        popen.return_value.communicate.return_value = (b"", b"")
+        popen.return_value.returncode = 0
+        export_sequences_as_timeseries_animated(
+            CollatzSequences(3, 10), os.path.join(tmp_path, "collatz.gif"), dpi=20
+        )
+    command = popen.call_args.args[0]
+    assert command[command.index("-s") + 1] == "200x120" and command[-1].endswith("collatz.gif")
+    writes = popen.return_value.stdin.write.call_args_list
+    assert [len(call.args[0]) for call in writes] == [200 * 120 * 4] * 7
+
+
+def test_export_sequences_as_timeseries_animated_pillow_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(plotting, "PILLOW_MAX_BYTES", 6 * 200 * 120)
+    with patch.object(plotting._FFMpegFrameWriter, "isAvailable", return_value=False):
+        with pytest.raises(ValueError):
+            export_sequences_as_timeseries_animated(
+                CollatzSequences(3, 10), os.path.join(tmp_path, "collatz.gif"), dpi=20
+            )
+        export_sequences_as_timeseries_animated(
+            CollatzSequences(3, 9), os.path.join(tmp_path, "collatz.gif"), dpi=20
+        )
+
+
+def test_export_sequences_as_timeseries_animated_unsupported(tmp_path):
+    with pytest.raises(ValueError):
+        export_sequences_as_timeseries_animated(
+            CollatzSequences(1, 10), os.path.join(tmp_path, "collatz.avi")
+        )
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,74 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import numpy as np
+import pytest
+
+from libs.collatz import store as store_module
+from libs.collatz.collatz import CollatzSequences
+from libs.collatz.store import CollatzStore
+
+
+def test_store_empty(tmp_path):
+    store = CollatzStore(str(tmp_path / "cache"))
+    assert store.end == 1
+    with pytest.raises(ValueError):
+        store.successor_table()
+    with pytest.raises(ValueError):
+        store.statistics(1, 2)
+
+
+@pytest.mark.parametrize("end, chunk_size", [(2, 10), (10, 3), (500, 64), (500, 1000)])
+def test_store_extend(tmp_path, end, chunk_size, assert_same_statistics):
+    store = CollatzStore(str(tmp_path))
+    store.extend(end, chunk_size=chunk_size)
+    assert store.end == end
+    expected = CollatzSequences(1, end)
+    assert dict(store.successor_table().items()) == expected._next_cached
+    assert_same_statistics(store.statistics(1, end), expected.statistics)
+    if end > 3:
+        assert_same_statistics(store.statistics(3, end), CollatzSequences(3, end).statistics)
+
+
+def test_store_reuses_prior_work(tmp_path, monkeypatch, assert_same_statistics):
+    CollatzStore(str(tmp_path)).extend(300)
+
+    filled = []
+    fill_successors = store_module.fill_successors
+
+    def _fill_successors(table, start, end):
+        filled.append((start, end))
+        fill_successors(table, start, end)
+
+    monkeypatch.setattr(store_module, "fill_successors", _fill_successors)
+    store = CollatzStore(str(tmp_path))
+    assert store.end == 300
+    store.extend(200)
+    store.extend(700)
+    assert filled == [(300, 700)]
+    assert_same_statistics(store.statistics(1, 700), CollatzSequences(1, 700).statistics)
+
+
+def test_store_recovers_from_interrupted_extension(tmp_path):
+    store = CollatzStore(str(tmp_path))
+    store.extend(50)
+    # leftovers of an extension that never got to update the metadata
+    with open(tmp_path / "successors.bin", "ab") as file:
+        file.write(np.full(30, 7, dtype=np.int64).tobytes())
+    store.extend(80)
+    assert dict(store.successor_table().items()) == CollatzSequences(1, 80)._next_cached
+
+
+def test_collatz_sequences_with_cache_dir(tmp_path, assert_same_statistics):
+    expected = CollatzSequences(5, 60)
+    cached = CollatzSequences(5, 60, cache_dir=str(tmp_path))
+    assert cached.sequences == expected.sequences
+    assert_same_statistics(cached.statistics, expected.statistics)
+    assert CollatzStore(str(tmp_path)).end == 60
+
+    cached = CollatzSequences(2, 40, cache_dir=str(tmp_path))
+    assert cached.sequences == CollatzSequences(2, 40).sequences
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,94 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import numpy as np
+import pytest
+
+from libs.collatz.successor_table import INT64_MAX, SuccessorTable
+
+
+def test_successor_table_init():
+    with pytest.raises(ValueError):
+        SuccessorTable(0)
+
+    table = SuccessorTable(10)
+    assert table.size == 10
+    assert len(table) == 0
+    assert table.nbytes == 80
+
+
+def test_successor_table_dense_and_spill():
+    table = SuccessorTable(10)
+    table[3] = 10
+    table[10] = 5
+    table[52] = 26
+    assert 3 in table
+    assert 10 in table
+    assert 52 in table
+    assert 4 not in table
+    assert 11 not in table
+    assert table[3] == 10
+    assert table[10] == 5
+    assert table[52] == 26
+    with pytest.raises(KeyError):
+        _ = table[4]
+    with pytest.raises(KeyError):
+        _ = table[11]
+    assert len(table) == 3
+    assert dict(table.items()) == {3: 10, 10: 5, 52: 26}
+
+
+def test_successor_table_big_values():
+    table = SuccessorTable(10)
+    big = INT64_MAX + 1
+    table[big] = big // 2
+    table[7] = big
+    assert big in table
+    assert table[big] == big // 2
+    assert table[7] == big
+    with pytest.raises(KeyError):
+        _ = table[big + 2]
+    assert dict(table.items()) == {7: big, big: big // 2}
+
+
+def test_successor_table_flush_and_merge(monkeypatch):
+    monkeypatch.setattr(SuccessorTable, "_PENDING_LIMIT", 4)
+    table = SuccessorTable(10)
+    expected = {}
+    for n in range(100, 10, -1):
+        table[n] = n // 2
+        expected[n] = n // 2
+    assert not table._pending or len(table._pending) < 4
+    assert len(table._segments) < 6
+    assert all(n in table and table[n] == n // 2 for n in expected)
+    assert 101 not in table
+    assert len(table) == len(expected)
+    assert dict(table.items()) == expected
+
+
+def test_successor_table_vectorized():
+    table = SuccessorTable(10)
+    table[3] = 10
+    table[INT64_MAX + 1] = 1
+    table.update(np.array([5, 16, 16, 40, 3]), np.array([16, 8, 8, 20, 10]))
+    table.update(np.array([40, 52]), np.array([20, 26]))
+    assert table.dense is table._dense
+    assert len(table) == 6
+    assert dict(table.items()) == {3: 10, 5: 16, 16: 8, 40: 20, 52: 26, INT64_MAX + 1: 1}
+    np.testing.assert_array_equal(
+        table.contains(np.array([3, 4, 5, 16, 17, 52, 60, -1])),
+        [True, False, True, True, False, True, False, False],
+    )
+    np.testing.assert_array_equal(table.lookup(np.array([3, 5, 16, 52, 40])), [10, 16, 8, 26, 20])
+    assert table.lookup(np.array([3])).tolist() == [10]
+    table[9] = INT64_MAX + 2
+    table[70] = 35
+    assert table.lookup(np.array([70])).tolist() == [35]
+    with pytest.raises(OverflowError):
+        table.lookup(np.array([5, 9]))
+    with pytest.raises(KeyError):
+        table.lookup(np.array([4]))
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
@@ -0,0 +1,36 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=protected-access
+import numpy as np
+import pytest
+
+from libs.common.mmap_store import MemoryMappedStore
+
+
+def _store(directory):
+    store = MemoryMappedStore()
+    store._directory = str(directory)
+    return store
+
+
+def test_grow_file(tmp_path):
+    store = _store(tmp_path)
+    array = store._grow_file("values.bin", np.dtype(np.int32), (2, 3))
+    np.testing.assert_array_equal(array, np.zeros((2, 3)))
+    array[:] = 7
+    array.flush()
+    array = store._grow_file("values.bin", np.dtype(np.int32), (4, 3))
+    np.testing.assert_array_equal(array, [[7] * 3] * 2 + [[0] * 3] * 2)
+    assert (tmp_path / "values.bin").stat().st_size == 4 * 3 * 4
+
+
+def test_write_meta(tmp_path):
+    store = _store(tmp_path)
+    store._write_meta({"length": 3})
+    assert store._meta == {"length": 3}
+    assert _store(tmp_path)._read_meta() == {"length": 3}
+    assert not (tmp_path / "meta.json.tmp").exists()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
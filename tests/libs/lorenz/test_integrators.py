@@ -0,0 +1,103 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from libs.lorenz.integrators import (
+    IntegratorResult,
+    compare_integrators,
+    format_results,
+    integrate,
+)
+from libs.lorenz.lorenz import LorenzParameters, LorenzSystem, nearby_points
+
+PARAMETERS = LorenzParameters(sigma=10.0, rho=28.0, beta=8.0 / 3.0)
+
+
+def _reference(initial_point, time_end):
+    return solve_ivp(
+        LorenzSystem.lorenz_system,
+        (0, time_end),
+        initial_point,
+        args=(PARAMETERS.sigma, PARAMETERS.rho, PARAMETERS.beta),
+        method="DOP853",
+        rtol=1e-12,
+        atol=1e-12,
+    ).y[:, -1]
+
+
+@pytest.mark.parametrize("method, order", [("rk4", 4), ("dopri5", 5)])
+def test_integrate_order(method, order):
+    exact = _reference([1.0, 1.0, 1.0], 0.5)
+    errors = [
+        np.max(np.abs(integrate(PARAMETERS, np.ones(3), 0.5 / steps, steps, method)[:, -1] - exact))
+        for steps in (50, 100)
+    ]
+    assert np.log2(errors[0] / errors[1]) == pytest.approx(order, abs=0.5)
+
+
+def test_integrate_shapes():
+    points = integrate(PARAMETERS, np.ones(3), 0.01, 10)
+    assert points.shape == (3, 11)
+    np.testing.assert_array_equal(points[:, 0], np.ones(3))
+    every_fifth = integrate(PARAMETERS, np.ones(3), 0.01, 12, save_every=5)
+    np.testing.assert_array_equal(every_fifth, points[:, [0, 5, 10]])
+    initial_points = nearby_points([1.0, 1.0, 1.0], 4, 0.1, seed=0)
+    ensemble = integrate(PARAMETERS, initial_points, 0.01, 10, method="dopri5")
+    assert ensemble.shape == (4, 3, 11)
+    for initial_point, trajectory in zip(initial_points, ensemble):
+        np.testing.assert_allclose(
+            trajectory, integrate(PARAMETERS, initial_point, 0.01, 10, method="dopri5")
+        )
+    assert integrate(PARAMETERS, np.ones(3), 0.01, 0).shape == (3, 1)
+
+
+@pytest.mark.parametrize(
+    "initial_points, steps, save_every",
+    [(np.ones(3), -1, 1), (np.ones(3), 10, 0), (np.ones(2), 10, 1), (np.ones((2, 2, 3)), 10, 1)],
+)
+def test_integrate_invalid(initial_points, steps, save_every):
+    with pytest.raises(ValueError):
+        integrate(PARAMETERS, initial_points, 0.01, steps, save_every=save_every)
+
+
+def test_integrate_without_numba():
+    with patch("libs.lorenz.integrators.numba", None):
+        points = integrate(PARAMETERS, np.ones(3), 0.01, 10)
+    np.testing.assert_array_equal(points, integrate(PARAMETERS, np.ones(3), 0.01, 10, jit=False))
+
+
+@pytest.mark.parametrize("method", ["rk4", "dopri5"])
+@pytest.mark.parametrize("save_every", [1, 7])
+def test_integrate_compiled_matches_numpy(method, save_every):
+    initial_points = nearby_points([1.0, 1.0, 1.0], 3, 0.1, seed=0)
+    np.testing.assert_allclose(
+        integrate(PARAMETERS, initial_points, 0.01, 100, method, save_every),
+        integrate(PARAMETERS, initial_points, 0.01, 100, method, save_every, jit=False),
+        rtol=1e-12,
+    )
+
+
+def test_compare_integrators_numpy():
+    results = compare_integrators(PARAMETERS, [1.0, 1.0, 1.0], 0.1, 1e-3, ["rk4"], jit=False)
+    assert [result.method for result in results] == ["solve_ivp", "rk4"]
+
+
+def test_compare_integrators():
+    results = compare_integrators(PARAMETERS, [1.0, 1.0, 1.0], 1.0, 1e-3)
+    assert [result.method for result in results] == ["solve_ivp", "rk4", "dopri5"]
+    errors = {result.method: result.max_error for result in results}
+    assert errors["dopri5"] < errors["rk4"] < 1e-6 < errors["solve_ivp"]
+    assert all(result.samples == 1001 for result in results)
+
+
+def test_format_results():
+    table = format_results([IntegratorResult("rk4", 0.0, 10, 1e-8)])
+    assert "rk4" in table.splitlines()[1] and "inf" in table
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
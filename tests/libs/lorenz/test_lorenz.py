@@ -2,8 +2,18 @@
 # pylint: disable=missing-function-docstring
 import numpy as np
 import pytest
+from scipy.integrate import solve_ivp
 
-from libs.lorenz.lorenz import LorenzParameters, TimeLine
+from libs.lorenz.lorenz import (
+    LorenzEnsemble,
+    LorenzParameters,
+    LorenzSystem,
+    TimeLine,
+    lorenz_ensemble_system,
+    nearby_points,
+)
+
+PARAMETERS = LorenzParameters(sigma=10.0, rho=28.0, beta=8.0 / 3.0)
 
 
 def test_timeline_initialization():
@@ -58,5 +68,129 @@ def test_lorenz_parameters_values(sigma, rho, beta):
     assert params.beta == beta
 
 
+def test_lorenz_system_solve():
+    points = LorenzSystem(TimeLine(0, 1, 11), PARAMETERS, [1.0, 1.0, 1.0]).solve()
+    assert points.shape == (3, 11)
+    np.testing.assert_array_equal(points[:, 0], [1.0, 1.0, 1.0])
+    # the same points as the dense output of solve_ivp
+    time_line = TimeLine(0, 20, 2001)
+    dense = solve_ivp(
+        LorenzSystem.lorenz_system,
+        (0, 20),
+        [0.1, 0.0, 0.0],
+        args=(PARAMETERS.sigma, PARAMETERS.rho, PARAMETERS.beta),
+        dense_output=True,
+    )
+    np.testing.assert_array_equal(
+        LorenzSystem(time_line, PARAMETERS, [0.1, 0.0, 0.0]).solve(), dense.sol(time_line.times)
+    )
+
+
+def test_lorenz_system_is_lazy(mocker):
+    solver = mocker.patch("libs.lorenz.lorenz.RK45")
+    lorenz = LorenzSystem(TimeLine(0, 100, 10001), PARAMETERS, [0.1, 0.0, 0.0])
+    solver.assert_not_called()
+    blocks = lorenz.iter_solve(100)
+    solver.assert_not_called()
+    del blocks
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+def test_lorenz_system_iter_solve(chunk_size):
+    lorenz = LorenzSystem(TimeLine(0, 10, 501), PARAMETERS, [0.1, 0.0, 0.0])
+    blocks = list(lorenz.iter_solve(chunk_size))
+    assert all(block.shape == (3, chunk_size) for block in blocks[:-1])
+    assert 0 < blocks[-1].shape[1] <= chunk_size
+    np.testing.assert_array_equal(np.concatenate(blocks, axis=1), lorenz.solve())
+
+
+def test_lorenz_system_iter_solve_empty_span():
+    lorenz = LorenzSystem(TimeLine(5, 5, 3), PARAMETERS, [1.0, 2.0, 3.0])
+    blocks = list(lorenz.iter_solve(2))
+    assert [block.shape for block in blocks] == [(3, 2), (3, 1)]
+    np.testing.assert_array_equal(np.concatenate(blocks, axis=1), [[1.0] * 3, [2.0] * 3, [3.0] * 3])
+
+
+@pytest.mark.parametrize("start, end, count", [(1, 0.5, 6), (0.5, 0, 10)])
+def test_lorenz_system_solve_backwards(start, end, count):
+    time_line = TimeLine(start, end, count)  # type: ignore
+    lorenz = LorenzSystem(time_line, PARAMETERS, [1.0, 2.0, 3.0])
+    expected = solve_ivp(
+        LorenzSystem.lorenz_system,
+        (start, end),
+        [1.0, 2.0, 3.0],
+        t_eval=time_line.times,
+        args=(PARAMETERS.sigma, PARAMETERS.rho, PARAMETERS.beta),
+    ).y
+    np.testing.assert_allclose(lorenz.solve(), expected, rtol=1e-12)
+    np.testing.assert_allclose(np.concatenate(list(lorenz.iter_solve(4)), axis=1), expected)
+
+
+def test_lorenz_system_solve_no_times():
+    lorenz = LorenzSystem(TimeLine(0, 5, 0), PARAMETERS, [1.0, 2.0, 3.0])
+    assert not list(lorenz.iter_solve())
+    assert lorenz.solve().shape == (3, 0)
+
+
+def test_lorenz_system_iter_solve_invalid():
+    lorenz = LorenzSystem(TimeLine(0, 5, 10), PARAMETERS, [1e200, 1e200, 1e200])
+    with pytest.raises(ValueError):
+        next(lorenz.iter_solve(0))
+    with pytest.raises(RuntimeError), np.errstate(all="ignore"):
+        lorenz.solve()
+
+
+def test_lorenz_ensemble_system():
+    states = np.array([1.0, 2.0, 3.0, -1.0, 0.5, 2.0])
+    derivatives = lorenz_ensemble_system(0, states, 10.0, 28.0, 2.0)
+    np.testing.assert_allclose(
+        derivatives[:3], LorenzSystem.lorenz_system(0, states[:3], 10.0, 28.0, 2.0)
+    )
+    np.testing.assert_allclose(
+        derivatives[3:], LorenzSystem.lorenz_system(0, states[3:], 10.0, 28.0, 2.0)
+    )
+    # vectorized over a second axis, as solve_ivp(vectorized=True) may call it
+    columns = lorenz_ensemble_system(0, np.stack([states, states], axis=1), 10.0, 28.0, 2.0)
+    np.testing.assert_allclose(columns, np.stack([derivatives, derivatives], axis=1))
+
+
+def test_lorenz_ensemble_matches_single_solves():
+    time_line = TimeLine(0, 2, 51)
+    initial_points = nearby_points([1.0, 1.0, 1.0], 4, 0.5, seed=0)
+    ensemble = LorenzEnsemble(time_line, PARAMETERS, initial_points, rtol=1e-10, atol=1e-12)
+    assert ensemble.size == 4
+    points = ensemble.solve()
+    assert points.shape == (4, 3, 51)
+    for initial_point, trajectory in zip(initial_points, points):
+        single = solve_ivp(
+            LorenzSystem.lorenz_system,
+            (0, 2),
+            initial_point,
+            t_eval=time_line.times,
+            args=(PARAMETERS.sigma, PARAMETERS.rho, PARAMETERS.beta),
+            rtol=1e-10,
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(trajectory, single.y, atol=1e-6)
+    # a single point takes the same steps as LorenzSystem
+    np.testing.assert_allclose(
+        LorenzEnsemble(time_line, PARAMETERS, initial_points[:1]).solve()[0],
+        LorenzSystem(time_line, PARAMETERS, initial_points[0]).solve(),
+    )
+
+
+@pytest.mark.parametrize("initial_points", [np.zeros(3), np.zeros((2, 2)), np.zeros((1, 2, 3))])
+def test_lorenz_ensemble_invalid(initial_points):
+    with pytest.raises(ValueError):
+        LorenzEnsemble(TimeLine(0, 1, 2), PARAMETERS, initial_points)
+
+
+def test_nearby_points():
+    points = nearby_points([1.0, 2.0, 3.0], 100, 0.1, seed=1)
+    assert points.shape == (100, 3)
+    assert np.all(np.abs(points - [1.0, 2.0, 3.0]) <= 0.1)
+    np.testing.assert_array_equal(points, nearby_points([1.0, 2.0, 3.0], 100, 0.1, seed=1))
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__]))
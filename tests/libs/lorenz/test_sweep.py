@@ -0,0 +1,79 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.lorenz.lorenz import LorenzParameters, TimeLine
+from libs.lorenz.sweep import parameter_grid, summarize, sweep
+
+
+def test_parameter_grid():
+    grid = list(parameter_grid([10.0], [20.0, 28.0], [1.0, 2.0]))
+    assert grid == [
+        LorenzParameters(10.0, 20.0, 1.0),
+        LorenzParameters(10.0, 20.0, 2.0),
+        LorenzParameters(10.0, 28.0, 1.0),
+        LorenzParameters(10.0, 28.0, 2.0),
+    ]
+
+
+def test_summarize_chaotic():
+    summary = summarize(LorenzParameters(10.0, 28.0, 8.0 / 3.0), TimeLine(0, 100, 10001))
+    # the largest Lyapunov exponent of the classic attractor is about 0.906
+    assert summary.lyapunov_exponent == pytest.approx(0.9, abs=0.15)
+    assert summary.lobe_switches > 10
+    assert len(summary.z_maxima) > 50
+    assert np.all((summary.z_maxima > 25) & (summary.z_maxima < 50))
+
+
+def test_summarize_stable():
+    # below rho ~ 24.7 the trajectory settles on a fixed point in one lobe
+    summary = summarize(LorenzParameters(10.0, 10.0, 8.0 / 3.0), TimeLine(0, 30, 3001))
+    assert summary.lyapunov_exponent < 0
+    assert summary.lobe_switches == 0
+    assert np.all(np.diff(summary.z_maxima) <= 0)
+
+
+def test_summarize_without_samples():
+    summary = summarize(LorenzParameters(10.0, 28.0, 8.0 / 3.0), TimeLine(0, 12, 3), transient=7)
+    assert summary.z_maxima.size == 0 and summary.lobe_switches == 0
+    assert np.isfinite(summary.lyapunov_exponent)
+    # no whole renormalization segment after the transient
+    short = summarize(LorenzParameters(10.0, 28.0, 8.0 / 3.0), TimeLine(0, 12, 3), transient=11.5)
+    assert np.isnan(short.lyapunov_exponent)
+
+
+@pytest.mark.parametrize("transient, renormalization", [(10.0, 0.0), (10.0, -1.0), (20.0, 1.0)])
+def test_summarize_invalid(transient, renormalization):
+    with pytest.raises(ValueError):
+        summarize(
+            LorenzParameters(10.0, 28.0, 8.0 / 3.0),
+            TimeLine(0, 20, 11),
+            transient=transient,
+            renormalization=renormalization,
+        )
+
+
+def test_sweep():
+    parameters = list(parameter_grid([10.0], [10.0, 28.0, 12.0], [8.0 / 3.0]))
+    time_line = TimeLine(0, 30, 301)
+    summaries = list(sweep(iter(parameters), time_line, max_workers=2))
+    # in order, and the same as in this process
+    assert [summary.parameters for summary in summaries] == parameters
+    for summary in summaries:
+        expected = summarize(summary.parameters, time_line)
+        assert summary.lyapunov_exponent == expected.lyapunov_exponent
+        np.testing.assert_array_equal(summary.z_maxima, expected.z_maxima)
+        assert summary.lobe_switches == expected.lobe_switches
+
+
+def test_sweep_more_points_than_in_flight():
+    # one worker keeps 4 jobs in flight
+    parameters = parameter_grid([10.0], np.linspace(10, 12, 9), [8.0 / 3.0])
+    summaries = sweep(parameters, TimeLine(0, 12, 13), transient=2.0, max_workers=1)
+    rhos = [summary.parameters.rho for summary in summaries]
+    np.testing.assert_array_equal(rhos, np.linspace(10, 12, 9))
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))
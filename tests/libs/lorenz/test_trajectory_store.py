@@ -0,0 +1,80 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-function-docstring
+import numpy as np
+import pytest
+
+from libs.lorenz.lorenz import LorenzEnsemble, LorenzParameters, LorenzSystem, TimeLine
+from libs.lorenz.trajectory_store import TrajectoryStore, store_solution
+
+PARAMETERS = LorenzParameters(sigma=10.0, rho=28.0, beta=8.0 / 3.0)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 64, 1000])
+def test_store_solution(tmp_path, chunk_size):
+    lorenz = LorenzSystem(TimeLine(0, 5, 301), PARAMETERS, [0.1, 0.0, 0.0])
+    store = store_solution(lorenz, str(tmp_path / "run"), chunk_size=chunk_size)
+    assert store.length == 301 and store.complete
+    expected = lorenz.solve()
+    np.testing.assert_array_equal(store.read(), expected)
+    # reopened, e.g. by another process
+    reopened = TrajectoryStore(str(tmp_path / "run"))
+    assert reopened.parameters == PARAMETERS
+    assert reopened.sample_shape == (3,)
+    np.testing.assert_array_equal(reopened.initial_points, [0.1, 0.0, 0.0])
+    np.testing.assert_array_equal(reopened.time_line.times, lorenz.time_line.times)
+    window = reopened.read(100, 150)
+    assert isinstance(window.base, np.memmap) and not window.flags.writeable
+    np.testing.assert_array_equal(window, expected[:, 100:150])
+    np.testing.assert_array_equal(reopened.times(100, 150), lorenz.time_line.times[100:150])
+
+
+def test_store_ensemble(tmp_path):
+    time_line = TimeLine(0, 2, 21)
+    initial_points = np.array([[1.0, 1.0, 1.0], [1.0, 1.0, 1.1]])
+    points = LorenzEnsemble(time_line, PARAMETERS, initial_points).solve()
+    store = TrajectoryStore.create(str(tmp_path), time_line, PARAMETERS, initial_points)
+    assert store.length == 0 and not store.complete
+    assert store.read().shape == (2, 3, 0)
+    store.append(points[..., :10])
+    store.append(points[..., 10:])
+    assert store.sample_shape == (2, 3)
+    np.testing.assert_array_equal(store.read(), points)
+    np.testing.assert_array_equal(store.read(5, 7), points[..., 5:7])
+
+
+def test_store_reader_sees_appends(tmp_path):
+    lorenz = LorenzSystem(TimeLine(0, 1, 31), PARAMETERS, [0.1, 0.0, 0.0])
+    writer = TrajectoryStore.create(
+        str(tmp_path), lorenz.time_line, PARAMETERS, lorenz.initial_points
+    )
+    reader = TrajectoryStore(str(tmp_path))
+    blocks = list(lorenz.iter_solve(10))
+    writer.append(blocks[0])
+    assert reader.length == 10 and not reader.complete
+    writer.append(blocks[1])
+    np.testing.assert_array_equal(reader.read(), np.concatenate(blocks[:2], axis=1))
+    for block in blocks[2:]:
+        writer.append(block)
+    assert reader.complete
+    np.testing.assert_array_equal(reader.read(20, 31), lorenz.solve()[:, 20:])
+
+
+def test_store_invalid(tmp_path):
+    with pytest.raises(ValueError):
+        TrajectoryStore(str(tmp_path))
+    store = TrajectoryStore.create(str(tmp_path), TimeLine(0, 1, 4), PARAMETERS, [1.0, 1.0, 1.0])
+    with pytest.raises(FileExistsError):
+        TrajectoryStore.create(str(tmp_path), TimeLine(0, 1, 4), PARAMETERS, [1.0, 1.0, 1.0])
+    with pytest.raises(ValueError):
+        store.append(np.zeros((2, 3)))
+    with pytest.raises(ValueError):
+        store.append(np.zeros((3, 5)))
+    store.append(np.zeros((3, 2)))
+    with pytest.raises(ValueError):
+        store.read(1, 3)
+    with pytest.raises(ValueError):
+        store.read(2, 1)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__]))